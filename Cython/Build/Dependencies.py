@@ -1046,6 +1046,11 @@ def cythonize(module_list, exclude=None, nthreads=0, aliases=None, quiet=False,
                 else:
                     dep_timestamp, dep = deps.newest_dependency(source)
                     priority = 2 - (dep in deps.immediate_dependencies(source))
+                if options.profile_data and os.path.exists(options.profile_data):
+                    # the branch hints depend on the profile data
+                    profile_timestamp = os.path.getmtime(options.profile_data)
+                    if profile_timestamp > dep_timestamp:
+                        dep_timestamp, dep = profile_timestamp, options.profile_data
                 if force or c_timestamp < dep_timestamp:
                     if not quiet and not force:
                         if source == dep:
@@ -424,7 +424,8 @@ def put_assign_to_buffer(lhs_cname, rhs_cname, buf_entry,
 
 
 def put_buffer_lookup_code(entry, index_signeds, index_cnames, directives,
-                           pos, code, negative_indices, in_nogil_context):
+                           pos, code, negative_indices, in_nogil_context,
+                           nonnegative_dims=(), in_bounds_dims=()):
     """
     Generates code to process indices and calculate an offset into
     a buffer. Returns a C string which gives a pointer which can be
@@ -436,11 +437,15 @@ def put_buffer_lookup_code(entry, index_signeds, index_cnames, directives,
     body. The lookup however is delegated to a inline function that is instantiated
     once per ndim (lookup with suboffsets tend to get quite complicated).
 
+    The indices of the dimensions in 'nonnegative_dims' are known not to be
+    negative, and those in 'in_bounds_dims' are known to be within the shape
+    of the buffer, so that their checks can be left out.
+
     entry is a BufferEntry
     """
     negative_indices = directives['wraparound'] and negative_indices
 
-    if directives['boundscheck']:
+    if directives['boundscheck'] and len(in_bounds_dims) < len(index_cnames):
         # Check bounds and fix negative indices.
         # We allocate a temporary which is initialized to -1, meaning OK (!).
         # If an error occurs, the temp is set to the index dimension the
@@ -448,7 +453,9 @@ def put_buffer_lookup_code(entry, index_signeds, index_cnames, directives,
         failed_dim_temp = code.funcstate.allocate_temp(PyrexTypes.c_int_type, manage_ref=False)
         code.putln("%s = -1;" % failed_dim_temp)
         for dim, (signed, cname, shape) in enumerate(zip(index_signeds, index_cnames, entry.get_buf_shapevars())):
-            if signed != 0:
+            if dim in in_bounds_dims:
+                continue
+            if signed != 0 and dim not in nonnegative_dims:
                 # not unsigned, deal with negative index
                 code.putln("if (%s < 0) {" % cname)
                 if negative_indices:
@@ -482,8 +489,8 @@ def put_buffer_lookup_code(entry, index_signeds, index_cnames, directives,
         code.funcstate.release_temp(failed_dim_temp)
     elif negative_indices:
         # Only fix negative indices.
-        for signed, cname, shape in zip(index_signeds, index_cnames, entry.get_buf_shapevars()):
-            if signed != 0:
+        for dim, (signed, cname, shape) in enumerate(zip(index_signeds, index_cnames, entry.get_buf_shapevars())):
+            if signed != 0 and dim not in nonnegative_dims:
                 code.putln("if (%s < 0) %s += %s;" % (cname, cname, shape))
 
     return entry.generate_buffer_lookup_code(code, index_cnames)
@@ -111,6 +111,9 @@ def create_cython_argparser():
                            'which includes entire generated C/C++-code.')
     parser.add_argument("--annotate-coverage", dest='annotate_coverage_xml', action=SetAnnotateCoverageAction, type=str,
                       help='Annotate and include coverage information from cov.xml.')
+    parser.add_argument("--profile-data", dest='profile_data', action='store', type=str,
+                      help='Use the line execution counts in this file (see Cython.ProfileData) '
+                           'to generate branch hints.')
     parser.add_argument("--line-directives", dest='emit_linenums', action='store_true',
                       help='Produce #line directives pointing to the .pyx source')
     parser.add_argument("-+", "--cplus", dest='cplus', action='store_const', const=1,
@@ -49,6 +49,7 @@ cdef class FunctionState:
     cdef public dict temps_used_type
     cdef public size_t temp_counter
     cdef public list collect_temps_stack
+    cdef public dict hoisted_memviewslices
 
     cdef public object closure_temps
     cdef public bint should_declare_error_indicator
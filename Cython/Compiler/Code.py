@@ -729,6 +729,11 @@ class FunctionState(object):
         # need to be privatized in parallel sections
         self.collect_temps_stack = []
 
+        # Memoryview slices whose data pointer and strides were loaded into
+        # local variables before the current loop:
+        # slice cname -> (data cname, [stride cname or expression per dimension])
+        self.hoisted_memviewslices = {}
+
         # This is used for the error indicator, which needs to be local to the
         # function. It used to be global, which relies on the GIL being held.
         # However, exceptions may need to be propagated through 'nogil'
@@ -1157,6 +1162,8 @@ class GlobalState(object):
     def __init__(self, writer, module_node, code_config, common_utility_include_dir=None):
         self.filename_table = {}
         self.filename_list = []
+        self.profile_counter_table = {}
+        self.profile_counter_names = []
         self.input_file_contents = {}
         self.utility_codes = set()
         self.declared_cnames = {}
@@ -1687,6 +1694,19 @@ class GlobalState(object):
             self.filename_table[entry] = index
         return index
 
+    def lookup_profile_counter(self, name):
+        """
+        Return the C expression of the call counter for the function name.
+        Functions with the same name (e.g. fused specialisations) share a counter.
+        """
+        try:
+            index = self.profile_counter_table[name]
+        except KeyError:
+            index = len(self.profile_counter_names)
+            self.profile_counter_names.append(name)
+            self.profile_counter_table[name] = index
+        return "%s[%d]" % (Naming.profile_counters_cname, index)
+
     def commented_file_contents(self, source_desc):
         try:
             return self.input_file_contents[source_desc]
@@ -1748,11 +1768,14 @@ class CCodeConfig(object):
     # emit_linenums       boolean         write #line pragmas?
     # emit_code_comments  boolean         copy the original code into C comments?
     # c_line_in_traceback boolean         append the c file and line number to the traceback for exceptions?
+    # release_function_bodies boolean     discard function bodies after generating their code?
 
-    def __init__(self, emit_linenums=True, emit_code_comments=True, c_line_in_traceback=True):
+    def __init__(self, emit_linenums=True, emit_code_comments=True, c_line_in_traceback=True,
+                 release_function_bodies=False):
         self.emit_code_comments = emit_code_comments
         self.emit_linenums = emit_linenums
         self.c_line_in_traceback = c_line_in_traceback
+        self.release_function_bodies = release_function_bodies
 
 
 class CCodeWriter(object):
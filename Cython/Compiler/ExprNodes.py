@@ -1889,6 +1889,8 @@ class NameNode(AtomicExprNode):
     #  type_entry      Entry     For extension type names, the original type entry
     #  cf_is_null      boolean   Is uninitialized before this node
     #  cf_maybe_null   boolean   Maybe uninitialized before this node
+    #  cf_not_none     boolean   Known not to be None from a check before this node
+    #  cf_checked_types [PyrexType]  Type tests that the value passed before this node
     #  allow_null      boolean   Don't raise UnboundLocalError
     #  nogil           boolean   Whether it is used in a nogil context
 
@@ -1901,6 +1903,8 @@ class NameNode(AtomicExprNode):
     type_entry = None
     cf_maybe_null = True
     cf_is_null = False
+    cf_not_none = False
+    cf_checked_types = ()
     allow_null = False
     nogil = False
     inferred_type = None
@@ -2197,6 +2201,9 @@ class NameNode(AtomicExprNode):
     def may_be_none(self):
         if self.cf_state and self.type and (self.type.is_pyobject or
                                             self.type.is_memoryviewslice):
+            if self.cf_not_none:
+                # an earlier check on all paths to this node ruled out None
+                return False
             # guard against infinite recursion on self-dependencies
             if getattr(self, '_none_checking', False):
                 # self-dependency - either this node receives a None
@@ -4079,6 +4086,9 @@ class IndexNode(_IndexingBaseNode):
 
                     break
             else:
+                fused_cfunction = self.base.type.entry.fused_cfunction
+                if fused_cfunction and fused_cfunction.restricted_signatures:
+                    return error(self.pos, "Specialization excluded by the fused_signatures directive")
                 # This is a bug
                 raise InternalError("Couldn't find the right signature")
 
@@ -4345,6 +4355,10 @@ class BufferIndexNode(_IndexingBaseNode):
     # Any indexing temp variables that we need to clean up.
     index_temps = ()
 
+    # Dimensions whose index is known to be non-negative or within the shape.
+    nonnegative_indices = ()
+    in_bounds_indices = ()
+
     def analyse_target_types(self, env):
         self.analyse_types(env, getting=False)
 
@@ -4423,7 +4437,7 @@ class BufferIndexNode(_IndexingBaseNode):
         """
         ndarray[1, 2, 3] and memslice[1, 2, 3]
         """
-        if self.in_nogil_context:
+        if self.in_nogil_context and len(self.in_bounds_indices) < len(self.indices):
             if self.is_buffer_access or self.is_memview_index:
                 if code.globalstate.directives['boundscheck']:
                     warning(self.pos, "Use boundscheck(False) for faster access", level=1)
@@ -4446,7 +4460,9 @@ class BufferIndexNode(_IndexingBaseNode):
             directives=code.globalstate.directives,
             pos=self.pos, code=code,
             negative_indices=negative_indices,
-            in_nogil_context=self.in_nogil_context)
+            in_nogil_context=self.in_nogil_context,
+            nonnegative_dims=self.nonnegative_indices,
+            in_bounds_dims=self.in_bounds_indices)
 
     def generate_assignment_code(self, rhs, code, overloaded_assignment=False):
         self.generate_subexpr_evaluation_code(code)
@@ -4643,6 +4659,8 @@ class MemoryViewSliceNode(MemoryViewIndexNode):
     is_memview_scalar_assignment = False
     is_memview_index = False
     is_memview_broadcast = False
+    # The sliced memoryview is kept alive by the base slice, so we do not acquire it
+    is_borrowed_slice = False
 
     def analyse_ellipsis_noop(self, env, getting):
         """Slicing operations needing no evaluation, i.e. m[...] or m[:, :]"""
@@ -4727,6 +4745,17 @@ class MemoryViewSliceNode(MemoryViewIndexNode):
 
         return self.result_in_temp()
 
+    def borrow_slice(self):
+        """
+        Avoid the acquisition counting for a temporary slice that does not
+        outlive its base slice, e.g. when it is only passed into a C function.
+        """
+        if self.is_ellipsis_noop or not self.is_temp:
+            return False
+        self.is_borrowed_slice = True
+        self.use_managed_ref = False
+        return True
+
     def calculate_result_code(self):
         """This is called in case this is a no-op slicing node"""
         return self.base.result()
@@ -4757,7 +4786,14 @@ class MemoryViewSliceNode(MemoryViewIndexNode):
         buffer_entry.generate_buffer_slice_code(
             code, self.original_indices, self.result(), self.type,
             have_gil=have_gil, have_slices=have_slices,
-            directives=code.globalstate.directives)
+            directives=code.globalstate.directives,
+            acquire=not self.is_borrowed_slice)
+
+    def generate_disposal_code(self, code):
+        if self.is_borrowed_slice:
+            # we do not own a reference to the memoryview => nothing to release
+            return
+        super(MemoryViewSliceNode, self).generate_disposal_code(code)
 
     def generate_assignment_code(self, rhs, code, overloaded_assignment=False):
         if self.is_ellipsis_noop:
@@ -5984,7 +6020,10 @@ class SimpleCallNode(CallNode):
         expected_nargs = max_nargs - func_type.optional_arg_count
         actual_nargs = len(self.args)
         for formal_arg, actual_arg in args[:expected_nargs]:
-            arg_code = actual_arg.move_result_rhs_as(formal_arg.type)
+            if formal_arg.pass_by_pointer:
+                arg_code = "&%s" % actual_arg.result()
+            else:
+                arg_code = actual_arg.move_result_rhs_as(formal_arg.type)
             arg_list_code.append(arg_code)
 
         if func_type.is_overridable:
@@ -6176,13 +6215,86 @@ class PyMethodCallNode(SimpleCallNode):
     subexprs = ['function', 'arg_tuple']
     is_temp = True
 
+    def uses_cached_method_lookup(self):
+        # "obj.method(...)" looks up the unbound method through a per call site cache
+        # keyed on the type version tag, instead of creating a bound method object.
+        function = self.function
+        return (function.is_attribute and function.is_py_attr and not function.is_special_lookup
+                and not function.is_module_attribute_lookup())
+
     def generate_evaluation_code(self, code):
         code.mark_pos(self.pos)
         self.allocate_temp_result(code)
 
-        self.function.generate_evaluation_code(code)
         assert self.arg_tuple.mult_factor is None
         args = self.arg_tuple.args
+        if self.uses_cached_method_lookup():
+            function, self_arg, arg_offset_cname = self.generate_cached_method_lookup(code)
+            reuse_function_temp = False
+        else:
+            function, self_arg, arg_offset_cname, reuse_function_temp = self.generate_function_unpacking(code)
+
+        # actually call the function
+        code.globalstate.use_utility_code(
+            UtilityCode.load_cached("PyObjectFastCall", "ObjectHandling.c"))
+
+        code.putln("{")
+        code.putln("PyObject *__pyx_callargs[%d] = {%s, %s};" % (
+            len(args)+1,
+            self_arg,
+            ', '.join(arg.py_result() for arg in args)))
+        code.putln("%s = __Pyx_PyObject_FastCall(%s, __pyx_callargs+1-%s, %d+%s);" % (
+            self.result(),
+            function,
+            arg_offset_cname,
+            len(args),
+            arg_offset_cname))
+
+        code.put_xdecref_clear(self_arg, py_object_type)
+        code.funcstate.release_temp(self_arg)
+        code.funcstate.release_temp(arg_offset_cname)
+        for arg in args:
+            arg.generate_disposal_code(code)
+            arg.free_temps(code)
+        code.putln(code.error_goto_if_null(self.result(), self.pos))
+        self.generate_gotref(code)
+
+        if reuse_function_temp:
+            self.function.generate_disposal_code(code)
+            self.function.free_temps(code)
+        else:
+            code.put_decref_clear(function, py_object_type)
+            code.funcstate.release_temp(function)
+        code.putln("}")
+
+    def generate_cached_method_lookup(self, code):
+        obj = self.function.obj
+        obj.generate_evaluation_code(code)
+        function = code.funcstate.allocate_temp(py_object_type, manage_ref=True)
+        self_arg = code.funcstate.allocate_temp(py_object_type, manage_ref=True)
+        arg_offset_cname = code.funcstate.allocate_temp(PyrexTypes.c_int_type, manage_ref=False)
+        code.globalstate.use_utility_code(
+            UtilityCode.load_cached("PyObjectGetMethodCached", "ObjectHandling.c"))
+        code.putln("%s = NULL;" % function)
+        code.putln("__Pyx_PyObject_GetMethodCached(%s, %s, %s, &%s); %s" % (
+            arg_offset_cname,
+            obj.py_result(),
+            code.intern_identifier(self.function.attribute),
+            function,
+            code.error_goto_if_null(function, self.pos)))
+        code.put_gotref(function, py_object_type)
+        code.putln("%s = (%s) ? %s : NULL;" % (self_arg, arg_offset_cname, obj.py_result()))
+        code.put_xincref(self_arg, py_object_type)
+        obj.generate_disposal_code(code)
+        obj.free_temps(code)
+
+        for arg in self.arg_tuple.args:
+            arg.generate_evaluation_code(code)
+        return function, self_arg, arg_offset_cname
+
+    def generate_function_unpacking(self, code):
+        self.function.generate_evaluation_code(code)
+        args = self.arg_tuple.args
         for arg in args:
             arg.generate_evaluation_code(code)
 
@@ -6236,39 +6348,7 @@ class PyMethodCallNode(SimpleCallNode):
         code.putln("%s = 1;" % arg_offset_cname)
         code.putln("}")
         code.putln("}")
-
-        # actually call the function
-        code.globalstate.use_utility_code(
-            UtilityCode.load_cached("PyObjectFastCall", "ObjectHandling.c"))
-
-        code.putln("{")
-        code.putln("PyObject *__pyx_callargs[%d] = {%s, %s};" % (
-            len(args)+1,
-            self_arg,
-            ', '.join(arg.py_result() for arg in args)))
-        code.putln("%s = __Pyx_PyObject_FastCall(%s, __pyx_callargs+1-%s, %d+%s);" % (
-            self.result(),
-            function,
-            arg_offset_cname,
-            len(args),
-            arg_offset_cname))
-
-        code.put_xdecref_clear(self_arg, py_object_type)
-        code.funcstate.release_temp(self_arg)
-        code.funcstate.release_temp(arg_offset_cname)
-        for arg in args:
-            arg.generate_disposal_code(code)
-            arg.free_temps(code)
-        code.putln(code.error_goto_if_null(self.result(), self.pos))
-        self.generate_gotref(code)
-
-        if reuse_function_temp:
-            self.function.generate_disposal_code(code)
-            self.function.free_temps(code)
-        else:
-            code.put_decref_clear(function, py_object_type)
-            code.funcstate.release_temp(function)
-        code.putln("}")
+        return function, self_arg, arg_offset_cname, reuse_function_temp
 
 
 class InlinedDefNodeCallNode(CallNode):
@@ -7303,20 +7383,42 @@ class AttributeNode(ExprNode):
                 obj_code = obj.type.cast_code(obj.result(), to_object_struct = True)
             return "%s%s%s" % (obj_code, self.op, self.member)
 
+    def is_module_attribute_lookup(self):
+        # Python attribute lookups on module globals, which are usually imported
+        # modules as in "np.sqrt" or "os.path.join", are cached by the version of
+        # the module dict.
+        if not self.is_py_attr or self.is_special_lookup or self.attribute.startswith('__'):
+            return False
+        obj = self.obj
+        if obj.is_attribute:
+            return obj.is_module_attribute_lookup()
+        entry = obj.entry if obj.is_name else None
+        return bool(entry and entry.is_pyglobal and entry.scope.is_module_scope)
+
     def generate_result_code(self, code):
-        if self.is_py_attr:
-            if self.is_special_lookup:
-                code.globalstate.use_utility_code(
-                    UtilityCode.load_cached("PyObjectLookupSpecial", "ObjectHandling.c"))
-                lookup_func_name = '__Pyx_PyObject_LookupSpecial'
+        if self.is_py_attr and not self.is_special_lookup:
+            # Both lookups cache their result per call site, by the version of the
+            # module dict or by the version tag of the object type respectively.
+            if self.is_module_attribute_lookup():
+                utility_code_name, lookup_macro = "GetModuleAttr", '__Pyx_GetModuleAttr'
             else:
-                code.globalstate.use_utility_code(
-                    UtilityCode.load_cached("PyObjectGetAttrStr", "ObjectHandling.c"))
-                lookup_func_name = '__Pyx_PyObject_GetAttrStr'
+                utility_code_name, lookup_macro = "PyObjectGetAttrStrCached", '__Pyx_PyObject_GetAttrStrCached'
+            code.globalstate.use_utility_code(
+                UtilityCode.load_cached(utility_code_name, "ObjectHandling.c"))
             code.putln(
-                '%s = %s(%s, %s); %s' % (
+                '%s(%s, %s, %s); %s' % (
+                    lookup_macro,
+                    self.result(),
+                    self.obj.py_result(),
+                    code.intern_identifier(self.attribute),
+                    code.error_goto_if_null(self.result(), self.pos)))
+            self.generate_gotref(code)
+        elif self.is_py_attr:
+            code.globalstate.use_utility_code(
+                UtilityCode.load_cached("PyObjectLookupSpecial", "ObjectHandling.c"))
+            code.putln(
+                '%s = __Pyx_PyObject_LookupSpecial(%s, %s); %s' % (
                     self.result(),
-                    lookup_func_name,
                     self.obj.py_result(),
                     code.intern_identifier(self.attribute),
                     code.error_goto_if_null(self.result(), self.pos)))
@@ -13153,8 +13255,11 @@ class PyTypeTestNode(CoercionNode):
     #  This node is used to check that a generic Python
     #  object is an instance of a particular extension type.
     #  This node borrows the result of its argument node.
+    #
+    #  arg_passed_test   boolean   The argument is known to pass the test
 
     exact_builtin_type = True
+    arg_passed_test = False
 
     def __init__(self, arg, dst_type, env, notnone=False):
         #  The arg is known to be a Python object, and
@@ -13202,10 +13307,28 @@ class PyTypeTestNode(CoercionNode):
         # FIXME
         pass
 
+    def passed_earlier_test(self):
+        """
+        Whether the argument is a variable that passed the same type test
+        (or that of a subtype) before, as found by the control flow analysis.
+        """
+        if not self.arg.is_name:
+            return False
+        if self.notnone and self.arg.may_be_none():
+            return False
+        for checked_type in self.arg.cf_checked_types:
+            if checked_type.same_as(self.type):
+                return True
+            if self.type.is_extension_type and checked_type.is_extension_type and checked_type.subtype_of(self.type):
+                return True
+        return False
+
     def calculate_result_code(self):
         return self.arg.result()
 
     def generate_result_code(self, code):
+        if self.arg_passed_test:
+            return
         if self.type.typeobj_is_available():
             if self.type.is_builtin_type:
                 type_test = self.type.type_test_code(
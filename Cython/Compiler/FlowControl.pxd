@@ -38,6 +38,7 @@ cdef class NameAssignment:
     cdef public object inferred_type
 
 cdef class AssignmentList:
+    cdef public Py_ssize_t offset
     cdef public object bit
     cdef public object mask
     cdef public list stats
@@ -51,6 +52,7 @@ cdef class ControlFlow:
      cdef public set entries
      cdef public list loops
      cdef public list exceptions
+     cdef public bint has_facts
 
      cdef public ControlBlock entry_point
      cdef public ExitBlock exit_point
@@ -67,20 +69,30 @@ cdef class ControlFlow:
      cpdef mark_argument(self, lhs, rhs, entry)
      cpdef mark_deletion(self, node, entry)
      cpdef mark_reference(self, node, entry)
+     cpdef mark_fact(self, node, entry, checked_type=*)
 
      @cython.locals(block=ControlBlock, parent=ControlBlock, unreachable=set)
      cpdef normalize(self)
 
-     @cython.locals(bit=object, assmts=AssignmentList,
+     @cython.locals(bit=object, offset=Py_ssize_t, assmts=AssignmentList,
                     block=ControlBlock)
      cpdef initialize(self)
 
-     @cython.locals(assmts=AssignmentList, assmt=NameAssignment)
+     @cython.locals(assmts=AssignmentList, bits=object, lowest=object)
      cpdef set map_one(self, istate, entry)
 
-     @cython.locals(block=ControlBlock, parent=ControlBlock)
+     @cython.locals(order=list, visited=set, stack=list, block=ControlBlock, child=ControlBlock)
+     cpdef list reverse_postorder(self)
+
+     @cython.locals(block=ControlBlock, parent=ControlBlock, child=ControlBlock,
+                    order=list, index=dict, worklist=list, queued=list,
+                    i=Py_ssize_t, j=Py_ssize_t)
      cdef reaching_definitions(self)
 
+     @cython.locals(block=ControlBlock, parent=ControlBlock, order=list,
+                    inputs=dict, outputs=dict, facts=set, changed=bint)
+     cpdef dict known_facts(self)
+
 cdef class Uninitialized:
      pass
 
@@ -88,12 +100,14 @@ cdef class Unknown:
     pass
 
 
+cdef update_facts(set facts, stat)
+
 cdef class MessageCollection:
     cdef set messages
 
 
 @cython.locals(dirty=bint, block=ControlBlock, parent=ControlBlock,
-               assmt=NameAssignment)
+               assmt=NameAssignment, i_assmts=AssignmentList, state_cache=dict)
 cdef check_definitions(ControlFlow flow, dict compiler_directives)
 
 @cython.final
@@ -6,7 +6,10 @@ from __future__ import absolute_import
 import cython
 cython.declare(PyrexTypes=object, ExprNodes=object, Nodes=object,
                Builtin=object, InternalError=object, error=object, warning=object,
-               fake_rhs_expr=object, TypedExprNode=object)
+               fake_rhs_expr=object, TypedExprNode=object,
+               heappush=object, heappop=object)
+
+from heapq import heappush, heappop
 
 from . import Builtin
 from . import ExprNodes
@@ -96,6 +99,13 @@ class ExitBlock(ControlBlock):
 
 
 class AssignmentList(object):
+    # The bits of an entry are contiguous: 'bit' (uninitialised) is
+    # followed by the bits of the assignments in 'stats'.
+    #
+    # offset    int     index of 'bit'
+    # bit       int     1 << offset
+    # mask      int     all bits of the entry
+
     def __init__(self):
         self.stats = []
 
@@ -110,6 +120,7 @@ class ControlFlow(object):
        entries     set    tracked entries
        loops       list   stack for loop descriptors
        exceptions  list   stack for exception descriptors
+       has_facts   bool   any NameFact statements in the graph
     """
 
     def __init__(self):
@@ -117,6 +128,7 @@ class ControlFlow(object):
         self.entries = set()
         self.loops = []
         self.exceptions = []
+        self.has_facts = False
 
         self.entry_point = ControlBlock()
         self.exit_point = ExitBlock()
@@ -201,6 +213,12 @@ class ControlFlow(object):
             ##     self.block.bounded.add(entry)
             self.entries.add(entry)
 
+    def mark_fact(self, node, entry, checked_type=None):
+        if (self.block and self.is_tracked(entry) and (entry.is_local or entry.is_arg)
+                and not (entry.in_closure or entry.from_closure)):
+            self.block.stats.append(NameFact(node, entry, checked_type))
+            self.has_facts = True
+
     def normalize(self):
         """Delete unreachable and orphan blocks."""
         queue = set([self.entry_point])
@@ -228,21 +246,25 @@ class ControlFlow(object):
         """Set initial state, map assignments to bits."""
         self.assmts = {}
 
-        bit = 1
         for entry in self.entries:
-            assmts = AssignmentList()
-            assmts.mask = assmts.bit = bit
-            self.assmts[entry] = assmts
-            bit <<= 1
+            self.assmts[entry] = AssignmentList()
 
         for block in self.blocks:
             for stat in block.stats:
                 if isinstance(stat, NameAssignment):
-                    stat.bit = bit
-                    assmts = self.assmts[stat.entry]
-                    assmts.stats.append(stat)
-                    assmts.mask |= bit
-                    bit <<= 1
+                    self.assmts[stat.entry].stats.append(stat)
+
+        # Give each entry a contiguous range of bits, so that map_one()
+        # only needs to look at the bits of a single entry.
+        offset = 0
+        for assmts in self.assmts.values():
+            assmts.offset = offset
+            assmts.bit = bit = 1 << offset
+            for stat in assmts.stats:
+                bit <<= 1
+                stat.bit = bit
+            assmts.mask = (bit << 1) - assmts.bit
+            offset += len(assmts.stats) + 1
 
         for block in self.blocks:
             for entry, stat in block.gen.items():
@@ -263,32 +285,109 @@ class ControlFlow(object):
     def map_one(self, istate, entry):
         ret = set()
         assmts = self.assmts[entry]
-        if istate & assmts.bit:
+        bits = (istate & assmts.mask) >> assmts.offset
+        if not bits:
+            return ret
+        if bits & 1:
             if self.is_statically_assigned(entry):
                 ret.add(StaticAssignment(entry))
             elif entry.from_closure:
                 ret.add(Unknown)
             else:
                 ret.add(Uninitialized)
-        for assmt in assmts.stats:
-            if istate & assmt.bit:
-                ret.add(assmt)
+        bits >>= 1
+        # visit only the set bits, lowest first
+        while bits:
+            lowest = bits & -bits
+            ret.add(assmts.stats[lowest.bit_length() - 1])
+            bits ^= lowest
         return ret
 
+    def reverse_postorder(self):
+        """Return the blocks in reverse postorder of a depth-first
+        traversal from the entry point, followed by unreachable blocks.
+        """
+        order = []
+        visited = set([self.entry_point])
+        stack = [(self.entry_point, iter(self.entry_point.children))]
+        while stack:
+            block, children = stack[-1]
+            for child in children:
+                if child not in visited:
+                    visited.add(child)
+                    stack.append((child, iter(child.children)))
+                    break
+            else:
+                stack.pop()
+                if block is not self.entry_point:
+                    order.append(block)
+        order.reverse()
+        order.extend([block for block in self.blocks if block not in visited])
+        return order
+
     def reaching_definitions(self):
-        """Per-block reaching definitions analysis."""
-        dirty = True
-        while dirty:
-            dirty = False
-            for block in self.blocks:
-                i_input = 0
-                for parent in block.parents:
-                    i_input |= parent.i_output
-                i_output = (i_input & ~block.i_kill) | block.i_gen
-                if i_output != block.i_output:
-                    dirty = True
-                block.i_input = i_input
+        """Per-block reaching definitions analysis.
+
+        Blocks are processed from a worklist in reverse postorder, and a
+        block is only revisited when the output of one of its parents changed.
+        """
+        order = self.reverse_postorder()
+        index = {}
+        for i, block in enumerate(order):
+            index[block] = i
+        worklist = list(range(len(order)))  # a sorted list is a valid heap
+        queued = [True] * len(order)
+        while worklist:
+            i = heappop(worklist)
+            queued[i] = False
+            block = order[i]
+            i_input = 0
+            for parent in block.parents:
+                i_input |= parent.i_output
+            block.i_input = i_input
+            i_output = (i_input & ~block.i_kill) | block.i_gen
+            if i_output != block.i_output:
                 block.i_output = i_output
+                for child in block.children:
+                    j = index.get(child, -1)
+                    if j >= 0 and not queued[j]:
+                        queued[j] = True
+                        heappush(worklist, j)
+
+    def known_facts(self):
+        """Per-block analysis of the facts from NameFact statements that
+        hold on all paths into a block.
+
+        Returns a dict that maps the reachable blocks to the set of
+        (entry, checked_type) facts at their beginning.
+        """
+        order = self.reverse_postorder()
+        order.insert(0, self.entry_point)
+        inputs = {}
+        outputs = {}
+        changed = True
+        while changed:
+            changed = False
+            for block in order:
+                facts = set() if block is self.entry_point else None
+                for parent in block.parents:
+                    parent_facts = outputs.get(parent)
+                    if parent_facts is None:
+                        continue  # not reached yet
+                    elif facts is None:
+                        facts = set(parent_facts)
+                    else:
+                        facts &= parent_facts
+                if facts is None:
+                    continue
+                inputs[block] = facts
+                facts = set(facts)
+                for stat in block.stats:
+                    update_facts(facts, stat)
+                if outputs.get(block) != facts:
+                    outputs[block] = facts
+                    changed = True
+        return inputs
 
 
 class LoopDescr(object):
@@ -380,6 +479,31 @@ class NameDeletion(NameAssignment):
         return inferred_type
 
 
+class NameFact(object):
+    """A check of a variable that must have passed for the code after it
+    to run, e.g. 'x is not None'.  'checked_type' is None for "not None",
+    or the type whose type test the value passed (which allows None).
+    """
+    def __init__(self, node, entry, checked_type=None):
+        self.node = node
+        self.entry = entry
+        self.checked_type = checked_type
+        self.pos = node.pos
+
+    def __repr__(self):
+        return '%s(entry=%r, checked_type=%r)' % (
+            self.__class__.__name__, self.entry, self.checked_type)
+
+
+def update_facts(facts, stat):
+    if isinstance(stat, NameFact):
+        facts.add((stat.entry, stat.checked_type))
+    elif isinstance(stat, NameAssignment) and facts:
+        # assignments and deletions invalidate all facts about the variable
+        for fact in [fact for fact in facts if fact[0] is stat.entry]:
+            facts.remove(fact)
+
+
 class Uninitialized(object):
     """Definitely not initialised yet."""
 
@@ -530,12 +654,20 @@ def check_definitions(flow, compiler_directives):
     # Node to entry map
     references = {}
     assmt_nodes = set()
+    # The same state of an entry usually reaches many statements (e.g. all
+    # branches of a long if-elif chain), so the mapped sets are cached.
+    state_cache = {}
 
     for block in flow.blocks:
         i_state = block.i_input
         for stat in block.stats:
+            if isinstance(stat, NameFact):
+                continue
             i_assmts = flow.assmts[stat.entry]
-            state = flow.map_one(i_state, stat.entry)
+            key = (stat.entry, i_state & i_assmts.mask)
+            state = state_cache.get(key)
+            if state is None:
+                state = state_cache[key] = flow.map_one(key[1], stat.entry)
             if isinstance(stat, NameAssignment):
                 stat.lhs.cf_state.update(state)
                 assmt_nodes.add(stat.lhs)
@@ -551,6 +683,7 @@ def check_definitions(flow, compiler_directives):
                 references[stat.node] = stat.entry
                 stat.entry.cf_references.append(stat)
                 stat.node.cf_state.update(state)
+                state = set(state)
                 ## if not stat.node.allow_null:
                 ##     i_state &= ~i_assmts.bit
                 ## # after successful read, the state is known to be initialised
@@ -649,6 +782,25 @@ def check_definitions(flow, compiler_directives):
 
     messages.report()
 
+    if flow.has_facts:
+        # Find the facts that hold for all evaluations of a reference
+        reference_facts = {}
+        for block, facts in flow.known_facts().items():
+            for stat in block.stats:
+                if isinstance(stat, NameReference):
+                    node_facts = set([fact[1] for fact in facts if fact[0] is stat.entry])
+                    if stat.node in reference_facts:
+                        node_facts &= reference_facts[stat.node]
+                    reference_facts[stat.node] = node_facts
+                else:
+                    update_facts(facts, stat)
+        for node, node_facts in reference_facts.items():
+            if None in node_facts:
+                node.cf_not_none = True
+                node_facts.remove(None)
+            if node_facts:
+                node.cf_checked_types = list(node_facts)
+
     for node in assmt_nodes:
         node.cf_state = ControlFlowState(node.cf_state)
     for node in references:
@@ -800,6 +952,83 @@ class ControlFlowAnalysis(CythonTransform):
         if self.current_directives['control_flow.dot_output']:
             self.flow.mark_position(node)
 
+    def mark_fact(self, node, checked_type=None):
+        if node.is_name:
+            entry = node.entry or self.env.lookup(node.name)
+            if entry is not None:
+                self.flow.mark_fact(node, entry, checked_type)
+
+    def mark_condition_facts(self, condition, is_true):
+        """Mark the facts that follow from the value of a condition,
+        e.g. that 'x' is not None when 'x is not None' is true.
+        """
+        if isinstance(condition, ExprNodes.NotNode):
+            self.mark_condition_facts(condition.operand, not is_true)
+        elif isinstance(condition, ExprNodes.BoolBinopNode):
+            if condition.operator == ('and' if is_true else 'or'):
+                self.mark_condition_facts(condition.operand1, is_true)
+                self.mark_condition_facts(condition.operand2, is_true)
+        elif isinstance(condition, ExprNodes.PrimaryCmpNode):
+            if condition.cascade is None and condition.operator == ('is_not' if is_true else 'is'):
+                operand1, operand2 = condition.operand1, condition.operand2
+                if operand1.is_none:
+                    operand1, operand2 = operand2, operand1
+                if operand2.is_none:
+                    self.mark_fact(operand1)
+        elif not is_true:
+            pass
+        elif condition.is_name:
+            # None is false
+            self.mark_fact(condition)
+        elif (isinstance(condition, ExprNodes.SimpleCallNode) and condition.function.is_name
+                and condition.function.name == 'isinstance' and len(condition.args) == 2):
+            entry = self.env.lookup('isinstance')
+            if entry is None or not (entry.is_builtin or entry.scope.is_builtin_scope):
+                return
+            types = condition.args[1]
+            types = types.args if types.is_sequence_constructor else [types]
+            for type_node in types:
+                entry = self.env.lookup(type_node.name) if type_node.is_name else None
+                if not (entry and entry.is_type and (
+                        entry.type.is_extension_type or entry.type.is_builtin_type)):
+                    return
+            self.mark_fact(condition.args[0])
+            if len(types) == 1 and entry.type.is_extension_type:
+                self.mark_fact(condition.args[0], entry.type)
+
+    def mark_dereference(self, obj, is_index=False, attribute=None):
+        """Mark that 'obj' is not None after an attribute lookup or an
+        indexing operation on it, unless that can succeed for None.
+        """
+        if not obj.is_name:
+            return
+        entry = obj.entry or self.env.lookup(obj.name)
+        if entry is None or entry.type.is_buffer:
+            return
+        type = entry.type
+        if self.current_directives['nonecheck'] or type is PyrexTypes.py_object_type:
+            pass
+        elif type in (Builtin.list_type, Builtin.tuple_type, Builtin.dict_type):
+            # always None checked
+            pass
+        elif type.is_builtin_type and not is_index:
+            # builtin methods are always None checked, but C attributes are not
+            attribute_entry = type.scope.lookup_here(attribute) if type.scope else None
+            if attribute_entry is not None and not attribute_entry.is_cfunction:
+                return
+        else:
+            return
+        self.flow.mark_fact(obj, entry)
+
+    def mark_type_test(self, lhs, rhs):
+        """Mark that 'rhs' passed the type test for the type of 'lhs'
+        after an assignment 'lhs = rhs'.
+        """
+        if lhs.is_name and rhs.is_name:
+            entry = lhs.entry or self.env.lookup(lhs.name)
+            if entry is not None and (entry.type.is_extension_type or entry.type.is_builtin_type):
+                self.mark_fact(rhs, entry.type)
+
     def visit_FromImportStatNode(self, node):
         for name, target in node.items:
             if name != "*":
@@ -813,12 +1042,14 @@ class ControlFlowAnalysis(CythonTransform):
     def visit_SingleAssignmentNode(self, node):
         self._visit(node.rhs)
         self.mark_assignment(node.lhs, node.rhs)
+        self.mark_type_test(node.lhs, node.rhs)
         return node
 
     def visit_CascadedAssignmentNode(self, node):
         self._visit(node.rhs)
         for lhs in node.lhs_list:
             self.mark_assignment(lhs, node.rhs)
+            self.mark_type_test(lhs, node.rhs)
         return node
 
     def visit_ParallelAssignmentNode(self, node):
@@ -896,21 +1127,25 @@ class ControlFlowAnalysis(CythonTransform):
         next_block = self.flow.newblock()
         parent = self.flow.block
         # If clauses
+        condition = None
         for clause in node.if_clauses:
             parent = self.flow.nextblock(parent)
-            self._visit(clause.condition)
+            if condition is not None:
+                self.mark_condition_facts(condition, False)
+            condition = clause.condition
+            self._visit(condition)
             self.flow.nextblock()
+            self.mark_condition_facts(condition, True)
             self._visit(clause.body)
             if self.flow.block:
                 self.flow.block.add_child(next_block)
         # Else clause
+        self.flow.nextblock(parent=parent)
+        self.mark_condition_facts(condition, False)
         if node.else_clause:
-            self.flow.nextblock(parent=parent)
             self._visit(node.else_clause)
-            if self.flow.block:
-                self.flow.block.add_child(next_block)
-        else:
-            parent.add_child(next_block)
+        if self.flow.block:
+            self.flow.block.add_child(next_block)
 
         if next_block.parents:
             self.flow.block = next_block
@@ -924,6 +1159,9 @@ class ControlFlowAnalysis(CythonTransform):
         self.mark_position(node)
         next_block = self.flow.newblock()
         parent = self.flow.block
+        if parent:
+            # skipped if assertions are disabled
+            parent.add_child(next_block)
         # failure case
         parent = self.flow.nextblock(parent)
         self._visit(node.condition)
@@ -947,6 +1185,8 @@ class ControlFlowAnalysis(CythonTransform):
             self._visit(node.condition)
         # Body block
         self.flow.nextblock()
+        if node.condition:
+            self.mark_condition_facts(node.condition, True)
         self._visit(node.body)
         self.flow.loops.pop()
         # Loop it
@@ -954,13 +1194,13 @@ class ControlFlowAnalysis(CythonTransform):
             self.flow.block.add_child(condition_block)
             self.flow.block.add_child(next_block)
         # Else clause
+        self.flow.nextblock(parent=condition_block)
+        if node.condition:
+            self.mark_condition_facts(node.condition, False)
         if node.else_clause:
-            self.flow.nextblock(parent=condition_block)
             self._visit(node.else_clause)
-            if self.flow.block:
-                self.flow.block.add_child(next_block)
-        else:
-            condition_block.add_child(next_block)
+        if self.flow.block:
+            self.flow.block.add_child(next_block)
 
         if next_block.parents:
             self.flow.block = next_block
@@ -1347,3 +1587,60 @@ class ControlFlowAnalysis(CythonTransform):
             self.mark_assignment(node.operand, fake_rhs_expr)
         self.visitchildren(node)
         return node
+
+    def visit_AttributeNode(self, node):
+        self.visitchildren(node)
+        if self.flow.block and not node.attribute.startswith('__'):
+            self.mark_dereference(node.obj, attribute=node.attribute)
+        return node
+
+    def visit_IndexNode(self, node):
+        self.visitchildren(node)
+        if self.flow.block:
+            self.mark_dereference(node.base, is_index=True)
+        return node
+
+    def _visit_conditionally(self, condition, is_true, node):
+        """Visit 'node', which only gets evaluated for the given value
+        of 'condition', and join the flow again afterwards.
+        """
+        parent = self.flow.block
+        next_block = self.flow.newblock()
+        parent.add_child(next_block)
+        self.flow.nextblock()
+        if condition is not None:
+            self.mark_condition_facts(condition, is_true)
+        self._visit(node)
+        if self.flow.block:
+            self.flow.block.add_child(next_block)
+        self.flow.block = next_block
+
+    def visit_BoolBinopNode(self, node):
+        if not self.flow.block:
+            return self.visit_Node(node)
+        self._visit(node.operand1)
+        self._visit_conditionally(node.operand1, node.operator == 'and', node.operand2)
+        return node
+
+    def visit_CondExprNode(self, node):
+        if not self.flow.block:
+            return self.visit_Node(node)
+        self._visit(node.test)
+        parent = self.flow.block
+        next_block = self.flow.newblock()
+        for is_true, value in [(True, node.true_val), (False, node.false_val)]:
+            self.flow.nextblock(parent=parent)
+            self.mark_condition_facts(node.test, is_true)
+            self._visit(value)
+            if self.flow.block:
+                self.flow.block.add_child(next_block)
+        self.flow.block = next_block
+        return node
+
+    def visit_PrimaryCmpNode(self, node):
+        if node.cascade is None or not self.flow.block:
+            return self.visit_Node(node)
+        self.visitchildren(node, ('operand1', 'operand2'))
+        # the cascade only gets evaluated if the first comparison is true
+        self._visit_conditionally(None, True, node.cascade)
+        return node
@@ -3,7 +3,7 @@ from __future__ import absolute_import
 import copy
 
 from . import (ExprNodes, PyrexTypes, MemoryView,
-               ParseTreeTransforms, StringEncoding, Errors)
+               ParseTreeTransforms, StringEncoding, Errors, Naming)
 from .ExprNodes import CloneNode, ProxyNode, TupleNode
 from .Nodes import FuncDefNode, CFuncDefNode, StatListNode, DefNode
 from ..Utils import OrderedSet
@@ -44,6 +44,11 @@ class FusedCFuncDefNode(StatListNode):
     fused_func_assignment = None
     defaults_tuple = None
     decorators = None
+    restricted_signatures = False
+
+    # maximum number of items in the key of the C level dispatch cache,
+    # see FusedDispatchCache in CythonFunction.c
+    dispatch_cache_max_key = 16
 
     child_attrs = StatListNode.child_attrs + [
         '__signatures__', 'resulting_fused_function', 'fused_func_assignment']
@@ -86,6 +91,7 @@ class FusedCFuncDefNode(StatListNode):
             [arg.type for arg in self.node.args if arg.type.is_fused])
         fused_types = self._get_fused_base_types(fused_compound_types)
         permutations = PyrexTypes.get_all_specialized_permutations(fused_types)
+        permutations = self._select_permutations(permutations, fused_types)
 
         self.fused_compound_types = fused_compound_types
 
@@ -136,6 +142,7 @@ class FusedCFuncDefNode(StatListNode):
 
         fused_types = self.node.type.get_fused_types()
         self.fused_compound_types = fused_types
+        permutations = self._select_permutations(permutations, fused_types)
 
         new_cfunc_entries = []
         for cname, fused_to_specific in permutations:
@@ -211,6 +218,41 @@ class FusedCFuncDefNode(StatListNode):
         else:
             self.py_func = orig_py_func
 
+    def _select_permutations(self, permutations, fused_types):
+        """
+        Restrict the permutations to the signatures listed in the
+        'fused_signatures' directive (in the format of the keys of
+        __signatures__, e.g. "double|int"), if any.
+        """
+        signatures = self.node.local_scope.directives.get('fused_signatures')
+        if not signatures:
+            return permutations
+        if self.node.entry.defined_in_pxd:
+            error(self.node.pos,
+                  "The fused_signatures directive cannot be used for functions declared in .pxd files")
+            return permutations
+
+        wanted = [u'|'.join(part.strip() for part in signature.split(u'|'))
+                  for signature in signatures]
+        selected = []
+        found = set()
+        for cname, fused_to_specific in permutations:
+            signature = u'|'.join(
+                PyrexTypes.specialization_signature_string(fused_type, fused_to_specific)
+                for fused_type in fused_types)
+            if signature in wanted:
+                found.add(signature)
+                selected.append((cname, fused_to_specific))
+
+        for signature, normalised in zip(signatures, wanted):
+            if normalised not in found:
+                error(self.node.pos, "Unknown fused signature '%s' for function '%s'" % (
+                    signature, self.node.entry.name))
+        if not selected:
+            return permutations
+        self.restricted_signatures = True
+        return selected
+
     def _get_fused_base_types(self, fused_compound_types):
         """
         Get a list of unique basic fused types, from a list of
@@ -479,6 +521,10 @@ class FusedCFuncDefNode(StatListNode):
         self._buffer_check_numpy_dtype(pyx_code, buffer_types, pythran_types)
         pyx_code.dedent(2)
 
+        if buffer_types and pyx_code.context.get('dispatch_cache_cname'):
+            # The format string matches depend on the object, not only on its type.
+            pyx_code.putln("dispatch_cacheable = False")
+
         for specialized_type in buffer_types:
             self._buffer_parse_format_string_check(
                     pyx_code, decl_code, specialized_type, env)
@@ -592,6 +638,65 @@ class FusedCFuncDefNode(StatListNode):
                 {{endif}}
             """)
 
+    def _dispatch_cache_key_size(self):
+        """
+        Count the object and integer items of the key under which the
+        dispatcher caches the selected specialisation: the signatures dict,
+        the type of each fused argument and, for buffer arguments, the NumPy
+        dtype and the number of dimensions.  Returns None if the dispatch
+        cannot be cached.
+        """
+        n_objects, n_ints = 1, 0
+        seen_fused_types = set()
+        for arg in self.node.args:
+            if not arg.type.is_fused:
+                continue
+            fused_type = arg.type.get_fused_types()[0]
+            if fused_type in seen_fused_types:
+                continue
+            seen_fused_types.add(fused_type)
+            _, buffer_types, pythran_types, _ = self._split_fused_types(arg)
+            if pythran_types:
+                # Pythran compatibility depends on the memory layout of the array.
+                return None
+            n_objects += 1
+            if buffer_types:
+                n_objects += 1
+                n_ints += 1
+        if n_objects + n_ints > self.dispatch_cache_max_key:
+            return None
+        return n_objects, n_ints
+
+    def _dispatch_cache_key(self, pyx_code, buffer_types):
+        """
+        Generate Cython code that unpacks the current argument and stores its
+        type (and NumPy dtype and ndim) in the dispatch cache key.
+        """
+        self._unpack_argument(pyx_code)
+        pyx_code.put_chunk(
+            u"""
+                arg_type = type(arg)
+                dispatch_key[{{dispatch_key_idx}}] = <void*>arg_type
+            """)
+        if buffer_types:
+            pyx_code.put_chunk(
+                u"""
+                    dtype = None
+                    if ndarray is not None:
+                        if isinstance(arg, ndarray):
+                            dtype = arg.dtype
+                        elif __pyx_memoryview_check(arg):
+                            arg_base = arg.base
+                            if isinstance(arg_base, ndarray):
+                                dtype = arg_base.dtype
+                    if dtype is None:
+                        dispatch_key[{{dispatch_key_idx + 1}}] = NULL
+                        dispatch_key[{{dispatch_ndim_idx}}] = NULL
+                    else:
+                        dispatch_key[{{dispatch_key_idx + 1}}] = <void*>dtype
+                        dispatch_key[{{dispatch_ndim_idx}}] = <void*><Py_ssize_t>arg.ndim
+                """)
+
     def _fused_signature_index(self, pyx_code):
         """
         Generate Cython code for constructing a persistent nested dictionary index of
@@ -633,6 +738,7 @@ class FusedCFuncDefNode(StatListNode):
                 if is_def else
                 sum(1 for arg in self.node.args if arg.default is None),
             'name': orig_py_func.entry.name,
+            'dispatch_cache_cname': None,
         }
 
         pyx_code = Code.PyxCodeWriter(context=context)
@@ -670,6 +776,42 @@ class FusedCFuncDefNode(StatListNode):
         pyx_code.named_insertion_point("imports")
         pyx_code.named_insertion_point("func_defs")
         pyx_code.named_insertion_point("local_variable_declarations")
+        pyx_code.named_insertion_point("dispatch_cache")
+
+        # Look up the types of the fused arguments in a small C level cache
+        # before searching the signatures.
+        dispatch_key_size = self._dispatch_cache_key_size()
+        if dispatch_key_size:
+            n_key_objects, n_key_ints = dispatch_key_size
+            context.update(
+                dispatch_cache_cname=env.next_id(Naming.fused_dispatch_cache_cname),
+                dispatch_key_objects=n_key_objects,
+                dispatch_key_size=n_key_objects + n_key_ints,
+                dispatch_key_idx=1,
+                dispatch_ndim_idx=n_key_objects,
+            )
+            cache_utility_code = Code.UtilityCode.load_cached("FusedDispatchCache", "CythonFunction.c")
+            env.use_utility_code(Code.UtilityCode(
+                proto="static __Pyx_FusedDispatchCache %s;" % context['dispatch_cache_cname'],
+                requires=[cache_utility_code]))
+            decl_code.put_chunk(
+                u"""
+                    ctypedef struct __Pyx_FusedDispatchCache:
+                        pass
+                    void *__Pyx_FusedDispatchCache_Lookup(__Pyx_FusedDispatchCache *cache, void **key, int nkey)
+                    int __Pyx_FusedDispatchCache_Store(__Pyx_FusedDispatchCache *cache, void **key, int nkey,
+                                                       int nobjects, object result) except -1
+                    __Pyx_FusedDispatchCache {{dispatch_cache_cname}}
+                """)
+            pyx_code.dispatch_cache.put_chunk(
+                u"""
+                    cdef void *dispatch_key[{{dispatch_key_size}}]
+                    cdef void *dispatch_result
+                    cdef bint dispatch_cacheable
+
+                    dispatch_cacheable = True
+                    dispatch_key[0] = <void*>signatures
+                """)
 
         fused_index = 0
         default_idx = 0
@@ -694,6 +836,11 @@ class FusedCFuncDefNode(StatListNode):
                 )
 
                 normal_types, buffer_types, pythran_types, has_object_fallback = self._split_fused_types(arg)
+                if dispatch_key_size:
+                    self._dispatch_cache_key(pyx_code.dispatch_cache, buffer_types)
+                    if buffer_types:
+                        context['dispatch_ndim_idx'] += 1
+                    context['dispatch_key_idx'] += 2 if buffer_types else 1
                 self._unpack_argument(pyx_code)
 
                 # 'unrolled' loop, first match breaks out of it
@@ -723,6 +870,15 @@ class FusedCFuncDefNode(StatListNode):
             env.use_utility_code(Code.UtilityCode.load_cached("Import", "ImportExport.c"))
             env.use_utility_code(Code.UtilityCode.load_cached("ImportNumPyArray", "ImportExport.c"))
 
+        if dispatch_key_size:
+            pyx_code.dispatch_cache.put_chunk(
+                u"""
+                    dispatch_result = __Pyx_FusedDispatchCache_Lookup(
+                        &{{dispatch_cache_cname}}, dispatch_key, {{dispatch_key_size}})
+                    if dispatch_result is not NULL:
+                        return <object>dispatch_result
+                """)
+
         self._fused_signature_index(pyx_code)
 
         pyx_code.put_chunk(
@@ -759,7 +915,16 @@ class FusedCFuncDefNode(StatListNode):
                 elif len(candidates) > 1:
                     raise TypeError("Function call with ambiguous argument types")
                 else:
+                {{if dispatch_cache_cname}}
+                    result = (<dict>signatures)[candidates[0]]
+                    if dispatch_cacheable:
+                        __Pyx_FusedDispatchCache_Store(
+                            &{{dispatch_cache_cname}}, dispatch_key, {{dispatch_key_size}},
+                            {{dispatch_key_objects}}, result)
+                    return result
+                {{else}}
                     return (<dict>signatures)[candidates[0]]
+                {{endif}}
             """)
 
         fragment_code = pyx_code.getvalue()
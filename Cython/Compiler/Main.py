@@ -23,17 +23,17 @@ except ImportError:
 # conditional metaclass. These options are processed by CmdLine called from
 # main() in this file.
 # import Parsing
+# The same goes for Scanning and Symtab, which pull in most of the compiler
+# (PyrexTypes, Code, TypeSlots, ...).  Importing them lazily keeps the startup
+# of tools that only need a Context for dependency lookups (cythonize, the
+# command line help) fast.
 from . import Errors
 from .StringEncoding import EncodedString
-from .Scanning import PyrexScanner, FileSourceDescriptor
 from .Errors import PyrexError, CompileError, error, warning
-from .Symtab import ModuleScope
 from .. import Utils
 from . import Options
 from .Options import CompilationOptions, default_options
 from .CmdLine import parse_command_line
-from .Lexicon import (unicode_start_ch_any, unicode_continuation_ch_any,
-                      unicode_start_ch_range, unicode_continuation_ch_range)
 
 
 def _make_range_re(chrs):
@@ -42,12 +42,18 @@ def _make_range_re(chrs):
         out.append(u"{0}-{1}".format(chrs[i], chrs[i+1]))
     return u"".join(out)
 
-# py2 version looked like r"[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)*$"
-module_name_pattern = u"[{0}{1}][{0}{2}{1}{3}]*".format(
-    unicode_start_ch_any, _make_range_re(unicode_start_ch_range),
-    unicode_continuation_ch_any,
-    _make_range_re(unicode_continuation_ch_range))
-module_name_pattern = re.compile(u"{0}(\\.{0})*$".format(module_name_pattern))
+
+@Utils.cached_function
+def get_module_name_pattern():
+    # Compiling the unicode ranges is comparatively slow, so do it on first use.
+    from .Lexicon import (unicode_start_ch_any, unicode_continuation_ch_any,
+                          unicode_start_ch_range, unicode_continuation_ch_range)
+    # py2 version looked like r"[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)*$"
+    module_name_pattern = u"[{0}{1}][{0}{2}{1}{3}]*".format(
+        unicode_start_ch_any, _make_range_re(unicode_start_ch_range),
+        unicode_continuation_ch_any,
+        _make_range_re(unicode_continuation_ch_range))
+    return re.compile(u"{0}(\\.{0})*$".format(module_name_pattern))
 
 
 standard_include_path = os.path.abspath(
@@ -66,19 +72,15 @@ class Context(object):
     #  future_directives     [object]
     #  language_level        int     currently 2 or 3 for Python 2/3
 
-    cython_scope = None
     language_level = None  # warn when not set but default to Py2
 
     def __init__(self, include_directories, compiler_directives, cpp=False,
                  language_level=None, options=None):
-        # cython_scope is a hack, set to False by subclasses, in order to break
-        # an infinite loop.
-        # Better code organization would fix it.
-
-        from . import Builtin, CythonScope
-        self.modules = {"__builtin__" : Builtin.builtin_scope}
-        self.cython_scope = CythonScope.create_cython_scope(self)
-        self.modules["cython"] = self.cython_scope
+        # The builtin and cython scopes are only created when the module
+        # namespace is first used, since many contexts (dependency tracking,
+        # string snippets) never look up a module.
+        self._modules = None
+        self._builtins_alias = False
         self.include_directories = include_directories
         self.future_directives = set()
         self.compiler_directives = compiler_directives
@@ -93,6 +95,33 @@ class Context(object):
 
         self.gdb_debug_outputwriter = None
 
+    def _create_modules(self):
+        from . import Builtin, CythonScope
+        self._modules = {"__builtin__" : Builtin.builtin_scope}
+        cython_scope = CythonScope.create_cython_scope(self)
+        self._modules["cython"] = cython_scope
+        if not hasattr(self, '_cython_scope'):
+            self._cython_scope = cython_scope
+        if self._builtins_alias:
+            self._modules['builtins'] = self._modules['__builtin__']
+
+    @property
+    def modules(self):
+        if self._modules is None:
+            self._create_modules()
+        return self._modules
+
+    @property
+    def cython_scope(self):
+        if not hasattr(self, '_cython_scope'):
+            self._create_modules()
+        return self._cython_scope
+
+    @cython_scope.setter
+    def cython_scope(self, scope):
+        # Utility code contexts share the cython scope of the main module (or None).
+        self._cython_scope = scope
+
     @classmethod
     def from_options(cls, options):
         return cls(options.include_path, options.compiler_directives,
@@ -112,7 +141,9 @@ class Context(object):
         self.language_level = level
         self.future_directives = future_directives
         if level >= 3:
-            self.modules['builtins'] = self.modules['__builtin__']
+            self._builtins_alias = True
+            if self._modules is not None:
+                self._modules['builtins'] = self._modules['__builtin__']
 
     def intern_ustring(self, value, encoding=None):
         key = (EncodedString, value, encoding)
@@ -126,10 +157,36 @@ class Context(object):
         self._interned[key] = value
         return value
 
+    def profile_line_counts(self, source_desc):
+        """
+        Return the line execution counts that the profile data (if any)
+        holds for the source file as a dict {line: count}, or None.
+        """
+        profile_data_file = getattr(self.options, 'profile_data', None)
+        if not profile_data_file:
+            return None
+        from .Scanning import FileSourceDescriptor
+        if not isinstance(source_desc, FileSourceDescriptor):
+            return None
+        profile_data = getattr(self, '_profile_data', None)
+        if profile_data is None:
+            from ..ProfileData import load_profile_data
+            profile_data = self._profile_data = load_profile_data(profile_data_file)
+        # Code objects use the file name from the module's file name table,
+        # which depends on the working directory, so fall back to the base name.
+        counts = profile_data.get(source_desc.get_filenametable_entry())
+        if counts is None:
+            basename = os.path.basename(source_desc.get_filenametable_entry())
+            for filename, file_counts in profile_data.items():
+                if os.path.basename(filename) == basename:
+                    return file_counts
+        return counts
+
     # pipeline creation functions can now be found in Pipeline.py
 
     def process_pxd(self, source_desc, scope, module_name):
         from . import Pipeline
+        from .Scanning import FileSourceDescriptor
         if isinstance(source_desc, FileSourceDescriptor) and source_desc._file_type == 'pyx':
             source = CompilationSource(source_desc, module_name, os.getcwd())
             result_sink = create_default_resultobj(source, self.options)
@@ -171,7 +228,7 @@ class Context(object):
         else:
             qualified_name = module_name
 
-        if not module_name_pattern.match(qualified_name):
+        if not get_module_name_pattern().match(qualified_name):
             raise CompileError(pos or (module_name, 0, 0),
                                u"'%s' is not a valid module name" % module_name)
 
@@ -222,6 +279,7 @@ class Context(object):
                     rel_path = module_name.replace('.', os.sep) + os.path.splitext(pxd_pathname)[1]
                     if not pxd_pathname.endswith(rel_path):
                         rel_path = pxd_pathname  # safety measure to prevent printing incorrect paths
+                    from .Scanning import FileSourceDescriptor
                     source_desc = FileSourceDescriptor(pxd_pathname, rel_path)
                     err, result = self.process_pxd(source_desc, scope, qualified_name)
                     if err:
@@ -324,12 +382,14 @@ class Context(object):
         # Find a top-level module, creating a new one if needed.
         scope = self.lookup_submodule(name)
         if not scope:
+            from .Symtab import ModuleScope
             scope = ModuleScope(name,
                 parent_module = None, context = self)
             self.modules[name] = scope
         return scope
 
     def parse(self, source_desc, scope, pxd, full_module_name):
+        from .Scanning import PyrexScanner, FileSourceDescriptor
         if not isinstance(source_desc, FileSourceDescriptor):
             raise RuntimeError("Only file sources for code supported")
         source_filename = source_desc.filename
@@ -403,6 +463,7 @@ class Context(object):
                                  echo_to_stderr=options.errors_to_stderr)
 
     def teardown_errors(self, err, options, result):
+        from .Scanning import FileSourceDescriptor
         source_desc = result.compilation_source.source_desc
         if not isinstance(source_desc, FileSourceDescriptor):
             raise RuntimeError("Only file sources for code supported")
@@ -447,6 +508,7 @@ def create_default_resultobj(compilation_source, options):
 
 def run_pipeline(source, options, full_module_name=None, context=None):
     from . import Pipeline
+    from .Scanning import FileSourceDescriptor
 
     # ensure that the inputs are unicode (for Python 2)
     if sys.version_info[0] == 2:
@@ -640,6 +702,7 @@ def search_include_directories(dirs, qualified_name, suffix, pos, include=False)
     The 'include' option will disable package dereferencing.
     """
     if pos:
+        from .Scanning import FileSourceDescriptor
         file_desc = pos[0]
         if not isinstance(file_desc, FileSourceDescriptor):
             raise RuntimeError("Only file sources for code supported")
@@ -655,7 +718,7 @@ def search_include_directories(dirs, qualified_name, suffix, pos, include=False)
 
     for dirname in dirs:
         path = os.path.join(dirname, dotted_filename)
-        if os.path.exists(path):
+        if Utils.path_index.exists(path):
             if '.' in qualified_name and '.' in os.path.splitext(dotted_filename)[0]:
                 warning(pos, "Dotted filenames ('%s') are deprecated."
                              " Please use the normal Python package directory layout." % dotted_filename, level=1)
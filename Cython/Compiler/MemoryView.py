@@ -4,6 +4,7 @@ from .Errors import CompileError, error
 from . import ExprNodes
 from .ExprNodes import IntNode, NameNode, AttributeNode
 from . import Options
+from . import Naming
 from .Code import UtilityCode, TempitaUtilityCode
 from .UtilityCode import CythonUtilityCode
 from . import Buffer
@@ -216,10 +217,16 @@ class MemoryViewSliceBufferEntry(Buffer.BufferEntry):
         """
         bufp = self.buf_ptr
         type_decl = self.type.dtype.empty_declaration_code()
+        hoisted = code.funcstate.hoisted_memviewslices.get(self.cname)
+        if hoisted:
+            bufp = hoisted[0]
 
         for dim, index, access, packing in axes:
             shape = "%s.shape[%d]" % (self.cname, dim)
-            stride = "%s.strides[%d]" % (self.cname, dim)
+            if hoisted:
+                stride = hoisted[1][dim]
+            else:
+                stride = "%s.strides[%d]" % (self.cname, dim)
             suboffset = "%s.suboffsets[%d]" % (self.cname, dim)
 
             flag = get_memoryview_flag(access, packing)
@@ -256,12 +263,14 @@ class MemoryViewSliceBufferEntry(Buffer.BufferEntry):
         return bufp
 
     def generate_buffer_slice_code(self, code, indices, dst, dst_type, have_gil,
-                                   have_slices, directives):
+                                   have_slices, directives, acquire=True):
         """
         Slice a memoryviewslice.
 
         indices     - list of index nodes. If not a SliceNode, or NoneNode,
                       then it must be coercible to Py_ssize_t
+        acquire     - whether the new slice acquires the memoryview, which
+                      is not needed if it does not outlive the source slice
 
         Simply call __pyx_memoryview_slice_memviewslice with the right
         arguments, unless the dimension is omitted or a bare ':', in which
@@ -272,7 +281,8 @@ class MemoryViewSliceBufferEntry(Buffer.BufferEntry):
 
         code.putln("%(dst)s.data = %(src)s.data;" % locals())
         code.putln("%(dst)s.memview = %(src)s.memview;" % locals())
-        code.put_incref_memoryviewslice(dst, dst_type, have_gil=have_gil)
+        if acquire:
+            code.put_incref_memoryviewslice(dst, dst_type, have_gil=have_gil)
 
         all_dimensions_direct = all(access == 'direct' for access, packing in self.type.axes)
         suboffset_dim_temp = []
@@ -345,6 +355,46 @@ class MemoryViewSliceBufferEntry(Buffer.BufferEntry):
             code.funcstate.release_temp(suboffset_dim_temp[0])
 
 
+def put_hoisted_memviewslice_loads(code, slices):
+    """
+    Load the data pointers and the strides of the memoryview slices into
+    local variables before a loop, so that indexing in the loop body does
+    not read them from the slice structs again.  'slices' is a list of
+    (cname, type, restrict) tuples, where 'restrict' declares the data
+    pointer as not aliasing any other pointer.
+
+    The code must be written into a new C block that ends after the loop.
+    Returns the cnames of the slices that were hoisted, which must be passed
+    to release_hoisted_memviewslices() at the end of the block.
+    """
+    hoisted = code.funcstate.hoisted_memviewslices
+    cnames = []
+    for cname, type, restrict in slices:
+        if cname in hoisted:
+            # already loaded by an outer loop
+            continue
+        prefix = "%s%d" % (Naming.hoisted_prefix, len(hoisted))
+        data_cname = "%s_data" % prefix
+        code.putln("char *%s%s = %s.data;" % (
+            "CYTHON_RESTRICT " if restrict else "", data_cname, cname))
+        strides = []
+        for dim, (access, packing) in enumerate(type.axes):
+            stride = "%s.strides[%d]" % (cname, dim)
+            if get_memoryview_flag(access, packing) != 'contiguous':
+                stride_cname = "%s_stride%d" % (prefix, dim)
+                code.putln("Py_ssize_t const %s = %s;" % (stride_cname, stride))
+                stride = stride_cname
+            strides.append(stride)
+        hoisted[cname] = (data_cname, strides)
+        cnames.append(cname)
+    return cnames
+
+
+def release_hoisted_memviewslices(code, cnames):
+    for cname in cnames:
+        del code.funcstate.hoisted_memviewslices[cname]
+
+
 def empty_slice(pos):
     none = ExprNodes.NoneNode(pos)
     return ExprNodes.SliceNode(pos, start=none,
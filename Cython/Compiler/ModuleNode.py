@@ -30,6 +30,7 @@ from . import Pythran
 from .Errors import error, warning
 from .PyrexTypes import py_object_type
 from ..Utils import open_new_file, replace_suffix, decode_filename, build_hex_version
+from ..StringIOTree import StringIOTree, SpillFile
 from .Code import UtilityCode, IncludeCode, TempitaUtilityCode
 from .StringEncoding import EncodedString, encoded_string_or_bytes_literal
 from .Pythran import has_np_pythran
@@ -60,8 +61,11 @@ def check_c_declarations(module_node):
 def generate_c_code_config(env, options):
     if Options.annotate or options.annotate:
         emit_linenums = False
+        # annotation walks the syntax tree after code generation
+        release_function_bodies = False
     else:
         emit_linenums = options.emit_linenums
+        release_function_bodies = True
 
     if hasattr(options, "emit_code_comments"):
         print('Warning: option emit_code_comments is deprecated. '
@@ -70,7 +74,8 @@ def generate_c_code_config(env, options):
     return Code.CCodeConfig(
         emit_linenums=emit_linenums,
         emit_code_comments=env.directives['emit_code_comments'],
-        c_line_in_traceback=options.c_line_in_traceback)
+        c_line_in_traceback=options.c_line_in_traceback,
+        release_function_bodies=release_function_bodies)
 
 
 class ModuleNode(Nodes.Node, Nodes.BlockNode):
@@ -403,6 +408,7 @@ class ModuleNode(Nodes.Node, Nodes.BlockNode):
     def generate_c_code(self, env, options, result):
         modules = self.referenced_modules
 
+        spill_file = None
         if Options.annotate or options.annotate:
             show_entire_c_code = Options.annotate == "fullc" or options.annotate == "fullc"
             rootwriter = Annotate.AnnotationCCodeWriter(
@@ -410,7 +416,9 @@ class ModuleNode(Nodes.Node, Nodes.BlockNode):
                 source_desc=self.compilation_source.source_desc,
             )
         else:
-            rootwriter = Code.CCodeWriter()
+            # finished parts of the C code are kept in a temporary file until we write it out
+            spill_file = SpillFile()
+            rootwriter = Code.CCodeWriter(buffer=StringIOTree(spill_file=spill_file))
 
         c_code_config = generate_c_code_config(env, options)
 
@@ -488,6 +496,8 @@ class ModuleNode(Nodes.Node, Nodes.BlockNode):
         result.c_file_generated = 1
         if options.gdb_debug:
             self._serialize_lineno_map(env, rootwriter)
+        if spill_file is not None:
+            spill_file.close()
         if Options.annotate or options.annotate:
             self._generate_annotations(rootwriter, result, options)
 
@@ -1220,6 +1230,10 @@ class ModuleNode(Nodes.Node, Nodes.BlockNode):
                 "struct %s *%s;" % (
                     type.vtabstruct_cname,
                     type.vtabslot_cname))
+        if type.scope.vectorcall_slot_cname() == Naming.vectorcallslot_cname:
+            code.putln("#if CYTHON_USE_TYPE_VECTORCALL")
+            code.putln("__pyx_vectorcallfunc %s;" % Naming.vectorcallslot_cname)
+            code.putln("#endif")
         for attr in type.scope.var_entries:
             if attr.is_declared_generic:
                 attr_type = py_object_type
@@ -1337,6 +1351,7 @@ class ModuleNode(Nodes.Node, Nodes.BlockNode):
                 scope = type.scope
                 if scope:  # could be None if there was an error
                     self.generate_exttype_vtable(scope, code)
+                    self.generate_vectorcall_functions(scope, code)
                     self.generate_new_function(scope, code, entry)
                     self.generate_dealloc_function(scope, code)
                     if scope.needs_gc():
@@ -1395,6 +1410,50 @@ class ModuleNode(Nodes.Node, Nodes.BlockNode):
                 type.declaration_code("p"),
                 type.empty_declaration_code()))
 
+    def generate_vectorcall_functions(self, scope, code):
+        # Generate the tp_vectorcall function that instantiates the type and
+        # the vectorcall function of its instances, which adapt the vectorcall
+        # protocol to the METH_FASTCALL wrappers of __init__ and __call__.
+        type = scope.parent_type
+        init_entry = scope.vectorcall_init_entry()
+        call_entry = scope.lookup_here("__call__")
+        if not (call_entry and call_entry.vectorcall_cname and scope.sets_vectorcall_slot()):
+            call_entry = None
+        if not (init_entry or call_entry):
+            return
+        code.putln("")
+        code.putln("#if CYTHON_USE_TYPE_VECTORCALL")
+        if init_entry:
+            code.globalstate.use_utility_code(
+                UtilityCode.load_cached("TypeVectorcallFallback", "ExtensionTypes.c"))
+            tp_new = TypeSlots.get_slot_code_by_name(scope, "tp_new")
+            if tp_new == "0":
+                tp_new = "((PyTypeObject *)t)->tp_new"
+            code.putln(
+                "static PyObject *%s(PyObject *t, PyObject *const *args, size_t nargsf, PyObject *kwnames) {" % (
+                    scope.mangle_internal("tp_vectorcall")))
+            code.putln("PyObject *o;")
+            code.putln("if (unlikely(t != (PyObject *)%s)) {" % type.typeptr_cname)
+            code.putln("return __Pyx_PyType_VectorcallFallback(t, args, nargsf, kwnames);")
+            code.putln("}")
+            code.putln("o = %s((PyTypeObject *)t, %s, NULL);" % (tp_new, Naming.empty_tuple))
+            code.putln("if (unlikely(!o)) return NULL;")
+            code.putln("if (unlikely(%s(o, args, __Pyx_PyVectorcall_NARGS(nargsf), kwnames) < 0)) {" % (
+                init_entry.vectorcall_cname))
+            code.putln("Py_DECREF(o);")
+            code.putln("return NULL;")
+            code.putln("}")
+            code.putln("return o;")
+            code.putln("}")
+        if call_entry:
+            code.putln(
+                "static PyObject *%s(PyObject *o, PyObject *const *args, size_t nargsf, PyObject *kwnames) {" % (
+                    scope.mangle_internal("vectorcall_call")))
+            code.putln("return %s(o, args, __Pyx_PyVectorcall_NARGS(nargsf), kwnames);" % (
+                call_entry.vectorcall_cname))
+            code.putln("}")
+        code.putln("#endif")
+
     def generate_new_function(self, scope, code, cclass_entry):
         tp_slot = TypeSlots.ConstructorSlot("tp_new", "__cinit__")
         slot_func = scope.mangle_internal("tp_new")
@@ -1443,9 +1502,10 @@ class ModuleNode(Nodes.Node, Nodes.BlockNode):
             "static PyObject *%s(PyTypeObject *t, %sPyObject *a, %sPyObject *k) {" % (
                 slot_func, unused_marker, unused_marker))
 
+        sets_vectorcall_slot = scope.sets_vectorcall_slot()
         need_self_cast = (type.vtabslot_cname or
                           (py_buffers or memoryview_slices or py_attrs) or
-                          cpp_constructable_attrs)
+                          cpp_constructable_attrs or sets_vectorcall_slot)
         if need_self_cast:
             code.putln("%s;" % scope.parent_type.declaration_code("p"))
         if base_type:
@@ -1515,6 +1575,14 @@ class ModuleNode(Nodes.Node, Nodes.BlockNode):
                 type.vtabslot_cname,
                 struct_type_cast, type.vtabptr_cname))
 
+        if sets_vectorcall_slot:
+            call_entry = scope.lookup_here("__call__")
+            code.putln("#if CYTHON_USE_TYPE_VECTORCALL")
+            code.putln("p->%s = %s;" % (
+                scope.vectorcall_slot_cname(),
+                scope.mangle_internal("vectorcall_call") if call_entry.vectorcall_cname else "NULL"))
+            code.putln("#endif")
+
         for entry in cpp_constructable_attrs:
             code.putln("new((void*)&(p->%s)) %s();" % (
                 entry.cname, entry.type.empty_declaration_code()))
@@ -2439,6 +2507,11 @@ class ModuleNode(Nodes.Node, Nodes.BlockNode):
         for entry in env.pyfunc_entries:
             if not entry.fused_cfunction and not (binding and entry.is_overridable):
                 code.put_pymethoddef(entry, ",", wrapper_code_writer=wrapper_code_writer)
+        if env.is_module_scope and code.globalstate.profile_counter_names:
+            self.generate_profile_counters(code.globalstate['decls'], wrapper_code_writer)
+            code.putln(
+                '{"__pyx_profile_stats__", (PyCFunction)(void*)(PyCFunctionWithKeywords)%s, '
+                'METH_VARARGS|METH_KEYWORDS, 0},' % Naming.profile_stats_cname)
         code.putln(
             "{0, 0, 0, 0}")
         code.putln(
@@ -2447,6 +2520,21 @@ class ModuleNode(Nodes.Node, Nodes.BlockNode):
         if wrapper_code_writer.getvalue():
             wrapper_code_writer.putln("")
 
+    def generate_profile_counters(self, decl_code, code):
+        # The counters of the 'profile_counters' directive and the module function
+        # "__pyx_profile_stats__(reset=False)" that reports them.
+        names = code.globalstate.profile_counter_names
+        decl_code.putln("static __Pyx_ProfileCounter %s[%d];" % (Naming.profile_counters_cname, len(names)))
+        decl_code.putln("static const char * const %s[%d] = {%s};" % (
+            Naming.profile_counter_names_cname, len(names),
+            ", ".join(EncodedString(name).as_c_string_literal() for name in names)))
+        code.putln("")
+        code.putln("static PyObject *%s(CYTHON_UNUSED PyObject *self, PyObject *args, PyObject *kwds) {" %
+                   Naming.profile_stats_cname)
+        code.putln("return __Pyx_ProfileCounterStats(%s, %s, %d, args, kwds);" % (
+            Naming.profile_counters_cname, Naming.profile_counter_names_cname, len(names)))
+        code.putln("}")
+
     def generate_dict_getter_function(self, scope, code):
         dict_attr = scope.lookup_here("__dict__")
         if not dict_attr or not dict_attr.is_variable:
@@ -10,6 +10,7 @@ pyrex_prefix    = "__pyx_"
 
 
 codewriter_temp_prefix = pyrex_prefix + "t_"
+hoisted_prefix = pyrex_prefix + "h_"
 
 temp_prefix       = u"__cyt_"
 
@@ -23,6 +24,7 @@ func_prefix       = pyrex_prefix + "f_"
 func_prefix_api   = pyrex_prefix + "api_f_"
 pyfunc_prefix     = pyrex_prefix + "pf_"
 pywrap_prefix     = pyrex_prefix + "pw_"
+pyvectorcall_prefix = pyrex_prefix + "pvc_"
 genbody_prefix    = pyrex_prefix + "gb_"
 gstab_prefix      = pyrex_prefix + "getsets_"
 prop_get_prefix   = pyrex_prefix + "getprop_"
@@ -104,6 +106,7 @@ reqd_kwds_cname  = pyrex_prefix + "reqd_kwds"
 self_cname       = pyrex_prefix + "self"
 stringtab_cname  = pyrex_prefix + "string_tab"
 vtabslot_cname   = pyrex_prefix + "vtab"
+vectorcallslot_cname = pyrex_prefix + "vectorcall"
 c_api_tab_cname  = pyrex_prefix + "c_api_tab"
 gilstate_cname   = pyrex_prefix + "state"
 skip_dispatch_cname = pyrex_prefix + "skip_dispatch"
@@ -126,8 +129,12 @@ cur_scope_cname  = pyrex_prefix + "cur_scope"
 enc_scope_cname  = pyrex_prefix + "enc_scope"
 frame_cname      = pyrex_prefix + "frame"
 frame_code_cname = pyrex_prefix + "frame_code"
+profile_counters_cname = pyrex_prefix + "profile_counters"
+profile_counter_names_cname = pyrex_prefix + "profile_counter_names"
+profile_stats_cname = pyrex_prefix + "profile_stats"
 binding_cfunc    = pyrex_prefix + "binding_PyCFunctionType"
 fused_func_prefix = pyrex_prefix + 'fuse_'
+fused_dispatch_cache_cname = pyrex_prefix + "fused_dispatch_cache"
 quick_temp_cname = pyrex_prefix + "temp"  # temp variable for quick'n'dirty temping
 tp_dict_version_temp = pyrex_prefix + "tp_dict_version"
 obj_dict_version_temp = pyrex_prefix + "obj_dict_version"
@@ -394,8 +394,11 @@ class StatListNode(Node):
 
     def generate_function_definitions(self, env, code):
         #print "StatListNode.generate_function_definitions" ###
+        release_bodies = code.globalstate.code_config.release_function_bodies
         for stat in self.stats:
             stat.generate_function_definitions(env, code)
+            if release_bodies and isinstance(stat, FuncDefNode):
+                stat.release_function_body()
 
     def generate_execution_code(self, code):
         #print "StatListNode.generate_execution_code" ###
@@ -1812,6 +1815,20 @@ class FuncDefNode(StatNode, BlockNode):
     def generate_function_body(self, env, code):
         self.body.generate_execution_code(code)
 
+    def release_function_body(self):
+        # Drop the body and the control flow references of the local
+        # scope after generating the C code of the function (and of all
+        # functions nested in it), so that large modules do not keep
+        # their complete syntax tree alive until the end of the compilation.
+        # Functions in .pxd files are kept, as their trees are shared
+        # between all modules that get compiled in the same context.
+        if self.pos[0].is_pxd_file():
+            return
+        for entry in self.local_scope.entries.values():
+            entry.cf_assignments = []
+            entry.cf_references = []
+        self.body = StatListNode(self.body.pos, stats=[])
+
     def generate_function_definitions(self, env, code):
         from . import Buffer
 
@@ -1845,6 +1862,13 @@ class FuncDefNode(StatNode, BlockNode):
                 code.use_fast_gil_utility_code()
             code.globalstate.use_utility_code(
                 UtilityCode.load_cached("Profile", "Profile.c"))
+        profile_counter = None
+        if code.globalstate.directives['profile_counters'] and not (self.is_wrapper or self.is_generator):
+            # cpdef functions are counted in their C function, not in the Python wrapper.
+            # Generators return from their body at each 'yield', so they are not counted.
+            profile_counter = code.globalstate.lookup_profile_counter(self.entry.qualified_name)
+            code.globalstate.use_utility_code(
+                UtilityCode.load_cached("ProfileCounters", "Profile.c"))
 
         # Generate C code for header and body of function
         code.enter_cfunc_scope(lenv)
@@ -1941,6 +1965,8 @@ class FuncDefNode(StatNode, BlockNode):
                 tempvardecl_code.put_trace_declarations()
                 code_object = self.code_object.calculate_result_code(code) if self.code_object else None
                 code.put_trace_frame_init(code_object)
+        if profile_counter:
+            tempvardecl_code.putln('__Pyx_ProfileCounterDeclarations')
 
         # ----- Special check for getbuffer
         if is_getbuffer_slot:
@@ -2251,6 +2277,9 @@ class FuncDefNode(StatNode, BlockNode):
             code.putln("if (unlikely(%s == -1) && !PyErr_Occurred()) %s = -2;" % (
                 Naming.retval_cname, Naming.retval_cname))
 
+        if profile_counter:
+            code.putln('__Pyx_ProfileCounterUpdate(%s)' % profile_counter)
+
         if profile or linetrace:
             code.funcstate.can_trace = False
             if not self.is_generator:
@@ -2630,10 +2659,11 @@ class CFuncDefNode(FuncDefNode):
         return ReturnStatNode(pos=self.pos, return_type=PyrexTypes.py_object_type, value=c_call)
 
     def declare_arguments(self, env):
-        for arg in self.type.args:
+        for i, arg in enumerate(self.type.args):
             if not arg.name:
                 error(arg.pos, "Missing argument name")
-            self.declare_argument(env, arg)
+            entry = self.declare_argument(env, arg)
+            entry.is_self_arg = i == 0 and self.is_c_class_method and not self.is_static_method
 
     def need_gil_acquisition(self, lenv):
         return self.type.with_gil
@@ -2890,6 +2920,7 @@ class DefNode(FuncDefNode):
     py_wrapper = None
     py_wrapper_required = True
     func_cname = None
+    vectorcall_signature = None
 
     defaults_getter = None
 
@@ -3186,9 +3217,17 @@ class DefNode(FuncDefNode):
         # 1. If we use METH_NOARGS or METH_O, keep that. We can only change
         #    METH_VARARGS to METH_FASTCALL
         # 2. Special methods like __call__ always use the METH_VARGARGS
-        #    calling convention
+        #    calling convention, but __init__ and __call__ of extension types
+        #    get an additional METH_FASTCALL wrapper for vectorcall
         mf = sig.method_flags()
-        if mf and TypeSlots.method_varargs in mf and not self.entry.is_special:
+        if self.entry.is_special:
+            supports_fastcall = (
+                self.name in TypeSlots.vectorcall_special_methods and
+                env.is_c_class_scope and sig.has_generic_args and
+                not self.has_fused_arguments)
+        else:
+            supports_fastcall = mf and TypeSlots.method_varargs in mf
+        if supports_fastcall:
             # 3. If the function uses the full args tuple, it's more
             #    efficient to use METH_VARARGS. This happens when the function
             #    takes *args but no other positional arguments (apart from
@@ -3204,7 +3243,11 @@ class DefNode(FuncDefNode):
             else:
                 uses_args_tuple = False
 
-            if not uses_args_tuple:
+            if uses_args_tuple:
+                pass
+            elif self.entry.is_special:
+                self.vectorcall_signature = sig.with_fastcall()
+            else:
                 sig = self.entry.signature = sig.with_fastcall()
 
     def bad_signature(self):
@@ -3325,6 +3368,8 @@ class DefNode(FuncDefNode):
         if self.py_wrapper_required:
             # func_cname might be modified by @cname
             self.py_wrapper.func_cname = self.entry.func_cname
+            if self.entry.vectorcall_cname:
+                self.py_wrapper.generate_vectorcall_function_definitions(env, code)
             self.py_wrapper.generate_function_definitions(env, code)
         FuncDefNode.generate_function_definitions(self, env, code)
 
@@ -3408,6 +3453,7 @@ class DefNodeWrapper(FuncDefNode):
 
     defnode = None
     target = None  # Target DefNode
+    is_vectorcall_variant = False
 
     def __init__(self, *args, **kwargs):
         FuncDefNode.__init__(self, *args, **kwargs)
@@ -3424,6 +3470,8 @@ class DefNodeWrapper(FuncDefNode):
         prefix = env.next_id(env.scope_prefix)
         target_entry.func_cname = punycodify_name(Naming.pywrap_prefix + prefix + name)
         target_entry.pymethdef_cname = punycodify_name(Naming.pymethdef_prefix + prefix + name)
+        if self.target.vectorcall_signature:
+            target_entry.vectorcall_cname = punycodify_name(Naming.pyvectorcall_prefix + prefix + name)
 
         self.signature = target_entry.signature
 
@@ -3489,6 +3537,21 @@ class DefNodeWrapper(FuncDefNode):
         code.putln('%s(%s);' % (
             self.target.entry.pyfunc_cname, args))
 
+    def generate_vectorcall_function_definitions(self, env, code):
+        # Generate the METH_FASTCALL variant of the wrapper of __init__ or
+        # __call__ that the vectorcall functions of the extension type use.
+        signature = self.signature
+        self.signature = self.target.vectorcall_signature
+        self.is_vectorcall_variant = True
+        code.putln("")
+        code.putln("#if CYTHON_USE_TYPE_VECTORCALL")
+        try:
+            self.generate_function_definitions(env, code)
+        finally:
+            self.signature = signature
+            self.is_vectorcall_variant = False
+        code.putln("#endif")
+
     def generate_function_definitions(self, env, code):
         lenv = self.target.local_scope
         # Generate C code for header and body of function
@@ -3503,7 +3566,7 @@ class DefNodeWrapper(FuncDefNode):
         code.return_from_error_cleanup_label = code.new_label()
 
         with_pymethdef = (self.target.needs_assignment_synthesis(env, code) or
-                          self.target.pymethdef_required)
+                          self.target.pymethdef_required) and not self.is_vectorcall_variant
         self.generate_function_header(code, with_pymethdef)
         self.generate_argument_declarations(lenv, code)
         tempvardecl_code = code.insertion_point()
@@ -3598,8 +3661,14 @@ class DefNodeWrapper(FuncDefNode):
                 and entry.scope.is_c_class_scope):
             mf = "CYTHON_UNUSED "
             with_pymethdef = False
+        elif self.is_vectorcall_variant:
+            mf = "CYTHON_UNUSED "
 
-        dc = self.return_type.declaration_code(entry.func_cname)
+        if self.is_vectorcall_variant:
+            func_cname = entry.vectorcall_cname
+        else:
+            func_cname = entry.func_cname
+        dc = self.return_type.declaration_code(func_cname)
         header = "static %s%s(%s)" % (mf, dc, arg_code)
         code.putln("%s; /*proto*/" % header)
 
@@ -3614,6 +3683,7 @@ class DefNodeWrapper(FuncDefNode):
 
         if (Options.docstrings and entry.doc and
                 not self.target.fused_py_func and
+                not self.is_vectorcall_variant and
                 not entry.scope.is_property_scope and
                 (not entry.is_special or entry.wrapperbase_cname)):
             # h_code = code.globalstate['h_code']
@@ -4420,6 +4490,10 @@ class GeneratorDefNode(DefNode):
         super(GeneratorDefNode, self).generate_function_definitions(env, code)
         self.gbody.generate_function_definitions(env, code)
 
+    def release_function_body(self):
+        super(GeneratorDefNode, self).release_function_body()
+        self.gbody.release_function_body()
+
 
 class AsyncDefNode(GeneratorDefNode):
     gen_type_name = 'Coroutine'
@@ -5247,6 +5321,15 @@ class CClassDefNode(ClassDefNode):
             code.putln("#else")
             for slot in TypeSlots.slot_table:
                 slot.generate_dynamic_init_code(scope, code)
+            call_entry = scope.lookup_here("__call__")
+            if call_entry and call_entry.vectorcall_cname and scope.sets_vectorcall_slot():
+                code.putln("#if CYTHON_USE_TYPE_VECTORCALL")
+                code.putln("%s.tp_vectorcall_offset = offsetof(%s, %s);" % (
+                    typeobj_cname,
+                    type.declaration_code("", deref=True),
+                    scope.vectorcall_slot_cname()))
+                code.putln("%s.tp_flags |= Py_TPFLAGS_HAVE_VECTORCALL;" % typeobj_cname)
+                code.putln("#endif")
             if heap_type_bases:
                 code.globalstate.use_utility_code(
                     UtilityCode.load_cached('PyType_Ready', 'ExtensionTypes.c'))
@@ -5264,6 +5347,11 @@ class CClassDefNode(ClassDefNode):
             code.putln("#if PY_MAJOR_VERSION < 3")
             code.putln("%s.tp_print = 0;" % typeobj_cname)
             code.putln("#endif")
+            if scope.vectorcall_init_entry():
+                code.putln("#if CYTHON_USE_TYPE_VECTORCALL")
+                code.putln("%s.tp_vectorcall = %s;" % (
+                    typeobj_cname, scope.mangle_internal("tp_vectorcall")))
+                code.putln("#endif")
 
             # Use specialised attribute lookup for types with generic lookup but no instance dict.
             getattr_slot_func = TypeSlots.get_slot_code_by_name(scope, 'tp_getattro')
@@ -7187,12 +7275,17 @@ class ForFromStatNode(LoopNode, StatNode):
     #  is_py_target       bool
     #  loopvar_node       ExprNode (usually a NameNode or temp node)
     #  py_loopvar_node    PyTempNode or None
+    #  hoisted_memviews   [(ExprNode, bool)]  memoryview slices whose data pointer and strides are loaded
+    #                                         before the loop, and whether the data pointer is 'restrict'
+    #  vectorize          bool     hint the C compiler that the loop can be vectorised
     child_attrs = ["target", "bound1", "bound2", "step", "body", "else_clause"]
 
     is_py_target = False
     loopvar_node = None
     py_loopvar_node = None
     from_range = False
+    hoisted_memviews = ()
+    vectorize = False
 
     gil_message = "For-loop using object bounds or target"
 
@@ -7292,6 +7385,16 @@ class ForFromStatNode(LoopNode, StatNode):
             loopvar_name = code.funcstate.allocate_temp(loopvar_type, False)
         else:
             loopvar_name = self.loopvar_node.result()
+
+        if self.hoisted_memviews:
+            from . import MemoryView
+            code.putln("{")
+            hoisted_cnames = MemoryView.put_hoisted_memviewslice_loads(code, [
+                (memview.result(), memview.type, restrict) for memview, restrict in self.hoisted_memviews])
+        if self.vectorize:
+            code.globalstate.use_utility_code(UtilityCode.load_cached("VectorizeLoop", "ModuleSetupCode.c"))
+            code.putln("CYTHON_VECTORIZE_LOOP")
+
         if loopvar_type.is_int and not loopvar_type.signed and self.relation2[0] == '>':
             # Handle the case where the endpoint of an unsigned int iteration
             # is within step of 0.
@@ -7351,6 +7454,9 @@ class ForFromStatNode(LoopNode, StatNode):
                 target_node.release(code)
 
         code.putln("}")
+        if self.hoisted_memviews:
+            MemoryView.release_hoisted_memviewslices(code, hoisted_cnames)
+            code.putln("}")
 
         if not from_range and self.py_loopvar_node:
             # This is potentially wasteful, but we don't want the semantics to
@@ -8941,6 +9047,9 @@ class ParallelStatNode(StatNode, ParallelNode):
         if self.is_parallel and not self.is_nested_prange:
             code.putln("/* Clean up any temporaries */")
             for temp, type in sorted(self.temps):
+                if type.is_memoryviewslice and not code.funcstate.temps_used_type[temp][1]:
+                    # borrowed slice
+                    continue
                 code.put_xdecref_clear(temp, type, have_gil=False)
 
     def setup_parallel_control_flow_block(self, code):
@@ -27,6 +27,7 @@ from . import Visitor
 from . import Builtin
 from . import UtilNodes
 from . import Options
+from . import Naming
 
 from .Code import UtilityCode, TempitaUtilityCode
 from .StringEncoding import EncodedString, bytes_literal, encoded_string
@@ -4883,7 +4884,9 @@ class FinalOptimizePhase(Visitor.EnvTransform, Visitor.NodeRefCleanupMixin):
         - eliminate checks for None and/or types that became redundant after tree changes
         - eliminate useless string formatting steps
         - inject branch hints for unlikely if-cases that only raise exceptions
+        - inject branch hints for if-cases based on profile data
         - replace Python function calls that look like method calls by a faster PyMethodCallNode
+        - borrow temporary memoryview slices of local variables that are only passed into C functions
     """
     in_loop = False
 
@@ -4901,9 +4904,12 @@ class FinalOptimizePhase(Visitor.EnvTransform, Visitor.NodeRefCleanupMixin):
         """
         Replace generic calls to isinstance(x, type) by a more efficient type check.
         Replace likely Python method calls by a specialised PyMethodCallNode.
+        Avoid acquiring memoryview slices that are created only to be passed into a C function.
         """
         self.visitchildren(node)
         function = node.function
+        if function.type.is_cfunction:
+            self._borrow_memoryview_slice_args(node)
         if function.type.is_cfunction and function.is_name:
             if function.name == 'isinstance' and len(node.args) == 2:
                 type_arg = node.args[1]
@@ -4947,6 +4953,25 @@ class FinalOptimizePhase(Visitor.EnvTransform, Visitor.NodeRefCleanupMixin):
                         node, function=function, arg_tuple=node.arg_tuple, type=node.type))
         return node
 
+    def _borrow_memoryview_slice_args(self, node):
+        """
+        The caller keeps the sliced memoryview alive for the duration of the call
+        through the base slice, as long as that is a local variable that the callee
+        cannot rebind.  Since a C function acquires its memoryview arguments itself
+        when it stores or reassigns them, it is safe to pass a borrowed slice.
+        """
+        for arg in node.args:
+            if not isinstance(arg, ExprNodes.MemoryViewSliceNode):
+                continue
+            base = arg.base
+            if isinstance(base, ExprNodes.NoneCheckNode):
+                base = base.arg
+            if not base.is_name or base.entry is None:
+                continue
+            entry = base.entry
+            if (entry.is_local or entry.is_arg) and not (entry.in_closure or entry.from_closure):
+                arg.borrow_slice()
+
     def visit_NumPyMethodCallNode(self, node):
         # Exclude from replacement above.
         self.visitchildren(node)
@@ -4955,12 +4980,14 @@ class FinalOptimizePhase(Visitor.EnvTransform, Visitor.NodeRefCleanupMixin):
     def visit_PyTypeTestNode(self, node):
         """Remove tests for alternatively allowed None values from
         type tests when we know that the argument cannot be None
-        anyway.
+        anyway, and remove type tests that the argument passed before.
         """
         self.visitchildren(node)
         if not node.notnone:
             if not node.arg.may_be_none():
                 node.notnone = True
+        if node.passed_earlier_test():
+            node.arg_passed_test = True
         return node
 
     def visit_NoneCheckNode(self, node):
@@ -4983,6 +5010,7 @@ class FinalOptimizePhase(Visitor.EnvTransform, Visitor.NodeRefCleanupMixin):
 
     def visit_IfStatNode(self, node):
         """Assign 'unlikely' branch hints to if-clauses that only raise exceptions.
+        If profile data is available, use the measured branch frequencies instead.
         """
         self.visitchildren(node)
         last_non_unlikely_clause = None
@@ -4993,8 +5021,42 @@ class FinalOptimizePhase(Visitor.EnvTransform, Visitor.NodeRefCleanupMixin):
         if node.else_clause and last_non_unlikely_clause:
             # If the 'else' clause is 'unlikely', then set the preceding 'if' clause to 'likely' to reflect that.
             self._set_ifclause_branch_hint(last_non_unlikely_clause, node.else_clause, inverse=True)
+        line_counts = self.context.profile_line_counts(node.pos[0])
+        if line_counts:
+            for if_clause in node.if_clauses:
+                self._set_ifclause_profile_branch_hint(if_clause, line_counts)
         return node
 
+    # Minimum number of times that a condition must have been evaluated in the
+    # profiling run to derive a branch hint from it, and the fraction of runs
+    # in which a branch must (not) have been taken to be considered (un)likely.
+    profile_min_evaluations = 20
+    profile_likely_fraction = 0.9
+
+    def _set_ifclause_profile_branch_hint(self, clause, line_counts):
+        """Compare how often the condition of the if-clause was evaluated to how often
+        its first statement was executed, and replace the branch hint accordingly.
+        """
+        evaluated = line_counts.get(clause.pos[1], 0)
+        if evaluated < self.profile_min_evaluations:
+            return
+        first_stat = clause.body
+        while isinstance(first_stat, Nodes.StatListNode):
+            if not first_stat.stats:
+                return
+            first_stat = first_stat.stats[0]
+        if (isinstance(first_stat, Nodes.PassStatNode) or
+                first_stat.pos[0] is not clause.pos[0] or first_stat.pos[1] == clause.pos[1]):
+            # No separate line that we can count.
+            return
+        taken = min(line_counts.get(first_stat.pos[1], 0), evaluated) / float(evaluated)
+        if taken >= self.profile_likely_fraction:
+            clause.branch_hint = 'likely'
+        elif taken <= 1 - self.profile_likely_fraction:
+            clause.branch_hint = 'unlikely'
+        else:
+            clause.branch_hint = None
+
     def _set_ifclause_branch_hint(self, clause, statements_node, inverse=False):
         """Inject a branch hint if the if-clause unconditionally leads to a 'raise' statement.
         """
@@ -5057,3 +5119,634 @@ class ConsolidateOverflowCheck(Visitor.CythonTransform):
         else:
             self.visitchildren(node)
         return node
+
+
+class PassMemoryviewArgsByPointer(Visitor.CythonTransform):
+    """
+    Pass memoryview slice arguments of module internal cdef functions by
+    pointer instead of copying the complete slice struct into each call.
+
+    This is only safe for functions that are always called directly by
+    name, i.e. whose address is never taken and which cannot be cimported
+    from other modules, and for arguments that the function does not
+    reassign.
+    """
+    def visit_ModuleNode(self, node):
+        self.cfunc_nodes = []
+        self.referenced_entries = set()
+        self.visitchildren(node)
+        for func_node in self.cfunc_nodes:
+            if func_node.entry not in self.referenced_entries:
+                self._pass_args_by_pointer(func_node)
+        return node
+
+    def visit_CFuncDefNode(self, node):
+        entry = node.entry
+        if (node.body is not None and not node.overridable and not node.inline_in_pxd
+                and entry.visibility == 'private' and not entry.api and not entry.defined_in_pxd
+                and entry.scope.is_module_scope and not entry.is_fused_specialized
+                and not Options.cimport_from_pyx
+                # functions with an explicit cname may get called from C code
+                and entry.func_cname == entry.scope.mangle(Naming.func_prefix, entry.name)):
+            self.cfunc_nodes.append(node)
+        self.visitchildren(node)
+        return node
+
+    def visit_SimpleCallNode(self, node):
+        if node.function.is_name:
+            # Direct calls by name do not need the address of the function.
+            self.visitchildren(node, exclude=['function'])
+        else:
+            self.visitchildren(node)
+        return node
+
+    def visit_NameNode(self, node):
+        if node.entry is not None:
+            self.referenced_entries.add(node.entry)
+        return node
+
+    def _pass_args_by_pointer(self, func_node):
+        func_type = func_node.type
+        entry_type = func_node.entry.type
+        if not entry_type.is_cfunction or len(entry_type.args) != len(func_type.args):
+            return
+        for i, arg in enumerate(func_type.args[:len(func_type.args) - func_type.optional_arg_count]):
+            if not arg.type.is_memoryviewslice:
+                continue
+            arg_entry = func_node.local_scope.lookup_here(arg.name)
+            if arg_entry is None or arg_entry.cf_is_reassigned or arg_entry.in_closure:
+                continue
+            arg.pass_by_pointer = entry_type.args[i].pass_by_pointer = True
+            arg_entry.cname = "(*%s)" % arg.cname
+
+
+class _LoopBodyCollector(Visitor.TreeVisitor):
+    """
+    Collects what a loop body reads and what it may change: the memoryviews
+    that it indexes, the C attributes of 'self' that it reads, the names and
+    attributes that it assigns, and whether it calls functions or may run
+    Python code.
+    """
+    def __init__(self):
+        Visitor.TreeVisitor.__init__(self)
+        self.indexed_memviews = []  # [(key, base node)]
+        self.other_memview_uses = set()
+        self.attribute_reads = {}  # (self entry, attribute name) -> [AttributeNode]
+        self.attribute_keys = []
+        self.assigned_entries = set()
+        self.assigned_attributes = set()
+        self.pointer_writes = []  # types of the values written through pointers
+        self.has_loops = False
+        self.has_calls = False
+        self.may_run_python = False
+
+    def mark_assigned(self, target):
+        type = target.type
+        if type is not None and (type.is_pyobject or type.is_memoryviewslice):
+            # releasing the old value can run arbitrary code
+            self.may_run_python = True
+        if target.is_name:
+            self.assigned_entries.add(target.entry)
+        elif target.is_attribute:
+            self.assigned_attributes.add(target.attribute)
+            if target.obj.type.is_ptr:
+                self.pointer_writes.append(type)
+            elif not target.obj.type.is_pyobject:
+                # assigning a struct member changes the struct
+                self.mark_assigned(target.obj)
+        elif target.is_subscript:
+            if target.base.type.is_ptr:
+                self.pointer_writes.append(type)
+            elif target.base.type.is_array:
+                self.mark_assigned(target.base)
+        elif isinstance(target, ExprNodes.DereferenceNode):
+            self.pointer_writes.append(type)
+        elif target.is_sequence_constructor:
+            for arg in target.args:
+                self.mark_assigned(arg)
+        elif target.is_starred:
+            self.mark_assigned(target.target)
+
+    @staticmethod
+    def is_self(entry):
+        return (entry is not None and entry.is_self_arg
+                and not (entry.in_closure or entry.from_closure))
+
+    visit_Node = Visitor.TreeVisitor.visitchildren
+
+    def visit_ExprNode(self, node):
+        if node.type is not None:
+            if node.type.is_pyobject:
+                self.may_run_python = True
+            elif node.type.is_cpp_class:
+                # C++ operators are function calls
+                self.has_calls = True
+        self.visitchildren(node)
+
+    def visit_CallNode(self, node):
+        self.has_calls = True
+        self.visitchildren(node)
+
+    def visit_LoopNode(self, node):
+        self.has_loops = True
+        if getattr(node, 'target', None) is not None:
+            self.mark_assigned(node.target)
+        self.visitchildren(node)
+
+    visit_ParallelStatNode = visit_LoopNode
+
+    def visit_SingleAssignmentNode(self, node):
+        self.mark_assigned(node.lhs)
+        self.visitchildren(node)
+
+    visit_InPlaceAssignmentNode = visit_SingleAssignmentNode
+    visit_WithTargetAssignmentStatNode = visit_SingleAssignmentNode
+
+    def visit_CascadedAssignmentNode(self, node):
+        for lhs in node.lhs_list:
+            self.mark_assigned(lhs)
+        self.visitchildren(node)
+
+    def visit_ExceptClauseNode(self, node):
+        if node.target is not None:
+            self.mark_assigned(node.target)
+        self.visitchildren(node)
+
+    def visit_DelStatNode(self, node):
+        for arg in node.args:
+            self.mark_assigned(arg)
+        self.visitchildren(node)
+
+    def visit_GILStatNode(self, node):
+        # other threads can run while the GIL is released
+        self.may_run_python = True
+        self.visitchildren(node)
+
+    def visit_NameNode(self, node):
+        if node.entry is not None and node.entry.type.is_memoryviewslice:
+            self.other_memview_uses.add(node.entry)
+
+    def visit_AttributeNode(self, node):
+        obj = node.obj.arg if node.obj.is_nonecheck else node.obj
+        if obj.is_name and self.is_self(obj.entry):
+            if node.type.is_pyobject:
+                self.may_run_python = True
+            elif not node.is_py_attr and (node.type.is_numeric or node.type.is_enum or node.type.is_ptr):
+                key = (obj.entry, node.attribute)
+                if key not in self.attribute_reads:
+                    self.attribute_reads[key] = []
+                    self.attribute_keys.append(key)
+                self.attribute_reads[key].append(node)
+        elif obj.is_name and obj.type.is_memoryviewslice and node.attribute == 'shape':
+            # not a use of the data
+            pass
+        else:
+            self.visit_ExprNode(node)
+
+    def visit_MemoryViewIndexNode(self, node):
+        base = node.base.arg if node.base.is_nonecheck else node.base
+        key = None
+        if base.is_name and base.entry is not None:
+            key = base.entry
+        elif base.is_attribute and base.obj.is_name and self.is_self(base.obj.entry):
+            key = (base.obj.entry, base.attribute)
+        if key is None:
+            self.visitchildren(node)
+            return
+        if key not in [memview_key for memview_key, _ in self.indexed_memviews]:
+            self.indexed_memviews.append((key, base))
+        self.visitchildren(node, ['indices'])
+
+    def visit_MemoryViewSliceNode(self, node):
+        self.visitchildren(node)
+
+    # everything below these nodes is out of scope:
+
+    def visit_FuncDefNode(self, node):
+        pass
+
+
+def _may_alias(written_type, read_type):
+    """
+    Can writing a 'written_type' value through a pointer change a value
+    of 'read_type', following the aliasing rules of C?
+    """
+    if written_type is None or not (written_type.is_numeric or written_type.is_ptr):
+        return True
+    if written_type.is_int and getattr(written_type, 'rank', 0) <= 0:
+        # chars (and enums) may alias anything
+        return True
+    if read_type.is_memoryviewslice:
+        return not written_type.is_float
+    if written_type.is_int:
+        return read_type.is_int or read_type.is_enum
+    if written_type.is_ptr:
+        return read_type.is_ptr
+    if written_type.is_float:
+        return read_type.is_float and written_type.same_as(read_type)
+    return True
+
+
+class HoistLoopInvariants(Visitor.CythonTransform):
+    """
+    Move loads that do not change in for-loops out of the loop, so that the
+    C compiler does not have to reload them in each iteration.
+
+    - the data pointers and strides of the memoryviews that the loop body
+      indexes are loaded into local variables before the loop, unless the
+      loop assigns the memoryview
+    - the C attributes of 'self' that the loop body reads are loaded into
+      temps before the loop, unless the loop assigns them, calls functions,
+      may run Python code or writes through pointers that may alias them
+    - with the 'noalias' directive, the data pointers of the local memoryviews
+      that the loop body only indexes are declared 'restrict'
+    - with the 'simd' directive, innermost loops get a vectorisation hint
+    """
+    def visit_FuncDefNode(self, node):
+        if node.is_generator_body:
+            # Generators resume inside of their loops, after the hoisted loads.
+            return node
+        self.visitchildren(node)
+        return node
+
+    def visit_ForFromStatNode(self, node):
+        self.visitchildren(node)
+        directives = self.current_directives
+        collector = _LoopBodyCollector()
+        collector.mark_assigned(node.target)
+        # the loads are moved before the evaluation of the loop bounds
+        collector.visitchildren(node, ['bound1', 'bound2', 'step', 'body'])
+        may_change_attributes = collector.has_calls or collector.may_run_python
+
+        def is_invariant_attribute(entry, attribute, type):
+            return (entry not in collector.assigned_entries
+                    and attribute not in collector.assigned_attributes
+                    and not any(_may_alias(written_type, type) for written_type in collector.pointer_writes))
+
+        hoisted_memviews = []
+        for key, base in collector.indexed_memviews:
+            if base.is_name:
+                entry = key
+                if (not (entry.is_local or entry.is_arg) or entry.in_closure or entry.from_closure
+                        or entry in collector.assigned_entries):
+                    continue
+                if entry.cname.startswith('(*') and may_change_attributes:
+                    # argument that is passed by pointer and might point to a global
+                    continue
+                restrict = directives['noalias'] and entry not in collector.other_memview_uses
+            else:
+                if may_change_attributes or not is_invariant_attribute(key[0], key[1], base.type):
+                    continue
+                restrict = False
+            hoisted_memviews.append((base, restrict))
+        node.hoisted_memviews = hoisted_memviews
+        if directives['simd'] and not collector.has_loops:
+            node.vectorize = True
+
+        if may_change_attributes:
+            return node
+        result = node
+        for key in collector.attribute_keys:
+            reads = collector.attribute_reads[key]
+            if not is_invariant_attribute(key[0], key[1], reads[0].type):
+                continue
+            attribute_ref = UtilNodes.LetRefNode(reads[0])
+            for attribute_node in reads:
+                Visitor.recursively_replace_node(node.body, attribute_node, attribute_ref)
+            result = UtilNodes.LetNode(attribute_ref, result)
+        return result
+
+
+class _ValueRange(object):
+    """
+    What is known about the value of an integer expression: a lower bound
+    ('lower', or None if unknown) and upper bounds relative to the shapes of
+    memoryviews ('shape_bounds', mapping (entry, dim) to 'offset' for
+    value < shape[dim] + offset).
+    """
+    def __init__(self, lower=None, shape_bounds=None):
+        self.lower = lower
+        self.shape_bounds = shape_bounds or {}
+
+    def shifted(self, offset):
+        return _ValueRange(
+            None if self.lower is None else self.lower + offset,
+            dict((key, bound + offset) for key, bound in self.shape_bounds.items()))
+
+    def intersection(self, other):
+        lower = self.lower
+        if lower is None or other.lower is not None and other.lower > lower:
+            lower = other.lower
+        shape_bounds = dict(self.shape_bounds)
+        for key, bound in other.shape_bounds.items():
+            if key not in shape_bounds or bound < shape_bounds[key]:
+                shape_bounds[key] = bound
+        return _ValueRange(lower, shape_bounds)
+
+    def is_nonnegative(self):
+        return self.lower is not None and self.lower >= 0
+
+
+_unknown_range = _ValueRange()
+
+
+def _skip_coercions(node):
+    while isinstance(node, (ExprNodes.CoerceToTempNode, ExprNodes.CloneNode)):
+        node = node.arg
+    return node
+
+
+class ValueRangeAnalysis(Visitor.CythonTransform):
+    """
+    Finds the value ranges of C integer variables in the bodies of
+    for-loops over range() and of if-clauses that compare them, as long as
+    the body does not assign them.  Besides lower bounds, this knows upper
+    bounds relative to the shape of local memoryviews, as in
+    ``for i in range(view.shape[0])`` or ``if i < view.shape[0]``.
+
+    Memoryview indices that are known to be within the shape do not need
+    bounds checks, and non-negative indices need no wraparound handling.
+    Integer divisions and modulo operations of non-negative operands give
+    the same result in C as in Python and need no sign correction.
+    """
+    # the C functions that replace calls to len() in OptimizeBuiltinCalls
+    _len_functions = frozenset([
+        "__Pyx_ssize_strlen", "__Pyx_Py_UNICODE_ssize_strlen", "__Pyx_MemoryView_Len",
+        "__Pyx_PyUnicode_GET_LENGTH", "PyBytes_GET_SIZE", "PyByteArray_GET_SIZE",
+        "PyList_GET_SIZE", "PyTuple_GET_SIZE", "PySet_GET_SIZE", "PyDict_Size", "Py_SIZE",
+    ])
+
+    def __init__(self, context):
+        super(ValueRangeAnalysis, self).__init__(context)
+        self.ranges = {}
+
+    def visit_FuncDefNode(self, node):
+        outer_ranges = self.ranges
+        self.ranges = {}
+        self.visitchildren(node)
+        self.ranges = outer_ranges
+        return node
+
+    @staticmethod
+    def _is_local(entry):
+        return (entry is not None and (entry.is_local or entry.is_arg)
+                and not (entry.in_closure or entry.from_closure))
+
+    @staticmethod
+    def _is_builtin(entry):
+        return entry is not None and (
+            entry.is_builtin or entry.scope is not None and entry.scope.is_builtin_scope)
+
+    def _is_range_variable(self, node):
+        return (node.is_name and node.type.is_int and node.type.signed
+                and self._is_local(node.entry))
+
+    def _is_len_call(self, node):
+        if not isinstance(node, ExprNodes.SimpleCallNode):
+            return False
+        function = node.function
+        if isinstance(function, ExprNodes.PythonCapiFunctionNode):
+            return function.cname in self._len_functions
+        return function.is_name and function.name == 'len' and self._is_builtin(function.entry)
+
+    def _shape_key(self, node):
+        """
+        Returns (entry, dim) if 'node' is the shape of a local memoryview
+        in that dimension, i.e. ``view.shape[dim]`` or ``len(view)``.
+        """
+        node = _skip_coercions(node)
+        if node.is_subscript and node.base.is_attribute and node.base.attribute == 'shape':
+            view, index = node.base.obj, node.index
+            if not index.has_constant_result():
+                return None
+            dim = index.constant_result
+        elif (isinstance(node, ExprNodes.SimpleCallNode) and node.function.is_name
+                and node.function.name == 'len' and len(node.args) == 1
+                and self._is_builtin(node.function.entry)):
+            view, dim = node.args[0], 0
+            if isinstance(view, ExprNodes.CoerceToPyTypeNode):
+                view = view.arg
+        else:
+            return None
+        if view.is_name and view.type.is_memoryviewslice and self._is_local(view.entry):
+            if isinstance(dim, _py_int_types) and 0 <= dim < view.type.ndim:
+                return view.entry, dim
+        return None
+
+    def value_range(self, node):
+        node = _skip_coercions(node)
+        type = node.type
+        if type is None or not type.is_int:
+            return _unknown_range
+        if node.has_constant_result():
+            if isinstance(node.constant_result, _py_int_types):
+                return _ValueRange(node.constant_result)
+            return _unknown_range
+        if not type.signed:
+            value_range = _ValueRange(0)
+        else:
+            value_range = _unknown_range
+        if node.is_name:
+            if node.entry in self.ranges:
+                value_range = value_range.intersection(self.ranges[node.entry])
+            return value_range
+        shape_key = self._shape_key(node)
+        if shape_key is not None:
+            return _ValueRange(0, {shape_key: 1})
+        if self._is_len_call(node):
+            return value_range.intersection(_ValueRange(0))
+        if isinstance(node, ExprNodes.DivNode) and not node.is_cpp_operation():
+            return value_range.intersection(self._division_range(node))
+        if isinstance(node, (ExprNodes.AddNode, ExprNodes.SubNode)):
+            operand1, operand2 = node.operand1, node.operand2
+            if operand2.has_constant_result() and isinstance(operand2.constant_result, _py_int_types):
+                offset = operand2.constant_result
+                if node.operator == '-':
+                    offset = -offset
+                return value_range.intersection(self.value_range(operand1).shifted(offset))
+            if (node.operator == '+' and operand1.has_constant_result()
+                    and isinstance(operand1.constant_result, _py_int_types)):
+                return value_range.intersection(self.value_range(operand2).shifted(operand1.constant_result))
+        return value_range
+
+    def _division_range(self, node):
+        dividend_range = self.value_range(node.operand1)
+        divisor_range = self.value_range(node.operand2)
+        if not divisor_range.is_nonnegative():
+            return _unknown_range
+        if node.operator == '%':
+            # a zero divisor fails, so the result is smaller than the divisor
+            remainder_range = _ValueRange(0, divisor_range.shifted(-1).shape_bounds)
+            if dividend_range.is_nonnegative():
+                # ... and not larger than the dividend
+                return remainder_range.intersection(_ValueRange(0, dividend_range.shape_bounds))
+            if node.cdivision or self.current_directives['cdivision']:
+                return _unknown_range
+            # Python's modulo takes the sign of the divisor
+            return remainder_range
+        if not dividend_range.is_nonnegative():
+            return _unknown_range
+        if divisor_range.lower < 1:
+            return _ValueRange(0)
+        return _ValueRange(0, dividend_range.shape_bounds)
+
+    def _add_bound(self, ranges, node, operator, bound):
+        """
+        Records in 'ranges' what 'node <operator> bound' tells about the
+        variable 'node', where 'bound' is a _ValueRange.
+        """
+        if operator == '<':
+            new_range = _ValueRange(None, bound.shifted(-1).shape_bounds)
+        elif operator == '<=':
+            new_range = _ValueRange(None, bound.shape_bounds)
+        elif operator == '>':
+            new_range = _ValueRange(None if bound.lower is None else bound.lower + 1)
+        elif operator == '>=':
+            new_range = _ValueRange(bound.lower)
+        else:
+            return
+        entry = node.entry
+        if entry in ranges:
+            new_range = ranges[entry].intersection(new_range)
+        ranges[entry] = new_range
+
+    _swapped_operators = {'<': '>', '<=': '>=', '>': '<', '>=': '<='}
+
+    def _comparison_ranges(self, condition, ranges):
+        """
+        Records in 'ranges' what a true 'condition' tells about the
+        values of variables.
+        """
+        while isinstance(condition, (ExprNodes.CoercionNode, ExprNodes.BoolBinopResultNode)):
+            condition = condition.arg
+        if isinstance(condition, ExprNodes.BoolBinopNode):
+            if condition.operator == 'and':
+                self._comparison_ranges(condition.operand1, ranges)
+                self._comparison_ranges(condition.operand2, ranges)
+            return
+        if not isinstance(condition, ExprNodes.PrimaryCmpNode):
+            return
+        operand1 = _skip_coercions(condition.operand1)
+        comparison = condition
+        while comparison is not None:
+            operator = comparison.operator
+            operand2 = _skip_coercions(comparison.operand2)
+            if (operator in self._swapped_operators
+                    and operand1.type.is_int and operand1.type.signed
+                    and operand2.type.is_int and operand2.type.signed):
+                if self._is_range_variable(operand1):
+                    self._add_bound(ranges, operand1, operator, self.value_range(operand2))
+                if self._is_range_variable(operand2):
+                    self._add_bound(ranges, operand2, self._swapped_operators[operator],
+                                    self.value_range(operand1))
+            operand1 = operand2
+            comparison = comparison.cascade
+
+    def _visit_with_ranges(self, node, attrs, new_ranges):
+        """
+        Visits the 'attrs' of 'node' with the known value ranges of the
+        current scope and 'new_ranges', without those of the variables and
+        memoryviews that the visited code may change.
+        """
+        collector = _LoopBodyCollector()
+        collector.visitchildren(node, attrs)
+        assigned = collector.assigned_entries
+        may_change_globals = collector.has_calls or collector.may_run_python
+
+        def is_unchanged(view_entry, dim):
+            if view_entry in assigned:
+                return False
+            # a memoryview argument that is passed by pointer might point to a global
+            return not (may_change_globals and view_entry.cname.startswith('(*'))
+
+        ranges = {}
+        for entry, value_range in itertools.chain(self.ranges.items(), new_ranges.items()):
+            if entry in assigned:
+                continue
+            value_range = _ValueRange(value_range.lower, dict(
+                (key, bound) for key, bound in value_range.shape_bounds.items() if is_unchanged(*key)))
+            if entry in ranges:
+                value_range = ranges[entry].intersection(value_range)
+            ranges[entry] = value_range
+
+        outer_ranges = self.ranges
+        self.ranges = ranges
+        self.visitchildren(node, attrs)
+        self.ranges = outer_ranges
+
+    def visit_ForFromStatNode(self, node):
+        self.visitchildren(node, ['target', 'bound1', 'bound2', 'step'])
+        new_ranges = {}
+        target = node.target
+        if self._is_range_variable(target):
+            for bound, operator in [(node.bound1, self._swapped_operators[node.relation1]),
+                                    (node.bound2, node.relation2)]:
+                bound = _skip_coercions(bound)
+                if isinstance(bound, UtilNodes.ResultRefNode) and bound.expression is not None:
+                    # evaluated right before the loop
+                    bound = bound.expression
+                bound_range = self.value_range(bound)
+                if (bound_range.lower is not None and not bound.has_constant_result()
+                        and not PyrexTypes.widest_numeric_type(target.type, bound.type).same_as(target.type)):
+                    # The bound is truncated to the type of the target, which keeps
+                    # its upper bounds but might change its sign.
+                    bound_range = _ValueRange(None, bound_range.shape_bounds)
+                self._add_bound(new_ranges, target, operator, bound_range)
+        self._visit_with_ranges(node, ['body'], new_ranges)
+        self.visitchildren(node, ['else_clause'])
+        return node
+
+    def visit_ParallelRangeNode(self, node):
+        self.visitchildren(node, ['target', 'args', 'num_threads', 'chunksize'])
+        new_ranges = {}
+        target = node.target
+        if (target is not None and self._is_range_variable(target)
+                and node.index_type.same_as(target.type)
+                and (node.step is None or node.step.has_constant_result()
+                     and isinstance(node.step.constant_result, _py_int_types)
+                     and node.step.constant_result > 0)):
+            start_range = _ValueRange(0) if node.start is None else self.value_range(node.start)
+            self._add_bound(new_ranges, target, '>=', start_range)
+            self._add_bound(new_ranges, target, '<', self.value_range(node.stop))
+        self._visit_with_ranges(node, ['body'], new_ranges)
+        self.visitchildren(node, ['else_clause'])
+        return node
+
+    def visit_IfClauseNode(self, node):
+        self.visitchildren(node, ['condition'])
+        new_ranges = {}
+        self._comparison_ranges(node.condition, new_ranges)
+        self._visit_with_ranges(node, ['body'], new_ranges)
+        return node
+
+    def visit_DivNode(self, node):
+        self.visitchildren(node)
+        if (not node.type.is_int or node.cdivision or node.is_cpp_operation()
+                or self.current_directives['cdivision']):
+            return node
+        divisor_range = self.value_range(node.operand2)
+        if divisor_range.is_nonnegative() and self.value_range(node.operand1).is_nonnegative():
+            # C and Python division agree for non-negative operands
+            node.cdivision = True
+            if divisor_range.lower > 0:
+                node.zerodivision_check = False
+        return node
+
+    def visit_MemoryViewIndexNode(self, node):
+        self.visitchildren(node)
+        if not node.is_memview_index or node.is_memview_slice:
+            return node
+        base = node.base.arg if node.base.is_nonecheck else node.base
+        view_entry = base.entry if base.is_name else None
+        nonnegative_indices = []
+        in_bounds_indices = []
+        for dim, index in enumerate(node.indices):
+            index_range = self.value_range(index)
+            if not index_range.is_nonnegative():
+                continue
+            nonnegative_indices.append(dim)
+            if index_range.shape_bounds.get((view_entry, dim), 1) <= 0:
+                in_bounds_indices.append(dim)
+        node.nonnegative_indices = tuple(nonnegative_indices)
+        node.in_bounds_indices = tuple(in_bounds_indices)
+        return node
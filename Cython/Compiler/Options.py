@@ -198,6 +198,7 @@ _directive_defaults = {
     'nogil' : False,
     'profile': False,
     'linetrace': False,
+    'profile_counters': False,  # count the calls and run time of each function
     'emit_code_comments': True,  # copy original source code into C code comments
     'annotation_typing': True,  # read type declarations from Python function annotations
     'infer_types': None,
@@ -217,6 +218,10 @@ _directive_defaults = {
     'old_style_globals': False,
     'np_pythran': False,
     'fast_gil': False,
+    'fused_signatures': [],  # only generate these specializations of a fused function
+    'fused_on_demand': False,  # only analyse cdef fused specializations that are used
+    'noalias': False,  # memoryviews that are indexed in a loop do not overlap in memory
+    'simd': False,  # ask the C compiler to vectorise innermost loops
 
     # set __file__ and/or __path__ to known source/target path at import time (instead of not having them available)
     'set_initial_path' : None,  # SOURCEFILE or "/full/path/to/module"
@@ -369,6 +374,7 @@ directive_scopes = {  # defaults to available everywhere
     'fast_gil': ('module',),
     'iterable_coroutine': ('module', 'function'),
     'trashcan' : ('cclass',),
+    'fused_signatures' : ('function',),
 }
 
 
@@ -674,6 +680,12 @@ class CompilationOptions(object):
                          'relative_path_in_code_position_comments']:
                 # the generated code contains additional bits when these are set
                 data[key] = value
+            elif key == 'profile_data':
+                # the branch hints depend on the content of the profile data file
+                if value:
+                    import hashlib
+                    with open(value, 'rb') as f:
+                        data[key] = hashlib.sha1(f.read()).hexdigest()
             elif key in ['cplus', 'language_level', 'compile_time_env', 'np_pythran']:
                 # assorted bits that, e.g., influence the parser
                 data[key] = value
@@ -736,5 +748,6 @@ default_options = dict(
     build_dir=None,
     cache=None,
     create_extension=None,
-    np_pythran=False
+    np_pythran=False,
+    profile_data=None,
 )
@@ -35,7 +35,7 @@ cdef map_starred_assignment(list lhs_targets, list starred_assignments, list lhs
 #class AnalyseDeclarationsTransform(EnvTransform):
 
 cdef class AnalyseExpressionsTransform(CythonTransform):
-    pass
+    cdef list deferred_fused_specializations
 
 cdef class ExpandInplaceOperators(EnvTransform):
     pass
@@ -2286,11 +2286,47 @@ class CalculateQualifiedNamesTransform(EnvTransform):
 class AnalyseExpressionsTransform(CythonTransform):
 
     def visit_ModuleNode(self, node):
+        self.deferred_fused_specializations = []
         node.scope.infer_types()
         node.body = node.body.analyse_expressions(node.scope)
         self.visitchildren(node)
+        self.analyse_deferred_fused_specializations()
         return node
 
+    def visit_FusedCFuncDefNode(self, node):
+        """
+        With the 'fused_on_demand' directive, the specializations of private
+        cdef functions that are not referenced (yet) are only analysed once
+        a reference to them was found, and dropped if there is none.
+        """
+        if node.py_func:
+            # All specializations are reachable from Python.
+            self.visitchildren(node)
+            return node
+        for i, stat in enumerate(node.stats):
+            entry = getattr(stat, 'entry', None)
+            if (isinstance(stat, Nodes.CFuncDefNode) and not entry.used and
+                    entry.visibility == 'private' and not entry.api and
+                    stat.local_scope.directives['fused_on_demand']):
+                self.deferred_fused_specializations.append((node, stat))
+            else:
+                node.stats[i] = self.visit(stat)
+        return node
+
+    def analyse_deferred_fused_specializations(self):
+        deferred = self.deferred_fused_specializations
+        while deferred:
+            # Analysing a specialization can make further ones used.
+            used = [(node, stat) for node, stat in deferred if stat.entry.used]
+            if not used:
+                break
+            deferred = [(node, stat) for node, stat in deferred if not stat.entry.used]
+            for node, stat in used:
+                self.visit(stat)
+        for node, stat in deferred:
+            node.stats.remove(stat)
+        self.deferred_fused_specializations = []
+
     def visit_FuncDefNode(self, node):
         node.local_scope.infer_types()
         node.body = node.body.analyse_expressions(node.local_scope)
@@ -160,6 +160,7 @@ def create_pipeline(context, mode, exclude_classes=()):
     from .Optimize import ConstantFolding, FinalOptimizePhase
     from .Optimize import DropRefcountingTransform
     from .Optimize import ConsolidateOverflowCheck
+    from .Optimize import PassMemoryviewArgsByPointer, ValueRangeAnalysis, HoistLoopInvariants
     from .Buffer import IntroduceBufferAuxiliaryVars
     from .ModuleNode import check_c_declarations, check_c_declarations_pxd
 
@@ -220,6 +221,9 @@ def create_pipeline(context, mode, exclude_classes=()):
         ConsolidateOverflowCheck(context),
         DropRefcountingTransform(),
         FinalOptimizePhase(context),
+        PassMemoryviewArgsByPointer(context),
+        ValueRangeAnalysis(context),
+        HoistLoopInvariants(context),
         GilCheck(),
         ]
     filtered_stages = []
@@ -327,6 +331,11 @@ def insert_into_pipeline(pipeline, transform, before=None, after=None):
 
 _pipeline_entry_points = {}
 
+# When set to a dict, run_pipeline() adds up the run time of each phase
+# under its name (including the time spent in nested pipelines, e.g. for
+# cimported .pxd files).  Used by Tools/compiler_benchmark.py.
+phase_timings = None
+
 
 def run_pipeline(pipeline, source, printtree=True):
     from .Visitor import PrintTree
@@ -343,8 +352,9 @@ def run_pipeline(pipeline, source, printtree=True):
                 if phase is not None:
                     if not printtree and isinstance(phase, PrintTree):
                         continue
-                    if DebugFlags.debug_verbose_pipeline:
+                    if DebugFlags.debug_verbose_pipeline or phase_timings is not None:
                         t = time()
+                    if DebugFlags.debug_verbose_pipeline:
                         print("Entering pipeline phase %r" % phase)
                         # create a new wrapper for each step to show the name in profiles
                         phase_name = getattr(phase, '__name__', type(phase).__name__)
@@ -354,6 +364,9 @@ def run_pipeline(pipeline, source, printtree=True):
                             exec("def %s(phase, data): return phase(data)" % phase_name, exec_ns)
                             run = _pipeline_entry_points[phase_name] = exec_ns[phase_name]
                     data = run(phase, data)
+                    if phase_timings is not None:
+                        phase_name = getattr(phase, '__name__', type(phase).__name__)
+                        phase_timings[phase_name] = phase_timings.get(phase_name, 0) + (time() - t)
                     if DebugFlags.debug_verbose_pipeline:
                         print("    %.3f seconds" % (time() - t))
         except CompileError as err:
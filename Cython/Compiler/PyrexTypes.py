@@ -3086,8 +3086,9 @@ class CFuncType(CType):
                          with_calling_convention = 1):
         arg_decl_list = []
         for arg in self.args[:len(self.args)-self.optional_arg_count]:
+            arg_entity_code = "*" if arg.pass_by_pointer and not (for_display or pyrex) else ""
             arg_decl_list.append(
-                arg.type.declaration_code("", for_display, pyrex = pyrex))
+                arg.type.declaration_code(arg_entity_code, for_display, pyrex = pyrex))
         if self.is_overridable:
             arg_decl_list.append("int %s" % Naming.skip_dispatch_cname)
         if self.optional_arg_count:
@@ -3424,6 +3425,7 @@ class CFuncTypeArg(BaseType):
     #  cname      string
     #  type       PyrexType
     #  pos        source file position
+    #  pass_by_pointer  boolean   The C function receives a pointer to the (memoryview slice) value
 
     # FIXME: is this the right setup? should None be allowed here?
     not_none = False
@@ -3431,6 +3433,7 @@ class CFuncTypeArg(BaseType):
     accept_none = True
     accept_builtin_subtypes = False
     annotation = None
+    pass_by_pointer = False
 
     subtypes = ['type']
 
@@ -3450,6 +3453,8 @@ class CFuncTypeArg(BaseType):
         return "%s:%s" % (self.name, repr(self.type))
 
     def declaration_code(self, for_display = 0):
+        if self.pass_by_pointer and not for_display:
+            return self.type.declaration_code("*%s" % self.cname)
         return self.type.declaration_code(self.cname, for_display)
 
     def specialize(self, values):
@@ -148,6 +148,9 @@ class SourceDescriptor(object):
     def is_python_file(self):
         return self._file_type == 'py'
 
+    def is_pxd_file(self):
+        return self._file_type == 'pxd'
+
     def get_escaped_description(self):
         if self._escaped_description is None:
             esc_desc = \
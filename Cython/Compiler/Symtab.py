@@ -117,6 +117,8 @@ class Entry(object):
     # in_subscope      boolean    Belongs to a generator expression scope
     # is_readonly      boolean    Can't be assigned to
     # func_cname       string     C func implementing Python func
+    # vectorcall_cname string     METH_FASTCALL variant of the wrapper of
+    #                               __init__/__call__ in an extension type
     # func_modifiers   [string]   C function modifiers ('inline')
     # pos              position   Source position where declared
     # namespace_cname  string     If is_pyglobal, the C variable
@@ -198,6 +200,7 @@ class Entry(object):
     is_readonly = 0
     pyfunc_cname = None
     func_cname = None
+    vectorcall_cname = None
     func_modifiers = []
     final_func_cname = None
     doc = None
@@ -2196,6 +2199,55 @@ class CClassScope(ClassScope):
         """
         return self.needs_gc() and not self.directives.get('no_gc_clear', False)
 
+    def vectorcall_init_entry(self):
+        """
+        Return the entry of the __init__ method that the tp_vectorcall function
+        calls after creating the object, or None if the type cannot be
+        instantiated through vectorcall.  That requires that all base types
+        are defined in this module and that no __cinit__ method takes the
+        call arguments.
+        """
+        init_entry = None
+        type = self.parent_type
+        while type:
+            scope = type.scope
+            if (not type.is_extension_type or type.is_external or scope is None or
+                    scope.parent_scope is not self.parent_scope):
+                return None
+            cinit_entry = scope.lookup_here("__cinit__")
+            if cinit_entry and cinit_entry.is_special and not cinit_entry.trivial_signature:
+                return None
+            if init_entry is None:
+                init_entry = scope.lookup_here("__init__")
+                if init_entry is not None and not init_entry.vectorcall_cname:
+                    return None
+            type = type.base_type
+        return init_entry
+
+    def vectorcall_slot_cname(self):
+        """
+        Return the (possibly nested) name of the struct member that holds the
+        vectorcall function of the instances, or None if they do not have one.
+        Only types whose object struct is private to the module get one.
+        """
+        base_type = self.parent_type.base_type
+        if base_type and base_type.is_extension_type and base_type.scope:
+            base_slot_cname = base_type.scope.vectorcall_slot_cname()
+            if base_slot_cname:
+                return "%s.%s" % (Naming.obj_base_cname, base_slot_cname)
+        call_entry = self.lookup_here("__call__")
+        type_entry = self.parent_type.entry
+        if (call_entry and call_entry.vectorcall_cname and not self.defined and
+                type_entry.visibility == 'private' and not type_entry.api):
+            return Naming.vectorcallslot_cname
+        return None
+
+    def sets_vectorcall_slot(self):
+        # The tp_new function stores the vectorcall function of the __call__
+        # method in the instances of all types that (re)define it.
+        call_entry = self.lookup_here("__call__")
+        return bool(call_entry and call_entry.is_special and self.vectorcall_slot_cname())
+
     def get_refcounted_entries(self, include_weakref=False,
                                include_gc_simple=True):
         py_attrs = []
@@ -2492,13 +2544,43 @@ class CClassScope(ClassScope):
                 entry.utility_code = base_entry.utility_code
 
 
+class _SpecializedMembers(object):
+    # Scope attribute that declares the members of a specialized C++ class
+    # scope on first access.
+
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, scope, scope_class):
+        if scope is None:
+            return self
+        if scope.specialized_from is not None:
+            scope.declare_specialized_members()
+        return scope.__dict__[self.name]
+
+    def __set__(self, scope, value):
+        scope.__dict__[self.name] = value
+
+
 class CppClassScope(Scope):
     #  Namespace of a C++ class.
+    #
+    #  specialized_from   (CppClassScope, dict) or None
+    #                       The template scope and the template values of a
+    #                       specialization whose members are not declared yet.
 
     is_cpp_class_scope = 1
 
     default_constructor = None
     type = None
+    specialized_from = None
+
+    # Most specializations (e.g. of the iterator types in the method signatures
+    # of other specializations) are never looked into, so their members are
+    # only declared when needed.
+    entries = _SpecializedMembers('entries')
+    var_entries = _SpecializedMembers('var_entries')
+    type_entries = _SpecializedMembers('type_entries')
 
     def __init__(self, name, outer_scope, templates=None):
         Scope.__init__(self, name, outer_scope, None)
@@ -2614,28 +2696,32 @@ class CppClassScope(Scope):
     def specialize(self, values, type_entry):
         scope = CppClassScope(self.name, self.outer_scope)
         scope.type = type_entry
-        for entry in self.entries.values():
+        scope.specialized_from = (self, values)
+        return scope
+
+    def declare_specialized_members(self):
+        template_scope, values = self.specialized_from
+        self.specialized_from = None
+        for entry in template_scope.entries.values():
             if entry.is_type:
-                scope.declare_type(entry.name,
-                                   entry.type.specialize(values),
-                                   entry.pos,
-                                   entry.cname,
-                                   template=1)
-            elif entry.type.is_cfunction:
-                for e in entry.all_alternatives():
-                    scope.declare_cfunction(e.name,
-                                            e.type.specialize(values),
-                                            e.pos,
-                                            e.cname,
-                                            utility_code=e.utility_code)
-            else:
-                scope.declare_var(entry.name,
+                self.declare_type(entry.name,
                                   entry.type.specialize(values),
                                   entry.pos,
                                   entry.cname,
-                                  entry.visibility)
-
-        return scope
+                                  template=1)
+            elif entry.type.is_cfunction:
+                for e in entry.all_alternatives():
+                    self.declare_cfunction(e.name,
+                                           e.type.specialize(values),
+                                           e.pos,
+                                           e.cname,
+                                           utility_code=e.utility_code)
+            else:
+                self.declare_var(entry.name,
+                                 entry.type.specialize(values),
+                                 entry.pos,
+                                 entry.cname,
+                                 entry.visibility)
 
 
 class CppScopedEnumScope(Scope):
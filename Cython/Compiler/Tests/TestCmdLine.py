@@ -514,3 +514,24 @@ class CmdLineParserTest(TestCase):
         error('--verbose=1')
         error('--cleanup')
         error('--debug-disposal-code-wrong-name', 'file3.pyx')
+
+
+class StartupImportTest(TestCase):
+    # Importing the compiler entry points and creating a Context for
+    # dependency lookups must not load the bulk of the compiler.
+
+    def test_lazy_compiler_imports(self):
+        import subprocess
+        cython_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(
+            os.path.abspath(__file__)))))
+        code = (
+            "import sys; sys.path.insert(0, %r)\n"
+            "from Cython.Compiler.Main import Context, main\n"
+            "context = Context(['.'], {}, language_level=3)\n"
+            "context.find_pxd_file('missing_module', None)\n"
+            "print(' '.join(sorted(sys.modules)))\n" % cython_root)
+        output = subprocess.check_output([sys.executable, '-c', code])
+        modules = set(output.decode('ascii').split())
+        self.assertIn('Cython.Compiler.Main', modules)
+        for name in ('Symtab', 'PyrexTypes', 'Code', 'Builtin', 'Nodes', 'Scanning'):
+            self.assertNotIn('Cython.Compiler.' + name, modules)
@@ -58,6 +58,16 @@ class TestTreeFragments(CythonTest):
         self.assertTrue(isinstance(s[0].expr, TempRefNode))
         self.assertTrue(isinstance(s[1].rhs, TempRefNode))
         self.assertTrue(s[0].expr.handle is s[1].rhs.handle)
+    def test_repeated_parse_is_copied(self):
+        code = u"x = [y for y in range(3)]"
+        trees = [parse_from_strings(u"repeated", code) for _ in range(3)]
+        comprehensions = [tree.body.rhs for tree in trees]
+        for tree in trees[1:]:
+            self.assertCode(code, tree.body)
+        self.assertTrue(comprehensions[1] is not comprehensions[2])
+        # nodes referenced outside of the child attributes are copied as well
+        self.assertTrue(comprehensions[1].append is not comprehensions[2].append)
+        self.assertTrue(comprehensions[2].append is comprehensions[2].loop.body)
 
 if __name__ == "__main__":
     import unittest
@@ -73,3 +73,22 @@ class TestTypeIdentifiers(unittest.TestCase):
             escaped_value = escape(declaration)
             self.assertEqual(escaped_value, expected, "%s('%s') == '%s' != '%s'" % (
                 func_name, declaration, escaped_value, expected))
+
+
+class TestCppClassSpecialization(unittest.TestCase):
+
+    def test_members_declared_on_first_use(self):
+        from Cython.Compiler.Symtab import CppClassScope, ModuleScope
+        module_scope = ModuleScope('test', None, None)
+        module_scope.directives = {}
+        T = PT.TemplatePlaceholderType('T')
+        scope = CppClassScope('box', module_scope, templates=['T'])
+        box = PT.CppClassType('box', scope, 'box', [], templates=[T])
+        scope.type = box
+        scope.declare_var('value', T, None)
+
+        box_int = box.specialize({T: PT.c_int_type})
+        self.assertIs(box_int, box.specialize({T: PT.c_int_type}))
+        self.assertIsNotNone(box_int.scope.specialized_from)
+        self.assertIs(PT.c_int_type, box_int.scope.lookup_here('value').type)
+        self.assertIsNone(box_int.scope.specialized_from)
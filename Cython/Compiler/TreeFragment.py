@@ -21,6 +21,8 @@ from .StringEncoding import _unicode
 from . import Parsing
 from . import Main
 from . import UtilNodes
+from . import Errors
+from .. import Utils
 
 
 class StringParseContext(Main.Context):
@@ -38,6 +40,15 @@ class StringParseContext(Main.Context):
         return ModuleScope(module_name, parent_module=None, context=self)
 
 
+# Code snippets that are parsed repeatedly (e.g. utility code for each module
+# of a build) are parsed only once.  The cache maps the parser inputs to the
+# pristine tree and the resulting language level and future directives.
+# Trees are only stored on their second use, since storing requires a copy.
+_parsed_trees = {}
+_seen_code = set()
+Utils._function_caches.extend([_parsed_trees, _seen_code])
+
+
 def parse_from_strings(name, code, pxds=None, level=None, initial_pos=None,
                        context=None, allow_struct_enum_decorator=False):
     """
@@ -69,6 +80,21 @@ def parse_from_strings(name, code, pxds=None, level=None, initial_pos=None,
 
     scope = context.find_module(module_name, pos=initial_pos, need_pxd=False)
 
+    cache_key = None
+    if not getattr(context.options, 'compile_time_env', None):
+        cache_key = (name, code, level, initial_pos, allow_struct_enum_decorator, type(context),
+                     context.language_level, frozenset(context.future_directives), context.cpp)
+        cached = _parsed_trees.get(cache_key)
+        if cached is not None:
+            tree, language_level, future_directives = cached
+            context.language_level = language_level
+            context.future_directives.update(future_directives)
+            tree = _copy_parse_tree(tree)
+            tree.scope = scope
+            return tree
+    num_errors = Errors.num_errors
+    num_included_files = len(scope.included_files)
+
     buf = StringIO(code)
 
     scanner = PyrexScanner(buf, code_source, source_encoding = encoding,
@@ -82,6 +108,14 @@ def parse_from_strings(name, code, pxds=None, level=None, initial_pos=None,
     else:
         tree = Parsing.p_code(scanner, level=level, ctx=ctx)
 
+    if (cache_key is not None and Errors.num_errors == num_errors
+            and len(scope.included_files) == num_included_files):
+        if cache_key in _seen_code:
+            _parsed_trees[cache_key] = (
+                _copy_parse_tree(tree), context.language_level, frozenset(context.future_directives))
+        else:
+            _seen_code.add(cache_key)
+
     tree.scope = scope
     return tree
 
@@ -201,6 +235,38 @@ def copy_code_tree(node):
     return TreeCopier()(node)
 
 
+def _copy_parse_tree(root):
+    """
+    Copy all nodes of a parse tree, including nodes that are only referenced
+    from non-child attributes (which copy_code_tree() shares), as well as the
+    lists, tuples and dicts that hold them.  Other values are shared.
+    """
+    memo = {}
+
+    def copy_value(value):
+        cls = value.__class__
+        if cls is list:
+            return [copy_value(item) for item in value]
+        elif cls is tuple:
+            copied = tuple([copy_value(item) for item in value])
+            for item, copied_item in zip(value, copied):
+                if item is not copied_item:
+                    return copied
+            return value
+        elif cls is dict:
+            return dict([(key, copy_value(item)) for key, item in value.items()])
+        elif isinstance(value, Node):
+            result = memo.get(id(value))
+            if result is None:
+                result = memo[id(value)] = cls.__new__(cls)
+                result.__dict__.update([
+                    (name, copy_value(item)) for name, item in value.__dict__.items()])
+            return result
+        return value
+
+    return copy_value(root)
+
+
 _match_indent = re.compile(u"^ *").match
 
 
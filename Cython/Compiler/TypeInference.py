@@ -1,5 +1,7 @@
 from __future__ import absolute_import
 
+from collections import deque
+
 from .Errors import error, message
 from . import ExprNodes
 from . import Nodes
@@ -398,6 +400,29 @@ class SimpleAssignmentTypeInferer(object):
             else:
                 assmts_resolved.update(entry.cf_assignments)
 
+        # Instead of rescanning all pending assignments, count their unresolved
+        # dependencies and queue them once the last one gets resolved.
+        dependents = {}
+        unresolved = {}
+        ready = []
+        for assmt in assignments:
+            deps = dependencies[assmt]
+            for dep in deps:
+                dependents.setdefault(dep, []).append(assmt)
+            count = len(deps) - len(deps & assmts_resolved)
+            unresolved[assmt] = count
+            if not count:
+                ready.append(assmt)
+
+        def mark_resolved(assmt):
+            if assmt in assmts_resolved:
+                return
+            assmts_resolved.add(assmt)
+            for dependent in dependents.get(assmt, ()):
+                unresolved[dependent] -= 1
+                if not unresolved[dependent]:
+                    ready.append(dependent)
+
         def infer_name_node_type(node):
             types = [assmt.inferred_type for assmt in node.cf_state]
             if not types:
@@ -435,18 +460,19 @@ class SimpleAssignmentTypeInferer(object):
             return types
 
         def resolve_assignments(assignments):
-            resolved = set()
-            for assmt in assignments:
-                deps = dependencies[assmt]
-                # All assignments are resolved
-                if assmts_resolved.issuperset(deps):
-                    for node in assmt_to_names[assmt]:
-                        infer_name_node_type(node)
-                    # Resolve assmt
-                    inferred_type = assmt.infer_type()
-                    assmts_resolved.add(assmt)
-                    resolved.add(assmt)
-            assignments.difference_update(resolved)
+            resolved = False
+            while ready:
+                # All dependencies are resolved
+                assmt = ready.pop()
+                if assmt not in assignments:
+                    continue
+                for node in assmt_to_names[assmt]:
+                    infer_name_node_type(node)
+                # Resolve assmt
+                assmt.infer_type()
+                assignments.remove(assmt)
+                mark_resolved(assmt)
+                resolved = True
             return resolved
 
         def partial_infer(assmt):
@@ -470,7 +496,7 @@ class SimpleAssignmentTypeInferer(object):
                     continue
                 if partial_infer(assmt):
                     partials.add(assmt)
-                    assmts_resolved.add(assmt)
+                    mark_resolved(assmt)
             partial_assmts.update(partials)
             return partials
 
@@ -493,21 +519,37 @@ class SimpleAssignmentTypeInferer(object):
                     inferred.add(entry)
             self.set_entry_type(entry, entry_type)
 
-        def reinfer():
-            dirty = False
-            for entry in inferred:
-                for assmt in entry.cf_assignments:
-                    assmt.infer_type()
-                types = inferred_types(entry)
-                new_type = spanning_type(types, entry.might_overflow, entry.pos, scope)
-                if new_type != entry.type:
-                    self.set_entry_type(entry, new_type)
-                    dirty = True
-            return dirty
-
-        # types propagation
-        while reinfer():
-            pass
+        # entry -> inferred entries with assignments that depend on its type
+        entry_dependents = {}
+        for entry in inferred:
+            for assmt in entry.cf_assignments:
+                for node in assmt_to_names[assmt]:
+                    users = entry_dependents.setdefault(node.entry, [])
+                    if entry not in users:
+                        users.append(entry)
+
+        def reinfer(entry):
+            for assmt in entry.cf_assignments:
+                assmt.infer_type()
+            types = inferred_types(entry)
+            new_type = spanning_type(types, entry.might_overflow, entry.pos, scope)
+            if new_type != entry.type:
+                self.set_entry_type(entry, new_type)
+                return True
+            return False
+
+        # types propagation, only revisit entries whose dependencies changed
+        worklist = deque(inferred)
+        queued = set(inferred)
+        while worklist:
+            entry = worklist.popleft()
+            queued.remove(entry)
+            if reinfer(entry):
+                for e in entry.all_entries():
+                    for dependent in entry_dependents.get(e, ()):
+                        if dependent not in queued:
+                            queued.add(dependent)
+                            worklist.append(dependent)
 
         if verbose:
             for entry in inferred:
@@ -433,7 +433,8 @@ class ConstructorSlot(InternalMethodSlot):
                 and not scope.has_pyobject_attrs
                 and not scope.has_memoryview_attrs
                 and not scope.has_cpp_constructable_attrs
-                and not (self.slot_name == 'tp_new' and scope.parent_type.vtabslot_cname)):
+                and not (self.slot_name == 'tp_new' and scope.parent_type.vtabslot_cname)
+                and not (self.slot_name == 'tp_new' and scope.sets_vectorcall_slot())):
             entry = scope.lookup_here(self.method) if self.method else None
             if not (entry and entry.is_special):
                 return False
@@ -1036,6 +1037,10 @@ MethodSlot(descrgetfunc, "", "__get__")
 MethodSlot(descrsetfunc, "", "__set__")
 MethodSlot(descrdelfunc, "", "__delete__")
 
+# Special methods that the vectorcall functions of an extension type
+# (instantiation and calling its instances) can call with METH_FASTCALL.
+vectorcall_special_methods = ("__init__", "__call__")
+
 
 # Method flags for python-exposed methods.
 
@@ -7,16 +7,25 @@ Classes for building NFAs and DFAs
 from __future__ import absolute_import
 
 import cython
+from bisect import bisect_right, insort
 from .Transitions import TransitionMap
 
 maxint = 2**31-1  # sentinel value
 
+# Characters below this code point get their own entry in the transition dict
+# of a FastMachine state.  Larger character ranges (e.g. the Unicode identifier
+# characters) are kept as a sorted list of (code0, code1, state) tuples under
+# the 'ranges' key instead, which would otherwise need millions of dict entries.
+DIRECT_TRANSITION_LIMIT = 0x100
+
 if not cython.compiled:
     try:
         unichr
     except NameError:
         unichr = chr
 
+FIRST_RANGE_CHAR = unichr(DIRECT_TRANSITION_LIMIT)
+
 LOWEST_PRIORITY = -maxint
 
 
@@ -125,6 +134,24 @@ class Node(object):
         return id(self) & maxint
 
 
+def lookup_char_range(state, char):
+    """
+    Find the transition for a single character of at least
+    DIRECT_TRANSITION_LIMIT in the range list of a FastMachine state.
+    Returns None if there is no matching range.
+    """
+    ranges = state.get('ranges')
+    if ranges is None:
+        return None
+    code = ord(char)
+    i = bisect_right(ranges, (code, maxint))
+    if i:
+        code0, code1, new_state = ranges[i - 1]
+        if code < code1:
+            return new_state
+    return None
+
+
 class FastMachine(object):
     """
     FastMachine is a deterministic machine represented in a way that
@@ -161,9 +188,14 @@ class FastMachine(object):
             if code0 == -maxint:
                 state['else'] = new_state
             elif code1 != maxint:
-                while code0 < code1:
+                while code0 < code1 and code0 < DIRECT_TRANSITION_LIMIT:
                     state[unichr(code0)] = new_state
                     code0 += 1
+                if code0 < code1:
+                    ranges = state.get('ranges')
+                    if ranges is None:
+                        ranges = state['ranges'] = []
+                    insort(ranges, (code0, code1, new_state))
         else:
             state[event] = new_state
 
@@ -191,6 +223,7 @@ class FastMachine(object):
     def dump_transitions(self, state, file):
         chars_leading_to_state = {}
         special_to_state = {}
+        char_ranges = state.get('ranges', ())
         for (c, s) in state.items():
             if len(c) == 1:
                 chars = chars_leading_to_state.get(id(s), None)
@@ -210,6 +243,9 @@ class FastMachine(object):
             key = self.ranges_to_string(ranges)
             state = ranges_to_state[ranges]
             file.write("      %s --> State %d\n" % (key, state['number']))
+        for code0, code1, new_state in char_ranges:
+            key = self.range_to_string((unichr(code0), unichr(code1 - 1)))
+            file.write("      %s --> State %d\n" % (key, new_state['number']))
         for key in ('bol', 'eol', 'eof', 'else'):
             state = special_to_state.get(key, None)
             if state:
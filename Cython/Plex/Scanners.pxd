@@ -25,6 +25,7 @@ cdef class Scanner:
     cdef public bint trace
     cdef public cur_char
     cdef public long input_state
+    cdef tuple last_token_position_tuple
 
     cdef public level
 
@@ -9,10 +9,12 @@ from __future__ import absolute_import
 
 import cython
 
-cython.declare(BOL=object, EOL=object, EOF=object, NOT_FOUND=object)  # noqa:E402
+cython.declare(BOL=object, EOL=object, EOF=object, NOT_FOUND=object,
+               lookup_char_range=object, FIRST_RANGE_CHAR=object)  # noqa:E402
 
 from . import Errors
 from .Regexps import BOL, EOL, EOF
+from .Machines import FIRST_RANGE_CHAR, lookup_char_range
 
 NOT_FOUND = object()
 
@@ -66,6 +68,7 @@ class Scanner(object):
     #  state_name = ''       # Name of initial state
     #  queue = None          # list of tokens to be returned
     #  trace = 0
+    #  last_token_position_tuple = None  # shared (name, line, col) tuple of the current token
 
     def __init__(self, lexicon, stream, name='', initial_pos=None):
         """
@@ -96,6 +99,7 @@ class Scanner(object):
         self.lexicon = lexicon
         self.stream = stream
         self.name = name
+        self.last_token_position_tuple = (name, -1, -1)
         self.queue = []
         self.initial_state = None
         self.begin('')
@@ -187,7 +191,11 @@ class Scanner(object):
             c = cur_char
             new_state = state.get(c, NOT_FOUND)
             if new_state is NOT_FOUND:
-                new_state = c and state.get('else')
+                new_state = None
+                if c >= FIRST_RANGE_CHAR and len(c) == 1:
+                    new_state = lookup_char_range(state, c)
+                if new_state is None:
+                    new_state = c and state.get('else')
 
             if new_state:
                 if trace:
@@ -302,8 +310,14 @@ class Scanner(object):
         is the line number in the stream (1-based); |col| is the
         position within the line of the first character of the token
         (0-based).
+
+        Repeated calls for the same token return the same tuple object,
+        so that all nodes created for a token share a single position.
         """
-        return (self.name, self.start_line, self.start_col)
+        pos = self.last_token_position_tuple
+        if pos[1] != self.start_line or pos[2] != self.start_col:
+            pos = self.last_token_position_tuple = (self.name, self.start_line, self.start_col)
+        return pos
 
     def get_position(self):
         """
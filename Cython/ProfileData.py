@@ -0,0 +1,137 @@
+"""
+Line execution counts for profile guided optimisation.
+
+A module that was compiled with the ``linetrace`` directive (and the C macro
+``CYTHON_TRACE=1``) reports each executed source line to Python's trace
+function.  The ``LineCounter`` below counts these events while a
+representative workload runs and saves them as a JSON file, which can then
+be passed back to the compiler as ``cythonize(..., profile_data=FILE)`` or
+``cython --profile-data FILE``.  The compiler uses the counts to decide which
+branches are likely or unlikely to be taken.
+
+Usage::
+
+    $ python -m Cython.ProfileData -o profile.json workload.py [args]
+
+or from Python code::
+
+    from Cython.ProfileData import LineCounter
+
+    with LineCounter() as counter:
+        run_workload()
+    counter.save('profile.json')
+"""
+
+from __future__ import absolute_import
+
+import os
+import sys
+import json
+import threading
+from collections import defaultdict
+
+PROFILE_DATA_VERSION = 1
+
+
+class LineCounter(object):
+    """
+    Count how often each source line was executed, using ``sys.settrace()``.
+
+    If given, 'file_filter' is called with the file name of each traced code
+    object and only the lines of files for which it returns true are counted.
+    """
+    def __init__(self, file_filter=None):
+        self.file_filter = file_filter
+        self.counts = defaultdict(lambda: defaultdict(int))
+
+    def _trace(self, frame, event, arg):
+        if event != 'call':
+            return None
+        filename = frame.f_code.co_filename
+        if self.file_filter is not None and not self.file_filter(filename):
+            return None
+        file_counts = self.counts[filename]
+
+        def trace_lines(frame, event, arg):
+            if event == 'line':
+                file_counts[frame.f_lineno] += 1
+            return trace_lines
+        return trace_lines
+
+    def start(self):
+        threading.settrace(self._trace)
+        sys.settrace(self._trace)
+
+    def stop(self):
+        sys.settrace(None)
+        threading.settrace(None)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def save(self, path, merge=True):
+        """
+        Write the line counts to a JSON file.  With 'merge', the counts are
+        added to those that the file already contains.
+        """
+        counts = load_profile_data(path) if merge and os.path.exists(path) else {}
+        for filename, file_counts in self.counts.items():
+            merged = counts.setdefault(filename, {})
+            for line, count in file_counts.items():
+                merged[line] = merged.get(line, 0) + count
+        data = {
+            'version': PROFILE_DATA_VERSION,
+            'files': dict(
+                (filename, dict((str(line), count) for line, count in file_counts.items()))
+                for filename, file_counts in counts.items() if file_counts),
+        }
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=1, sort_keys=True)
+
+
+def load_profile_data(path):
+    """
+    Read a profile data file and return a dict that maps file names to dicts
+    of line numbers and their execution counts.
+    """
+    with open(path) as f:
+        data = json.load(f)
+    if data.get('version') != PROFILE_DATA_VERSION:
+        raise ValueError("Unsupported profile data version in '%s': %r" % (path, data.get('version')))
+    return dict(
+        (filename, dict((int(line), count) for line, count in file_counts.items()))
+        for filename, file_counts in data['files'].items())
+
+
+def main(args=None):
+    import runpy
+    from argparse import ArgumentParser
+    parser = ArgumentParser(
+        description="Run a Python script and record the line execution counts of "
+                    "the Cython modules that it uses, which must be compiled "
+                    "with the 'linetrace' directive and CYTHON_TRACE=1.")
+    parser.add_argument('-o', '--output', dest='output_file', default='profile.json',
+                        help="profile data file to write (default: profile.json)")
+    parser.add_argument('--replace', dest='merge', action='store_false',
+                        help="replace the counts in an existing output file instead of adding to them")
+    parser.add_argument('script', help="the Python script to run")
+    parser.add_argument('script_args', nargs='...', help="arguments to pass to the script")
+    options = parser.parse_args(args)
+
+    sys.argv = [options.script] + options.script_args
+    sys.path.insert(0, os.path.dirname(os.path.abspath(options.script)))
+    counter = LineCounter(
+        file_filter=lambda filename: filename.endswith(('.pyx', '.pxd', '.pxi')))
+    try:
+        with counter:
+            runpy.run_path(options.script, run_name='__main__')
+    finally:
+        counter.save(options.output_file, merge=options.merge)
+
+
+if __name__ == '__main__':
+    main()
@@ -109,8 +109,8 @@ cclass = ccall = cfunc = _EmptyDecoratorAndManager()
 
 returns = wraparound = boundscheck = initializedcheck = nonecheck = \
     embedsignature = cdivision = cdivision_warnings = \
-    always_allows_keywords = profile = linetrace = infer_types = \
-    unraisable_tracebacks = freelist = \
+    always_allows_keywords = profile = linetrace = profile_counters = infer_types = \
+    unraisable_tracebacks = freelist = noalias = simd = \
         lambda _: _EmptyDecoratorAndManager()
 
 exceptval = lambda _=None, check=True: _EmptyDecoratorAndManager()
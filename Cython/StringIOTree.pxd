@@ -1,10 +1,30 @@
 cimport cython
 
+cdef class SpillFile:
+    cdef public Py_ssize_t threshold
+    cdef public Py_ssize_t min_chunk_size
+    cdef public Py_ssize_t committed_size
+    cdef public object file
+    cdef public Py_ssize_t file_size
+
+    @cython.locals(size=Py_ssize_t, is_text=bint)
+    cpdef spill(self, stream)
+    cpdef read(self, Py_ssize_t offset, Py_ssize_t size, bint is_text)
+
+
+cdef class _SpilledText:
+    cdef SpillFile spill_file
+    cdef Py_ssize_t offset
+    cdef Py_ssize_t size
+    cdef bint is_text
+
+
 cdef class StringIOTree:
     cdef public list prepended_children
     cdef public object stream
     cdef public object write
     cdef public list markers
+    cdef public SpillFile spill_file
 
     @cython.locals(x=StringIOTree)
     cpdef getvalue(self)
@@ -40,20 +40,97 @@ try:
 except ImportError:
     from io import StringIO
 import sys
+import tempfile
+
+
+class SpillFile(object):
+    """
+    Moves the committed (and thus final) chunks of a StringIOTree into a
+    temporary file, so that large generated files do not have to be kept
+    in memory until they are written out.  Chunks are only spilled once
+    more than 'threshold' characters were committed, and small chunks are
+    kept in memory.
+    """
+
+    def __init__(self, threshold=1024 * 1024, min_chunk_size=512):
+        self.threshold = threshold
+        self.min_chunk_size = min_chunk_size
+        self.committed_size = 0
+        self.file = None
+        self.file_size = 0
+
+    def spill(self, stream):
+        """
+        Returns an object with a getvalue() method that replaces the
+        finished 'stream', which is either the stream itself or a reference
+        to its content in the temporary file.
+        """
+        size = stream.tell()
+        self.committed_size += size
+        if self.committed_size <= self.threshold or size < self.min_chunk_size:
+            return stream
+        data = stream.getvalue()
+        is_text = not isinstance(data, bytes)
+        if is_text:
+            data = data.encode('utf8', 'surrogatepass')
+        if self.file is None:
+            self.file = tempfile.TemporaryFile()
+        self.file.seek(self.file_size)
+        self.file.write(data)
+        spilled = _SpilledText(self, self.file_size, len(data), is_text)
+        self.file_size += len(data)
+        return spilled
+
+    def read(self, offset, size, is_text):
+        self.file.seek(offset)
+        data = self.file.read(size)
+        if is_text:
+            data = data.decode('utf8', 'surrogatepass')
+        return data
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+class _SpilledText(object):
+    """
+    A read-only stand-in for a committed stream whose content was spilled.
+    """
+
+    def __init__(self, spill_file, offset, size, is_text):
+        self.spill_file = spill_file
+        self.offset = offset
+        self.size = size
+        self.is_text = is_text
+
+    def getvalue(self):
+        return self.spill_file.read(self.offset, self.size, self.is_text)
+
+    def tell(self):
+        return self.size
+
+    def write(self, s):
+        raise TypeError("Cannot write to a committed StringIOTree chunk")
 
 
 class StringIOTree(object):
     """
     See module docs.
+
+    If a SpillFile is passed, committed content of this tree and its
+    insertion points can be moved out of memory.
     """
 
-    def __init__(self, stream=None):
+    def __init__(self, stream=None, spill_file=None):
         self.prepended_children = []
         if stream is None:
             stream = StringIO()
         self.stream = stream
         self.write = stream.write
         self.markers = []
+        self.spill_file = spill_file
 
     def getvalue(self):
         content = [x.getvalue() for x in self.prepended_children]
@@ -73,7 +150,10 @@ class StringIOTree(object):
         # Save what we have written until now so that the buffer
         # itself is empty -- this makes it ready for insertion
         if self.stream.tell():
-            self.prepended_children.append(StringIOTree(self.stream))
+            stream = self.stream
+            if self.spill_file is not None:
+                stream = self.spill_file.spill(stream)
+            self.prepended_children.append(StringIOTree(stream))
             self.prepended_children[-1].markers = self.markers
             self.markers = []
             self.stream = StringIO()
@@ -100,7 +180,7 @@ class StringIOTree(object):
         # This is so that getvalue on the result doesn't include it.
         self.commit()
         # Construct the new forked object to return
-        other = StringIOTree()
+        other = StringIOTree(spill_file=self.spill_file)
         self.prepended_children.append(other)
         return other
 
@@ -1,6 +1,9 @@
+import os
+import shutil
+import tempfile
 import unittest
 
-from ..Utils import build_hex_version
+from ..Utils import build_hex_version, PathIndex
 
 class TestCythonUtils(unittest.TestCase):
     def test_build_hex_version(self):
@@ -9,3 +12,23 @@ class TestCythonUtils(unittest.TestCase):
         self.assertEqual('0x001D03C4', build_hex_version('0.29.3rc4'))
         self.assertEqual('0x001D00F0', build_hex_version('0.29'))
         self.assertEqual('0x040000F0', build_hex_version('4.0'))
+
+    def test_path_index(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            for name in ('a.pxd', 'a.cython-30.pxd', 'a.cython-2.pxd', 'b.pyx'):
+                open(os.path.join(tmpdir, name), 'w').close()
+            index = PathIndex()
+            self.assertTrue(index.exists(os.path.join(tmpdir, 'a.pxd')))
+            self.assertFalse(index.exists(os.path.join(tmpdir, 'b.pxd')))
+            self.assertFalse(index.exists(os.path.join(tmpdir, 'missing', 'b.pxd')))
+            self.assertEqual(
+                sorted(['a.cython-30.pxd', 'a.cython-2.pxd']),
+                sorted(os.path.basename(path) for path in index.find(tmpdir, 'a.cython-', '.pxd')))
+
+            open(os.path.join(tmpdir, 'b.pxd'), 'w').close()
+            self.assertFalse(index.exists(os.path.join(tmpdir, 'b.pxd')))  # still cached
+            index.invalidate(tmpdir)
+            self.assertTrue(index.exists(os.path.join(tmpdir, 'b.pxd')))
+        finally:
+            shutil.rmtree(tmpdir)
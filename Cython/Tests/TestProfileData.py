@@ -0,0 +1,69 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from ..ProfileData import LineCounter, load_profile_data
+
+
+def _count_positives(values):
+    count = 0
+    for value in values:
+        if value > 0:
+            count += 1
+    return count
+
+
+class TestProfileData(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_line_counter(self):
+        code = _count_positives.__code__
+        counter = LineCounter(file_filter=lambda filename: filename == code.co_filename)
+        with counter:
+            _count_positives([1, -1, 2, 3])
+        counts = counter.counts[code.co_filename]
+        first_line = code.co_firstlineno
+        self.assertEqual(1, counts[first_line + 1])  # count = 0
+        self.assertEqual(4, counts[first_line + 3])  # if value > 0
+        self.assertEqual(3, counts[first_line + 4])  # count += 1
+
+        path = os.path.join(self.tmpdir, 'profile.json')
+        counter.save(path)
+        counter.save(path)
+        self.assertEqual(8, load_profile_data(path)[code.co_filename][first_line + 3])
+        counter.save(path, merge=False)
+        self.assertEqual(4, load_profile_data(path)[code.co_filename][first_line + 3])
+
+    def test_branch_hints(self):
+        from ..Compiler.Main import compile as cython_compile
+        pyx_file = os.path.join(self.tmpdir, 'branches.pyx')
+        with open(pyx_file, 'w') as f:
+            f.write(
+                "def f(int n):\n"
+                "    if n < 0:\n"
+                "        n = -n\n"
+                "    elif n > 5:\n"
+                "        n += 1\n"
+                "    elif n > 2:\n"
+                "        n -= 1\n"
+                "    return n\n"
+            )
+        counter = LineCounter()
+        counter.counts[os.path.join('some', 'other', 'dir', 'branches.pyx')].update({
+            2: 1000, 4: 1000, 5: 950, 6: 50, 7: 30})
+        profile_data = os.path.join(self.tmpdir, 'profile.json')
+        counter.save(profile_data)
+
+        c_file = os.path.join(self.tmpdir, 'branches.c')
+        result = cython_compile(pyx_file, output_file=c_file, profile_data=profile_data, language_level=3)
+        self.assertEqual(0, result.num_errors)
+        with open(c_file) as f:
+            code = f.read()
+        self.assertIn("if (unlikely(__pyx_t_1)) {", code)  # never taken
+        self.assertIn("if (likely(__pyx_t_1)) {", code)  # taken in 95% of the cases
+        self.assertEqual(2, code.count("likely(__pyx_t_1)) {"))  # 60% is not enough
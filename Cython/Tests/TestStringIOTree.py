@@ -55,6 +55,34 @@ class TestStringIOTree(unittest.TestCase):
         self.assertEqual(self.tree.allmarkers(), list(range(1, 17)))
         self.assertEqual(code.strip(), self.tree.getvalue().strip())
 
+    def test_spilled_insertion(self):
+        self.tree = stringtree.StringIOTree(
+            spill_file=stringtree.SpillFile(threshold=0, min_chunk_size=1))
+        self.test_insertion()
+        self.assertTrue(self.tree.spill_file.file_size > 0)
+
+    def test_spill_threshold(self):
+        threshold = len(linemap[1]) + len(linemap[2]) + 2
+        spill_file = stringtree.SpillFile(threshold=threshold, min_chunk_size=5)
+        self.tree = stringtree.StringIOTree(spill_file=spill_file)
+        self.write_lines((1, 2))
+        self.tree.insertion_point()
+        self.assertEqual(0, spill_file.file_size)  # below threshold
+        self.write_line(3)
+        self.tree.insertion_point()
+        self.assertEqual(len(linemap[3]) + 1, spill_file.file_size)
+        self.tree.write(u'\xe9\n')
+        self.tree.insertion_point()
+        self.assertEqual(len(linemap[3]) + 1, spill_file.file_size)  # chunk too small
+        self.assertEqual(
+            '\n'.join([linemap[1], linemap[2], linemap[3], u'\xe9']) + '\n',
+            self.tree.getvalue())
+
+        out = stringtree.StringIO()
+        self.tree.copyto(out)
+        self.assertEqual(self.tree.getvalue(), out.getvalue())
+        self.assertEqual(list(range(1, 4)), self.tree.allmarkers())
+        spill_file.close()
 
     def write_lines(self, linenos, tree=None):
         for lineno in linenos:
@@ -1485,6 +1485,77 @@ static int __pyx_FusedFunction_init(void) {
     return 0;
 }
 
+//////////////////// FusedDispatchCache.proto ////////////////////
+
+// Maps the types of the fused arguments of a def function (plus the dtype
+// and ndim of NumPy arrays) to the specialisation that the dispatcher
+// selected for them, so that repeated calls skip the signature search.
+// The first 'nobjects' key items are borrowed object pointers (or NULL),
+// which are kept alive by the entry, the remaining ones are plain integers.
+
+#ifndef __Pyx_FUSED_DISPATCH_CACHE_SIZE
+#define __Pyx_FUSED_DISPATCH_CACHE_SIZE 4
+#endif
+#define __Pyx_FUSED_DISPATCH_MAX_KEY 16
+
+typedef struct {
+    void *key[__Pyx_FUSED_DISPATCH_MAX_KEY];
+    PyObject *result;  /* borrowed, owned by 'owned' */
+    PyObject *owned;   /* tuple of the key objects and the result */
+} __Pyx_FusedDispatchCacheEntry;
+
+typedef struct {
+    __Pyx_FusedDispatchCacheEntry entries[__Pyx_FUSED_DISPATCH_CACHE_SIZE];
+    int next;
+} __Pyx_FusedDispatchCache;
+
+static CYTHON_INLINE void *__Pyx_FusedDispatchCache_Lookup(__Pyx_FusedDispatchCache *cache, void **key, int nkey); /*proto*/
+static int __Pyx_FusedDispatchCache_Store(__Pyx_FusedDispatchCache *cache, void **key, int nkey, int nobjects, PyObject *result); /*proto*/
+
+//////////////////// FusedDispatchCache ////////////////////
+
+static CYTHON_INLINE void *__Pyx_FusedDispatchCache_Lookup(__Pyx_FusedDispatchCache *cache, void **key, int nkey) {
+    int i, j;
+    for (i = 0; i < __Pyx_FUSED_DISPATCH_CACHE_SIZE; i++) {
+        __Pyx_FusedDispatchCacheEntry *entry = &cache->entries[i];
+        // entries are filled in order and never emptied
+        if (!entry->result) break;
+        for (j = 0; j < nkey; j++) {
+            if (entry->key[j] != key[j]) break;
+        }
+        if (j == nkey) return entry->result;
+    }
+    return NULL;
+}
+
+static int __Pyx_FusedDispatchCache_Store(__Pyx_FusedDispatchCache *cache, void **key, int nkey, int nobjects, PyObject *result) {
+    __Pyx_FusedDispatchCacheEntry *entry;
+    PyObject *owned, *old_owned;
+    int i;
+    owned = PyTuple_New(nobjects + 1);
+    if (unlikely(!owned)) return -1;
+    for (i = 0; i < nobjects; i++) {
+        PyObject *item = key[i] ? (PyObject *) key[i] : Py_None;
+        Py_INCREF(item);
+        PyTuple_SET_ITEM(owned, i, item);
+    }
+    Py_INCREF(result);
+    PyTuple_SET_ITEM(owned, nobjects, result);
+
+    entry = &cache->entries[cache->next];
+    cache->next = (cache->next + 1) % __Pyx_FUSED_DISPATCH_CACHE_SIZE;
+    old_owned = entry->owned;
+    for (i = 0; i < nkey; i++) {
+        entry->key[i] = key[i];
+    }
+    entry->result = result;
+    entry->owned = owned;
+    // Only release the old entry once the cache is consistent again.
+    Py_XDECREF(old_owned);
+    return 0;
+}
+
+
 //////////////////// ClassMethod.proto ////////////////////
 
 #include "descrobject.h"
@@ -222,6 +222,37 @@ static void __Pyx_call_next_tp_clear(PyObject* obj, inquiry current_tp_clear) {
         type->tp_clear(obj);
 }
 
+/////////////// TypeVectorcallFallback.proto ///////////////
+
+#if CYTHON_USE_TYPE_VECTORCALL
+static PyObject *__Pyx_PyType_VectorcallFallback(PyObject *type, PyObject *const *args, size_t nargsf, PyObject *kwnames); /*proto*/
+#endif
+
+/////////////// TypeVectorcallFallback ///////////////
+//@requires: ObjectHandling.c::TupleAndListFromArray
+
+#if CYTHON_USE_TYPE_VECTORCALL
+// Instantiate a type through the tp_call() of its metatype. The tp_vectorcall() functions of
+// extension types use this when they get called for a subtype that inherited them.
+static PyObject *__Pyx_PyType_VectorcallFallback(PyObject *type, PyObject *const *args, size_t nargsf, PyObject *kwnames) {
+    PyObject *result, *argstuple, *kwargs = NULL;
+    Py_ssize_t nargs = __Pyx_PyVectorcall_NARGS(nargsf);
+    argstuple = __Pyx_PyTuple_FromArray(args, nargs);
+    if (unlikely(!argstuple)) return NULL;
+    if (kwnames && PyTuple_GET_SIZE(kwnames)) {
+        kwargs = _PyStack_AsDict(args + nargs, kwnames);
+        if (unlikely(!kwargs)) {
+            Py_DECREF(argstuple);
+            return NULL;
+        }
+    }
+    result = Py_TYPE(type)->tp_call(type, argstuple, kwargs);
+    Py_DECREF(argstuple);
+    Py_XDECREF(kwargs);
+    return result;
+}
+#endif
+
 /////////////// SetupReduce.proto ///////////////
 
 #if !CYTHON_COMPILING_IN_LIMITED_API
@@ -83,6 +83,7 @@ cdef extern from *:
     cdef int __pyx_memoryview_getbuffer(PyObject *obj, Py_buffer view, int flags)
 
 cdef extern from *:
+    int CYTHON_ATOMICS
     ctypedef int __pyx_atomic_int
     {{memviewslice_name}} slice_copy_contig "__pyx_memoryview_copy_new_contig"(
                                  __Pyx_memviewslice *from_mvs,
@@ -323,21 +324,11 @@ cdef void *align_pointer(void *memory, size_t alignment) nogil:
     return <void *> aligned_p
 
 
-# pre-allocate thread locks for reuse
-## note that this could be implemented in a more beautiful way in "normal" Cython,
-## but this code gets merged into the user module and not everything works there.
-DEF THREAD_LOCKS_PREALLOCATED = 8
-cdef int __pyx_memoryview_thread_locks_used = 0
-cdef PyThread_type_lock[THREAD_LOCKS_PREALLOCATED] __pyx_memoryview_thread_locks = [
-    PyThread_allocate_lock(),
-    PyThread_allocate_lock(),
-    PyThread_allocate_lock(),
-    PyThread_allocate_lock(),
-    PyThread_allocate_lock(),
-    PyThread_allocate_lock(),
-    PyThread_allocate_lock(),
-    PyThread_allocate_lock(),
-]
+# The acquisition count of memoryviews is maintained with atomic operations.
+# Only C compilers without atomics support (see "Atomics.proto") fall back to
+# a single lock that is shared by all memoryviews of the module.  It is allocated
+# lazily since memoryviews can get created before this module code runs.
+cdef PyThread_type_lock __pyx_memoryview_acquisition_lock
 
 
 @cname('__pyx_memoryview')
@@ -346,7 +337,6 @@ cdef class memoryview:
     cdef object obj
     cdef object _size
     cdef object _array_interface
-    cdef PyThread_type_lock lock
     # the following array will contain a single __pyx_atomic int with
     # suitable alignment
     cdef __pyx_atomic_int acquisition_count[2]
@@ -357,6 +347,12 @@ cdef class memoryview:
     cdef __Pyx_TypeInfo *typeinfo
 
     def __cinit__(memoryview self, object obj, int flags, bint dtype_is_object=False):
+        global __pyx_memoryview_acquisition_lock
+        if not CYTHON_ATOMICS and __pyx_memoryview_acquisition_lock is NULL:
+            __pyx_memoryview_acquisition_lock = PyThread_allocate_lock()
+            if __pyx_memoryview_acquisition_lock is NULL:
+                raise MemoryError
+
         self.obj = obj
         self.flags = flags
         if type(self) is memoryview or obj is not None:
@@ -365,15 +361,6 @@ cdef class memoryview:
                 (<__pyx_buffer *> &self.view).obj = Py_None
                 Py_INCREF(Py_None)
 
-        global __pyx_memoryview_thread_locks_used
-        if __pyx_memoryview_thread_locks_used < THREAD_LOCKS_PREALLOCATED:
-            self.lock = __pyx_memoryview_thread_locks[__pyx_memoryview_thread_locks_used]
-            __pyx_memoryview_thread_locks_used += 1
-        if self.lock is NULL:
-            self.lock = PyThread_allocate_lock()
-            if self.lock is NULL:
-                raise MemoryError
-
         if flags & PyBUF_FORMAT:
             self.dtype_is_object = (self.view.format[0] == b'O' and self.view.format[1] == b'\0')
         else:
@@ -391,19 +378,6 @@ cdef class memoryview:
             (<__pyx_buffer *> &self.view).obj = NULL
             Py_DECREF(Py_None)
 
-        cdef int i
-        global __pyx_memoryview_thread_locks_used
-        if self.lock != NULL:
-            for i in range(__pyx_memoryview_thread_locks_used):
-                if __pyx_memoryview_thread_locks[i] is self.lock:
-                    __pyx_memoryview_thread_locks_used -= 1
-                    if i != __pyx_memoryview_thread_locks_used:
-                        __pyx_memoryview_thread_locks[i], __pyx_memoryview_thread_locks[__pyx_memoryview_thread_locks_used] = (
-                            __pyx_memoryview_thread_locks[__pyx_memoryview_thread_locks_used], __pyx_memoryview_thread_locks[i])
-                    break
-            else:
-                PyThread_free_lock(self.lock)
-
     cdef char *get_item_pointer(memoryview self, object index) except NULL:
         cdef Py_ssize_t dim
         cdef char *itemp = <char *> self.view.buf
@@ -25,36 +25,51 @@ typedef struct {
     #define CYTHON_ATOMICS 1
 #endif
 
+// Acquisitions only need to be atomic, the release that drops the count to zero
+// additionally orders all previous accesses before the memoryview gets discarded.
 #define __pyx_atomic_int_type int
 // todo: Portland pgcc, maybe OS X's OSAtomicIncrement32,
 //       libatomic + autotools-like distutils support? Such a pain...
-#if CYTHON_ATOMICS && __GNUC__ >= 4 && (__GNUC_MINOR__ > 1 ||           \
-                    (__GNUC_MINOR__ == 1 && __GNUC_PATCHLEVEL >= 2)) && \
+#if CYTHON_ATOMICS && defined(__GCC_ATOMIC_INT_LOCK_FREE) && __GCC_ATOMIC_INT_LOCK_FREE == 2
+    /* gcc >= 4.7, clang, icc */
+    #define __pyx_atomic_incr_aligned(value) __atomic_fetch_add(value, 1, __ATOMIC_RELAXED)
+    #define __pyx_atomic_decr_aligned(value) __atomic_fetch_sub(value, 1, __ATOMIC_ACQ_REL)
+
+    #ifdef __PYX_DEBUG_ATOMICS
+        #warning "Using GNU atomics"
+    #endif
+#elif CYTHON_ATOMICS && (__GNUC__ > 4 || (__GNUC__ == 4 && (__GNUC_MINOR__ > 1 ||  \
+                    (__GNUC_MINOR__ == 1 && __GNUC_PATCHLEVEL__ >= 2)))) &&      \
                     !defined(__i386__)
     /* gcc >= 4.1.2 */
-    #define __pyx_atomic_incr_aligned(value, lock) __sync_fetch_and_add(value, 1)
-    #define __pyx_atomic_decr_aligned(value, lock) __sync_fetch_and_sub(value, 1)
+    #define __pyx_atomic_incr_aligned(value) __sync_fetch_and_add(value, 1)
+    #define __pyx_atomic_decr_aligned(value) __sync_fetch_and_sub(value, 1)
 
     #ifdef __PYX_DEBUG_ATOMICS
         #warning "Using GNU atomics"
     #endif
-#elif CYTHON_ATOMICS && defined(_MSC_VER) && 0
+#elif CYTHON_ATOMICS && defined(_MSC_VER)
     /* msvc */
-    #include <Windows.h>
+    #include <intrin.h>
     #undef __pyx_atomic_int_type
-    #define __pyx_atomic_int_type LONG
-    #define __pyx_atomic_incr_aligned(value, lock) InterlockedIncrement(value)
-    #define __pyx_atomic_decr_aligned(value, lock) InterlockedDecrement(value)
+    #define __pyx_atomic_int_type long
+    #pragma intrinsic (_InterlockedExchangeAdd)
+    #define __pyx_atomic_incr_aligned(value) _InterlockedExchangeAdd(value, 1)
+    #define __pyx_atomic_decr_aligned(value) _InterlockedExchangeAdd(value, -1)
 
     #ifdef __PYX_DEBUG_ATOMICS
         #pragma message ("Using MSVC atomics")
     #endif
-#elif CYTHON_ATOMICS && (defined(__ICC) || defined(__INTEL_COMPILER)) && 0
-    #define __pyx_atomic_incr_aligned(value, lock) _InterlockedIncrement(value)
-    #define __pyx_atomic_decr_aligned(value, lock) _InterlockedDecrement(value)
+#elif CYTHON_ATOMICS && !defined(__cplusplus) && defined(__STDC_VERSION__) && \
+                    __STDC_VERSION__ >= 201112L && !defined(__STDC_NO_ATOMICS__)
+    /* C11 */
+    #include <stdatomic.h>
+    #define __pyx_atomic_int_storage atomic_int
+    #define __pyx_atomic_incr_aligned(value) atomic_fetch_add_explicit(value, 1, memory_order_relaxed)
+    #define __pyx_atomic_decr_aligned(value) atomic_fetch_sub_explicit(value, 1, memory_order_acq_rel)
 
     #ifdef __PYX_DEBUG_ATOMICS
-        #warning "Using Intel atomics"
+        #warning "Using C11 atomics"
     #endif
 #else
     #undef CYTHON_ATOMICS
@@ -65,18 +80,22 @@ typedef struct {
     #endif
 #endif
 
-typedef volatile __pyx_atomic_int_type __pyx_atomic_int;
+#ifndef __pyx_atomic_int_storage
+    #define __pyx_atomic_int_storage __pyx_atomic_int_type
+#endif
+typedef volatile __pyx_atomic_int_storage __pyx_atomic_int;
 
 #if CYTHON_ATOMICS
     #define __pyx_add_acquisition_count(memview) \
-             __pyx_atomic_incr_aligned(__pyx_get_slice_count_pointer(memview), memview->lock)
+             __pyx_atomic_incr_aligned(__pyx_get_slice_count_pointer(memview))
     #define __pyx_sub_acquisition_count(memview) \
-            __pyx_atomic_decr_aligned(__pyx_get_slice_count_pointer(memview), memview->lock)
+            __pyx_atomic_decr_aligned(__pyx_get_slice_count_pointer(memview))
 #else
+    // A single lock per module serialises the counting, instead of one lock per memoryview.
     #define __pyx_add_acquisition_count(memview) \
-            __pyx_add_acquisition_count_locked(__pyx_get_slice_count_pointer(memview), memview->lock)
+            __pyx_add_acquisition_count_locked(__pyx_get_slice_count_pointer(memview), __pyx_memoryview_acquisition_lock)
     #define __pyx_sub_acquisition_count(memview) \
-            __pyx_sub_acquisition_count_locked(__pyx_get_slice_count_pointer(memview), memview->lock)
+            __pyx_sub_acquisition_count_locked(__pyx_get_slice_count_pointer(memview), __pyx_memoryview_acquisition_lock)
 #endif
 
 
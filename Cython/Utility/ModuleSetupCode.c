@@ -286,6 +286,17 @@
 /* Whether to use METH_FASTCALL with a fake backported implementation of vectorcall */
 #define CYTHON_BACKPORT_VECTORCALL (CYTHON_METH_FASTCALL && PY_VERSION_HEX < 0x030800B1)
 
+/* Whether extension types use vectorcall for their instantiation and for calling their instances */
+#if !defined(CYTHON_USE_TYPE_VECTORCALL)
+#define CYTHON_USE_TYPE_VECTORCALL  (CYTHON_VECTORCALL && CYTHON_METH_FASTCALL && PY_VERSION_HEX >= 0x030900B1)
+#endif
+
+/* Whether attribute and method lookups cache the type attribute per call site, keyed on the type version tag */
+#if !defined(CYTHON_USE_TYPE_ATTR_CACHE)
+#define CYTHON_USE_TYPE_ATTR_CACHE  (CYTHON_COMPILING_IN_CPYTHON && CYTHON_USE_PYTYPE_LOOKUP && CYTHON_USE_TYPE_SLOTS && \
+                                     CYTHON_UNPACK_METHODS && PY_VERSION_HEX >= 0x030600B1 && PY_VERSION_HEX < 0x030B0000)
+#endif
+
 #if CYTHON_USE_PYLONG_INTERNALS
   #include "longintrepr.h"
   /* These short defines can easily conflict with other code */
@@ -914,6 +925,26 @@ static CYTHON_INLINE PyObject * __Pyx_PyDict_GetItemStrWithError(PyObject *dict,
 #endif
 
 
+/////////////// VectorizeLoop.proto ///////////////
+
+// Tells the C compiler that the following loop has no dependencies between its
+// iterations that prevent vectorisation.  "#pragma omp simd" is not used because
+// OpenMP forbids jumping out of the loop, which the error handling code does.
+#ifndef CYTHON_VECTORIZE_LOOP
+#if defined(__clang__) && (__clang_major__ > 3 || (__clang_major__ == 3 && __clang_minor__ >= 8))
+    #define CYTHON_VECTORIZE_LOOP _Pragma("clang loop vectorize(assume_safety)")
+#elif defined(__INTEL_COMPILER)
+    #define CYTHON_VECTORIZE_LOOP _Pragma("ivdep")
+#elif defined(__GNUC__) && !defined(__clang__) && (__GNUC__ > 4 || (__GNUC__ == 4 && __GNUC_MINOR__ >= 9))
+    #define CYTHON_VECTORIZE_LOOP _Pragma("GCC ivdep")
+#elif defined(_MSC_VER) && _MSC_VER >= 1700
+    #define CYTHON_VECTORIZE_LOOP __pragma(loop(ivdep))
+#else
+    #define CYTHON_VECTORIZE_LOOP
+#endif
+#endif
+
+
 /////////////// PyModInitFuncType.proto ///////////////
 
 #ifndef CYTHON_NO_PYINIT_EXPORT
@@ -1523,6 +1523,47 @@ static CYTHON_INLINE PyObject *__Pyx__GetModuleGlobalName(PyObject *name)
     return __Pyx_GetBuiltinName(name);
 }
 
+/////////////// GetModuleAttr.proto ///////////////
+//@requires: PyDictVersioning
+//@requires: PyObjectGetAttrStr
+
+// Looks up a (non-special) attribute of an object that is usually a module,
+// e.g. "np.sqrt", and caches the result per call site until the module dict changes.
+#if CYTHON_USE_DICT_VERSIONS && CYTHON_USE_TYPE_SLOTS && CYTHON_COMPILING_IN_CPYTHON
+#define __Pyx_GetModuleAttr(var, obj, name)  { \
+    static PY_UINT64_T __pyx_dict_version = 0; \
+    static PyObject *__pyx_dict_cached_value = NULL; \
+    (var) = (likely(PyModule_CheckExact(obj) && \
+                    __pyx_dict_version == __PYX_GET_DICT_VERSION(PyModule_GetDict(obj)))) ? \
+        __Pyx_NewRef(__pyx_dict_cached_value) : \
+        __Pyx__GetModuleAttr(obj, name, &__pyx_dict_version, &__pyx_dict_cached_value); \
+}
+static PyObject *__Pyx__GetModuleAttr(PyObject *obj, PyObject *name, PY_UINT64_T *dict_version, PyObject **dict_cached_value); /*proto*/
+#else
+#define __Pyx_GetModuleAttr(var, obj, name)  (var) = __Pyx_PyObject_GetAttrStr(obj, name)
+#endif
+
+/////////////// GetModuleAttr ///////////////
+
+#if CYTHON_USE_DICT_VERSIONS && CYTHON_USE_TYPE_SLOTS && CYTHON_COMPILING_IN_CPYTHON
+static PyObject *__Pyx__GetModuleAttr(PyObject *obj, PyObject *name, PY_UINT64_T *dict_version, PyObject **dict_cached_value) {
+    // Module attributes that are not special names are looked up in the module dict
+    // before trying the module's __getattr__(), so only the dict lookup gets cached.
+    if (likely(PyModule_CheckExact(obj))) {
+        PyObject *dict = PyModule_GetDict(obj);
+        // Identifier names are always interned and have a pre-calculated hash value.
+        PyObject *result = _PyDict_GetItem_KnownHash(dict, name, ((PyASCIIObject *) name)->hash);
+        if (likely(result)) {
+            __PYX_UPDATE_DICT_CACHE(dict, result, *dict_cached_value, *dict_version)
+            return __Pyx_NewRef(result);
+        } else if (unlikely(PyErr_Occurred())) {
+            return NULL;
+        }
+    }
+    return __Pyx_PyObject_GetAttrStr(obj, name);
+}
+#endif
+
 //////////////////// GetAttr.proto ////////////////////
 
 static CYTHON_INLINE PyObject *__Pyx_GetAttr(PyObject *, PyObject *); /*proto*/
@@ -1879,6 +1920,178 @@ try_unpack:
 }
 
 
+/////////////// PyObjectTypeAttrCache.proto ///////////////
+
+#if CYTHON_USE_TYPE_ATTR_CACHE
+// Per call site cache of the type attribute (descriptor) that an attribute
+// lookup found, valid as long as the version tag of the type does not change.
+typedef struct {
+    unsigned int type_version;
+    int kind;          /* 0: empty, see __Pyx_TypeAttrCache_Lookup() for the others */
+    PyObject *descr;   /* borrowed from the type, NULL if the type has no such attribute */
+} __Pyx_TypeAttrCache;
+
+#define __Pyx_TypeAttrCache_KIND_METHOD  1
+#define __Pyx_TypeAttrCache_KIND_DATA    2
+#define __Pyx_TypeAttrCache_KIND_OTHER   3
+
+static int __Pyx_TypeAttrCache_Lookup(__Pyx_TypeAttrCache *cache, PyTypeObject *tp, PyObject *name); /*proto*/
+#endif
+
+/////////////// PyObjectTypeAttrCache ///////////////
+
+#if CYTHON_USE_TYPE_ATTR_CACHE
+// Returns the kind of the attribute 'name' of the type and stores it in the cache,
+// or 0 if the type cannot be cached.
+static int __Pyx_TypeAttrCache_Lookup(__Pyx_TypeAttrCache *cache, PyTypeObject *tp, PyObject *name) {
+    PyObject *descr;
+    int kind;
+    if (likely(cache->kind) && likely(cache->type_version == tp->tp_version_tag) &&
+            likely(__Pyx_PyType_HasFeature(tp, Py_TPFLAGS_VALID_VERSION_TAG)))
+        return cache->kind;
+    if (unlikely(tp->tp_dict == NULL))
+        return 0;
+    descr = _PyType_Lookup(tp, name);
+    if (unlikely(!__Pyx_PyType_HasFeature(tp, Py_TPFLAGS_VALID_VERSION_TAG)))
+        return 0;
+    if (!descr) {
+        kind = __Pyx_TypeAttrCache_KIND_OTHER;
+#if defined(Py_TPFLAGS_METHOD_DESCRIPTOR) && Py_TPFLAGS_METHOD_DESCRIPTOR
+    } else if (__Pyx_PyType_HasFeature(Py_TYPE(descr), Py_TPFLAGS_METHOD_DESCRIPTOR)) {
+#else
+    #ifdef __Pyx_CyFunction_USED
+    } else if (PyFunction_Check(descr) || __Pyx_IS_TYPE(descr, &PyMethodDescr_Type) || __Pyx_CyFunction_Check(descr)) {
+    #else
+    } else if (PyFunction_Check(descr) || __Pyx_IS_TYPE(descr, &PyMethodDescr_Type)) {
+    #endif
+#endif
+        kind = __Pyx_TypeAttrCache_KIND_METHOD;
+    } else if (Py_TYPE(descr)->tp_descr_get && PyDescr_IsData(descr)) {
+        kind = __Pyx_TypeAttrCache_KIND_DATA;
+    } else {
+        kind = __Pyx_TypeAttrCache_KIND_OTHER;
+    }
+    cache->type_version = tp->tp_version_tag;
+    cache->descr = descr;
+    cache->kind = kind;
+    return kind;
+}
+#endif
+
+
+/////////////// PyObjectGetAttrStrCached.proto ///////////////
+//@requires: PyObjectGetAttrStr
+//@requires: PyObjectTypeAttrCache
+
+#if CYTHON_USE_TYPE_ATTR_CACHE
+#define __Pyx_PyObject_GetAttrStrCached(var, obj, name)  { \
+    static __Pyx_TypeAttrCache __pyx_type_attr_cache = {0, 0, NULL}; \
+    (var) = __Pyx__PyObject_GetAttrStrCached(obj, name, &__pyx_type_attr_cache); \
+}
+static PyObject *__Pyx__PyObject_GetAttrStrCached(PyObject *obj, PyObject *name, __Pyx_TypeAttrCache *cache); /*proto*/
+#else
+#define __Pyx_PyObject_GetAttrStrCached(var, obj, name)  (var) = __Pyx_PyObject_GetAttrStr(obj, name)
+#endif
+
+/////////////// PyObjectGetAttrStrCached ///////////////
+
+#if CYTHON_USE_TYPE_ATTR_CACHE
+// Follows PyObject_GenericGetAttr(), but takes the type attribute from the cache.
+static PyObject *__Pyx__PyObject_GetAttrStrCached(PyObject *obj, PyObject *name, __Pyx_TypeAttrCache *cache) {
+    PyTypeObject *tp = Py_TYPE(obj);
+    PyObject *descr, *result;
+    descrgetfunc f;
+    int kind;
+    if (unlikely(tp->tp_getattro != PyObject_GenericGetAttr))
+        return __Pyx_PyObject_GetAttrStr(obj, name);
+    kind = __Pyx_TypeAttrCache_Lookup(cache, tp, name);
+    if (unlikely(!kind))
+        return __Pyx_PyObject_GetAttrStr(obj, name);
+    descr = cache->descr;
+    // The descriptor might get modified or deleted while we are using it.
+    Py_XINCREF(descr);
+    if (kind == __Pyx_TypeAttrCache_KIND_DATA) {
+        result = Py_TYPE(descr)->tp_descr_get(descr, obj, (PyObject *) tp);
+        Py_DECREF(descr);
+        return result;
+    }
+    if (tp->tp_dictoffset) {
+        PyObject **dictptr = _PyObject_GetDictPtr(obj);
+        PyObject *dict = dictptr ? *dictptr : NULL;
+        if (dict) {
+            Py_INCREF(dict);
+            result = __Pyx_PyDict_GetItemStrWithError(dict, name);
+            Py_XINCREF(result);
+            Py_DECREF(dict);
+            if (result || unlikely(PyErr_Occurred())) {
+                Py_XDECREF(descr);
+                return result;
+            }
+        }
+    }
+    if (descr) {
+        f = Py_TYPE(descr)->tp_descr_get;
+        if (!f)
+            return descr;
+        result = f(descr, obj, (PyObject *) tp);
+        Py_DECREF(descr);
+        return result;
+    }
+    // Let the normal lookup raise the AttributeError.
+    return __Pyx_PyObject_GetAttrStr(obj, name);
+}
+#endif
+
+
+/////////////// PyObjectGetMethodCached.proto ///////////////
+//@requires: PyObjectGetMethod
+//@requires: PyObjectTypeAttrCache
+
+#if CYTHON_USE_TYPE_ATTR_CACHE
+#define __Pyx_PyObject_GetMethodCached(is_method, obj, name, method)  { \
+    static __Pyx_TypeAttrCache __pyx_type_attr_cache = {0, 0, NULL}; \
+    (is_method) = __Pyx__PyObject_GetMethodCached(obj, name, method, &__pyx_type_attr_cache); \
+}
+static int __Pyx__PyObject_GetMethodCached(PyObject *obj, PyObject *name, PyObject **method, __Pyx_TypeAttrCache *cache); /*proto*/
+#else
+#define __Pyx_PyObject_GetMethodCached(is_method, obj, name, method)  (is_method) = __Pyx_PyObject_GetMethod(obj, name, method)
+#endif
+
+/////////////// PyObjectGetMethodCached ///////////////
+
+#if CYTHON_USE_TYPE_ATTR_CACHE
+// Like __Pyx_PyObject_GetMethod(), but takes the method from the cache if the type did not change.
+static int __Pyx__PyObject_GetMethodCached(PyObject *obj, PyObject *name, PyObject **method, __Pyx_TypeAttrCache *cache) {
+    PyTypeObject *tp = Py_TYPE(obj);
+    PyObject *descr;
+    if (unlikely(tp->tp_getattro != PyObject_GenericGetAttr) ||
+            unlikely(__Pyx_TypeAttrCache_Lookup(cache, tp, name) != __Pyx_TypeAttrCache_KIND_METHOD))
+        return __Pyx_PyObject_GetMethod(obj, name, method);
+    descr = cache->descr;
+    Py_INCREF(descr);
+    if (tp->tp_dictoffset) {
+        // An instance attribute shadows the method.
+        PyObject **dictptr = _PyObject_GetDictPtr(obj);
+        PyObject *dict = dictptr ? *dictptr : NULL;
+        if (dict) {
+            PyObject *attr;
+            Py_INCREF(dict);
+            attr = __Pyx_PyDict_GetItemStrWithError(dict, name);
+            Py_XINCREF(attr);
+            Py_DECREF(dict);
+            if (unlikely(attr || PyErr_Occurred())) {
+                Py_DECREF(descr);
+                *method = attr;
+                return 0;
+            }
+        }
+    }
+    *method = descr;
+    return 1;
+}
+#endif
+
+
 /////////////// UnpackUnboundCMethod.proto ///////////////
 
 typedef struct {
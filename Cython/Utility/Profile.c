@@ -333,3 +333,101 @@ bad:
 }
 
 #endif /* CYTHON_PROFILE */
+
+
+/////////////// ProfileCounters.proto ///////////////
+
+// Call counts and cumulative run times of functions, collected with the
+// 'profile_counters' directive.  Times are measured in clock ticks.
+typedef struct {
+    unsigned PY_LONG_LONG calls;
+    unsigned PY_LONG_LONG ticks;
+} __Pyx_ProfileCounter;
+
+static CYTHON_INLINE unsigned PY_LONG_LONG __Pyx_ProfileCounterClock(void);
+static PyObject *__Pyx_ProfileCounterStats(__Pyx_ProfileCounter *counters, const char * const *names,
+                                           Py_ssize_t count, PyObject *args, PyObject *kwds); /*proto*/
+
+#define __Pyx_ProfileCounterDeclarations  unsigned PY_LONG_LONG __pyx_profile_start = __Pyx_ProfileCounterClock();
+#define __Pyx_ProfileCounterUpdate(counter)  { \
+    (counter).calls++; \
+    (counter).ticks += __Pyx_ProfileCounterClock() - __pyx_profile_start; \
+}
+
+#if defined(_WIN32)
+  #include <windows.h>
+#else
+  #include <time.h>
+#endif
+
+/////////////// ProfileCounters ///////////////
+
+static CYTHON_INLINE unsigned PY_LONG_LONG __Pyx_ProfileCounterClock(void) {
+#if defined(_WIN32)
+    LARGE_INTEGER ticks;
+    QueryPerformanceCounter(&ticks);
+    return (unsigned PY_LONG_LONG) ticks.QuadPart;
+#elif defined(CLOCK_MONOTONIC)
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return (unsigned PY_LONG_LONG) ts.tv_sec * 1000000000 + (unsigned PY_LONG_LONG) ts.tv_nsec;
+#else
+    return (unsigned PY_LONG_LONG) clock();
+#endif
+}
+
+static double __Pyx_ProfileCounterTicksPerSecond(void) {
+#if defined(_WIN32)
+    LARGE_INTEGER frequency;
+    QueryPerformanceFrequency(&frequency);
+    return (double) frequency.QuadPart;
+#elif defined(CLOCK_MONOTONIC)
+    return 1e9;
+#else
+    return (double) CLOCKS_PER_SEC;
+#endif
+}
+
+// Return a dict that maps the function names to tuples (calls, seconds),
+// and reset the counters to zero if requested with "reset=True".
+static PyObject *__Pyx_ProfileCounterStats(__Pyx_ProfileCounter *counters, const char * const *names,
+                                           Py_ssize_t count, PyObject *args, PyObject *kwds) {
+    static char *kwlist[] = {(char *) "reset", 0};
+    PyObject *reset = Py_False;
+    PyObject *stats;
+    double ticks_per_second = __Pyx_ProfileCounterTicksPerSecond();
+    Py_ssize_t i;
+    int do_reset;
+    if (unlikely(!PyArg_ParseTupleAndKeywords(args, kwds, "|O:__pyx_profile_stats__", kwlist, &reset)))
+        return NULL;
+    do_reset = __Pyx_PyObject_IsTrue(reset);
+    if (unlikely(do_reset < 0)) return NULL;
+    stats = PyDict_New();
+    if (unlikely(!stats)) return NULL;
+    for (i = 0; i < count; i++) {
+        int result;
+        PyObject *name, *value;
+        value = Py_BuildValue("(Kd)", counters[i].calls, (double) counters[i].ticks / ticks_per_second);
+        if (unlikely(!value)) goto bad;
+        #if PY_MAJOR_VERSION >= 3
+        name = PyUnicode_FromString(names[i]);
+        #else
+        name = PyString_FromString(names[i]);
+        #endif
+        if (unlikely(!name)) {
+            Py_DECREF(value);
+            goto bad;
+        }
+        result = PyDict_SetItem(stats, name, value);
+        Py_DECREF(name);
+        Py_DECREF(value);
+        if (unlikely(result < 0)) goto bad;
+    }
+    if (do_reset) {
+        memset(counters, 0, (size_t) count * sizeof(__Pyx_ProfileCounter));
+    }
+    return stats;
+bad:
+    Py_DECREF(stats);
+    return NULL;
+}
@@ -19,6 +19,7 @@ import os
 import sys
 import re
 import io
+import errno
 import codecs
 import glob
 import shutil
@@ -37,6 +38,7 @@ _function_caches = []
 def clear_function_caches():
     for cache in _function_caches:
         cache.clear()
+    path_index.invalidate()
 
 
 def cached_function(f):
@@ -176,10 +178,79 @@ def is_package_dir(dir_path):
         return 1
 
 
+class PathIndex(object):
+    """
+    Caches directory listings, so that looking up many file names in the
+    same (include) directories needs one os.listdir() per directory instead
+    of one os.stat() per name.
+
+    The index does not notice changes to the file system by itself,
+    call invalidate() after creating or deleting files that it may know.
+    """
+
+    def __init__(self):
+        self._listings = {}
+
+    def invalidate(self, directory=None):
+        if directory is None:
+            self._listings.clear()
+        else:
+            self._listings.pop(directory, None)
+
+    def listdir(self, directory):
+        """
+        Returns a (names, lowercase_names) tuple of frozensets for the directory,
+        an empty listing if it does not exist, or None if it cannot be listed.
+        """
+        try:
+            return self._listings[directory]
+        except KeyError:
+            pass
+        try:
+            names = os.listdir(directory or os.curdir)
+        except (IOError, OSError) as exc:
+            listing = (frozenset(), frozenset()) if exc.errno in (errno.ENOENT, errno.ENOTDIR) else None
+        else:
+            listing = (frozenset(names), frozenset([name.lower() for name in names]))
+        self._listings[directory] = listing
+        return listing
+
+    def exists(self, path):
+        """
+        Like os.path.exists(), but answered from the cached directory listing.
+        """
+        directory, name = os.path.split(path)
+        listing = self.listdir(directory) if name not in ('', os.curdir, os.pardir) else None
+        if listing is None:
+            return os.path.exists(path)
+        names, lowercase_names = listing
+        if name in names:
+            return True
+        if name.lower() in lowercase_names:
+            # might still exist on a case insensitive file system
+            return os.path.exists(path)
+        return False
+
+    def find(self, directory, prefix, suffix):
+        """
+        Returns the paths of all files in the directory whose names start
+        with 'prefix' and end with 'suffix'.
+        """
+        listing = self.listdir(directory)
+        if listing is None:
+            return glob.glob(os.path.join(directory, prefix) + '*' + suffix)
+        return [os.path.join(directory, name) for name in listing[0]
+                if name.startswith(prefix) and name.endswith(suffix) and len(name) >= len(prefix) + len(suffix)]
+
+
+# shared by all compiler contexts in the process, see clear_function_caches()
+path_index = PathIndex()
+
+
 @cached_function
 def path_exists(path):
     # try on the filesystem first
-    if os.path.exists(path):
+    if path_index.exists(path):
         return True
     # figure out if a PEP 302 loader is around
     try:
@@ -218,9 +289,9 @@ def find_versioned_file(directory, filename, suffix,
     assert not suffix or suffix[:1] == '.'
     path_prefix = os.path.join(directory, filename)
 
-    matching_files = glob.glob(path_prefix + ".cython-*" + suffix)
+    matching_files = path_index.find(directory, filename + ".cython-", suffix)
     path = path_prefix + suffix
-    if not os.path.exists(path):
+    if not path_index.exists(path):
         path = None
     best_match = (-1, path)  # last resort, if we do not have versioned .pxd files
 
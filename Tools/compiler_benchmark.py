@@ -0,0 +1,421 @@
+#!/usr/bin/env python
+
+"""
+Measure the run time and the peak memory usage (RSS) of the Cython compiler.
+
+Each source file is translated to C in a fresh Python process, so that the
+peak RSS of one compilation is not hidden by an earlier one.  Besides real
+source files, the script can generate synthetic modules of a given size
+that resemble machine generated code (many functions with lots of local
+variables, assignments and branches), or a single large state machine
+function that stresses the control flow analysis.  It can also measure the
+import time of compiler modules with ``-X importtime`` (Python 3.7+), which
+matters for the startup of ``cython`` and ``cythonize``.
+
+The test modules under ``tests/`` serve as a realistic corpus (``--corpus``).
+For each file, the time spent in the different pipeline phases is reported
+along with the total time and the peak RSS.  To compare two revisions, run
+the same corpus against the compiler of a git revision (``--revision``),
+save the results as JSON and pass them to ``--compare`` in a second run.
+Note that a revision exported from git only contains the uncompiled
+compiler, so the working tree should not be compiled either for a fair
+comparison.
+
+Usage examples::
+
+    $ python Tools/compiler_benchmark.py --synthetic 30000
+    $ python Tools/compiler_benchmark.py --synthetic-function 2000
+    $ python Tools/compiler_benchmark.py tests/run/fused_types.pyx
+    $ python Tools/compiler_benchmark.py --import-time Cython.Compiler.Main
+    $ python Tools/compiler_benchmark.py --corpus run --sample 20 --revision master --json base.json
+    $ python Tools/compiler_benchmark.py --corpus run --sample 20 --compare base.json
+"""
+
+from __future__ import print_function, absolute_import
+
+import io
+import os
+import re
+import sys
+import json
+import glob
+import shutil
+import tarfile
+import tempfile
+import subprocess
+
+CYTHON_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in the child process: translate the module and report the time, the time
+# per pipeline phase (if supported by the compiler version) and the peak RSS.
+_CHILD_CODE = r"""
+import sys, time, json
+sys.path.insert(0, %(cython_root)r)
+sys.argv = ['cython'] + %(args)r
+from Cython.Compiler import Pipeline
+Pipeline.phase_timings = {}
+from Cython.Compiler.Main import main
+t = time.time()
+try:
+    main(command_line=1)
+    failed = False
+except SystemExit as exc:
+    failed = bool(exc.code)
+t = time.time() - t
+try:
+    import resource
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform != 'darwin':
+        maxrss *= 1024  # kB on Linux
+except ImportError:
+    maxrss = None
+print('\n' + json.dumps({'time': t, 'phases': Pipeline.phase_timings, 'peak_rss': maxrss, 'failed': failed}))
+"""
+
+
+def generate_synthetic_module(lines, functions_per_class=20):
+    """
+    Generate the source code of a module with roughly the given number of lines.
+    """
+    code = [
+        "# cython: language_level=3",
+        "cimport cython",
+        "",
+    ]
+    func_lines = 40
+    count = max(1, lines // func_lines)
+    for i in range(count):
+        if i % functions_per_class == 0:
+            code += [
+                "cdef class C%d:" % i,
+                "    cdef public double scale",
+                "    cdef int count",
+                "    def __init__(self, scale):",
+                "        self.scale = scale",
+                "",
+            ]
+        code += [
+            "    cpdef double f%d(self, double[:] values, int n, obj):" % i,
+            "        cdef int i, j = 0",
+            "        cdef double total = 0, tmp",
+            "        result = []",
+        ]
+        for k in range(8):
+            code += [
+                "        for i in range(n):",
+                "            tmp = values[i] * self.scale + %d" % k,
+                "            if tmp > %d:" % k,
+                "                total += tmp",
+            ]
+        code += [
+            "        while j < n:",
+            "            if obj is not None and j %% %d == 0:" % (i % 7 + 2),
+            "                result.append(obj[j])",
+            "            elif j > %d:" % i,
+            "                break",
+            "            j += 1",
+            "        self.count += 1",
+            "        return total + len(result)",
+            "",
+        ]
+    return '\n'.join(code) + '\n'
+
+
+def generate_state_machine_module(states, variables=20):
+    """
+    Generate a module with a single large function that resembles a
+    generated state machine: a loop over a long if-elif chain in which
+    each branch assigns several of the same local variables.
+    """
+    code = [
+        "# cython: language_level=3",
+        "",
+        "def run(data):",
+        "    cdef Py_ssize_t pos = 0",
+        "    cdef int state = 0",
+    ]
+    code += ["    v%d = None" % i for i in range(variables)]
+    code += [
+        "    while pos < len(data):",
+        "        c = data[pos]",
+        "        if state == -1:",
+        "            break",
+    ]
+    for i in range(states):
+        code += [
+            "        elif state == %d:" % i,
+            "            if c == %d:" % (i % 256),
+            "                v%d = c" % (i % variables),
+            "                state = %d" % ((i * 7 + 1) % states),
+            "            else:",
+            "                v%d = v%d" % ((i + 1) % variables, (i + 2) % variables),
+            "                state = %d" % ((i + 1) % states),
+        ]
+    code += [
+        "        pos += 1",
+        "    return (%s)" % ', '.join("v%d" % i for i in range(variables)),
+    ]
+    return '\n'.join(code) + '\n'
+
+
+def read_test_tags(source_file):
+    """
+    Read the "# mode: ..." and "# tag: ..." header comments of a test module
+    (see ``parse_tags()`` in runtests.py) into a dict of lists.
+    """
+    tags = {}
+    parse_tag = re.compile(r'#\s*(\w+)\s*:(.*)$').match
+    with io.open(source_file, encoding='ISO-8859-1') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                if tags:
+                    break
+                continue
+            if not line.startswith('#'):
+                break
+            parsed = parse_tag(line)
+            if parsed:
+                tag, values = parsed.groups()
+                tags.setdefault(tag, []).extend(
+                    value.strip() for value in values.split(',') if value.strip())
+            elif tags:
+                break
+    return tags
+
+
+def find_corpus_files(corpus, sample=1, pattern=None):
+    """
+    Collect the compilable .pyx test modules in the "tests/CORPUS" directory
+    and return a list of (source file, extra compiler arguments) pairs.
+    Error tests and tests that need preprocessing are left out.  Only every
+    SAMPLE-th file is selected to allow for quicker (but stable) runs.
+    """
+    test_dir = os.path.join(CYTHON_ROOT, 'tests', corpus)
+    if not os.path.isdir(test_dir):
+        raise ValueError("Unknown test corpus '%s'" % corpus)
+    match = re.compile(pattern).search if pattern else None
+    files = []
+    for source_file in sorted(glob.glob(os.path.join(test_dir, '*.pyx'))):
+        if match and not match(os.path.basename(source_file)):
+            continue
+        tags = read_test_tags(source_file)
+        if 'error' in tags.get('mode', ()) or 'preparse' in tags:
+            continue
+        files.append((source_file, ['--cplus'] if 'cpp' in tags.get('tag', ()) else []))
+    return files[::max(1, sample)]
+
+
+def export_revision(revision, target_dir):
+    """
+    Extract the source tree of the given git revision into target_dir.
+    """
+    tar_data = subprocess.check_output(
+        ['git', 'archive', '--format=tar', revision], cwd=CYTHON_ROOT)
+    with tarfile.open(fileobj=io.BytesIO(tar_data)) as tar:
+        tar.extractall(target_dir)
+    return target_dir
+
+
+def compare_results(old_results, new_results):
+    """
+    Print the relative change of the compile time, the phase times and the
+    peak RSS for each file that appears in both result lists, and return the
+    changes as a list of dicts.
+    """
+    def ratio(old, new):
+        return new / old if old and new else None
+
+    def format_ratio(value):
+        return '%7.3f' % value if value is not None else '      ?'
+
+    old_by_name = dict((result['name'], result) for result in old_results if 'name' in result)
+    changes = []
+    old_total = new_total = 0
+    old_phases = {}
+    new_phases = {}
+    print("\n%-50s %9s %9s %7s %7s" % ('file', 'old [s]', 'new [s]', 'time', 'RSS'))
+    for new in new_results:
+        old = old_by_name.get(new.get('name'))
+        if old is None or 'time' not in old or old.get('failed') or new.get('failed'):
+            continue
+        change = {
+            'name': new['name'],
+            'time': ratio(old['time'], new['time']),
+            'peak_rss': ratio(old.get('peak_rss'), new.get('peak_rss')),
+        }
+        changes.append(change)
+        old_total += old['time']
+        new_total += new['time']
+        for phases, result in ((old_phases, old), (new_phases, new)):
+            for phase_name, t in (result.get('phases') or {}).items():
+                phases[phase_name] = phases.get(phase_name, 0) + t
+        print("%-50s %9.3f %9.3f %s %s" % (
+            new['name'], old['time'], new['time'],
+            format_ratio(change['time']), format_ratio(change['peak_rss'])))
+
+    if changes:
+        print("%-50s %9.3f %9.3f %s" % (
+            'total (%d files)' % len(changes), old_total, new_total, format_ratio(ratio(old_total, new_total))))
+    if old_phases and new_phases:
+        print("\n%-50s %9s %9s %7s" % ('phase', 'old [s]', 'new [s]', 'time'))
+        for phase_name in sorted(set(old_phases) | set(new_phases),
+                                 key=lambda name: -max(old_phases.get(name, 0), new_phases.get(name, 0))):
+            old_time, new_time = old_phases.get(phase_name, 0), new_phases.get(phase_name, 0)
+            print("%-50s %9.3f %9.3f %s" % (
+                phase_name, old_time, new_time, format_ratio(ratio(old_time, new_time))))
+    return changes
+
+
+def compile_file(source_file, cython_args=(), python=sys.executable, output_dir=None,
+                 cython_root=CYTHON_ROOT):
+    """
+    Translate a single source file to C in a child process and return a dict
+    with its run time in seconds, the time spent in each pipeline phase and
+    its peak RSS in bytes.  The compiler is imported from cython_root.
+    """
+    cleanup = output_dir is None
+    if cleanup:
+        output_dir = tempfile.mkdtemp(prefix='cybench')
+    try:
+        ext = '.cpp' if '--cplus' in cython_args else '.c'
+        c_file = os.path.join(output_dir, os.path.splitext(os.path.basename(source_file))[0] + ext)
+        args = list(cython_args) + ['-o', c_file, source_file]
+        output = subprocess.check_output(
+            [python, '-c', _CHILD_CODE % {'cython_root': cython_root, 'args': args}],
+            stderr=subprocess.STDOUT)
+        output = output.decode('utf8', 'replace')
+        result_line = output.rstrip().rsplit('\n', 1)[-1]
+        result = json.loads(result_line)
+        result['file'] = source_file
+        if os.path.exists(c_file):
+            result['c_size'] = os.path.getsize(c_file)
+        return result
+    finally:
+        if cleanup:
+            shutil.rmtree(output_dir, ignore_errors=True)
+
+
+def measure_import_time(module_name, python=sys.executable):
+    """
+    Import a module in a fresh process with ``-X importtime`` and return a dict
+    with the total import time in seconds and the slowest modules it imported.
+    """
+    output = subprocess.check_output(
+        [python, '-X', 'importtime', '-c',
+         'import sys; sys.path.insert(0, %r); import %s' % (CYTHON_ROOT, module_name)],
+        stderr=subprocess.STDOUT)
+    timings = []
+    for line in output.decode('utf8', 'replace').splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        timings.append((name.strip(), int(self_us), int(cumulative_us)))
+    slowest = sorted(timings, key=lambda t: t[1], reverse=True)[:10]
+    return {
+        'module': module_name,
+        'time': dict((name, cumulative) for name, _, cumulative in timings)[module_name] / 1e6,
+        'slowest': [(name, self_us / 1e6) for name, self_us, _ in slowest],
+    }
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n\n')[0])
+    parser.add_argument('sources', nargs='*', help='source files to compile')
+    parser.add_argument('--synthetic', metavar='LINES', type=int, action='append', default=[],
+                        help='compile a generated module of about LINES lines (can be repeated)')
+    parser.add_argument('--synthetic-function', metavar='STATES', type=int, action='append', default=[],
+                        help='compile a generated state machine function with STATES states (can be repeated)')
+    parser.add_argument('--repeat', type=int, default=1,
+                        help='compile each file REPEAT times and report the fastest run')
+    parser.add_argument('--cython-arg', dest='cython_args', action='append', default=[],
+                        help='additional argument to pass to the compiler')
+    parser.add_argument('--import-time', metavar='MODULE', action='append', default=[],
+                        help='measure the time it takes to import MODULE (can be repeated)')
+    parser.add_argument('--corpus', metavar='DIR', action='append', default=[],
+                        help='compile the test modules in tests/DIR, e.g. "run" or "memoryview" (can be repeated)')
+    parser.add_argument('--sample', metavar='N', type=int, default=1,
+                        help='only compile every N-th module of the test corpus')
+    parser.add_argument('--pattern', help='only compile test modules whose file name matches this regex')
+    parser.add_argument('--revision', metavar='REV',
+                        help='benchmark the compiler of this git revision instead of the working tree')
+    parser.add_argument('--compare', metavar='JSON_FILE',
+                        help='compare the results with those of an earlier run, stored with --json')
+    parser.add_argument('--json', dest='json_file', help='write the results to this JSON file')
+    options = parser.parse_args(argv)
+
+    import_results = []
+    for module_name in options.import_time:
+        runs = [measure_import_time(module_name) for _ in range(max(1, options.repeat))]
+        result = min(runs, key=lambda r: r['time'])
+        import_results.append(result)
+        print("%-50s %8.1f msec  (slowest: %s)" % (
+            'import ' + module_name, result['time'] * 1000,
+            ', '.join('%s %.1f' % (name, t * 1000) for name, t in result['slowest'][:3])))
+
+    workdir = tempfile.mkdtemp(prefix='cybench')
+    try:
+        cython_root = CYTHON_ROOT
+        if options.revision:
+            cython_root = export_revision(options.revision, os.path.join(workdir, 'cython'))
+
+        # (source file, name in the results, extra compiler arguments)
+        sources = [(source_file, source_file, []) for source_file in options.sources]
+        for lines in options.synthetic:
+            source_file = os.path.join(workdir, 'synthetic_%d.pyx' % lines)
+            with open(source_file, 'w') as f:
+                f.write(generate_synthetic_module(lines))
+            sources.append((source_file, os.path.basename(source_file), []))
+        for states in options.synthetic_function:
+            source_file = os.path.join(workdir, 'state_machine_%d.pyx' % states)
+            with open(source_file, 'w') as f:
+                f.write(generate_state_machine_module(states))
+            sources.append((source_file, os.path.basename(source_file), []))
+        for corpus in options.corpus:
+            sources.extend(
+                (source_file, os.path.relpath(source_file, CYTHON_ROOT), extra_args)
+                for source_file, extra_args in find_corpus_files(corpus, options.sample, options.pattern))
+
+        results = import_results
+        for source_file, name, extra_args in sources:
+            cython_args = options.cython_args + extra_args
+            runs = [compile_file(source_file, cython_args, cython_root=cython_root)
+                    for _ in range(max(1, options.repeat))]
+            result = min(runs, key=lambda r: r['time'])
+            result['peak_rss'] = max(r['peak_rss'] or 0 for r in runs) or None
+            result['name'] = name
+            results.append(result)
+            print("%-50s %8.2f sec %10s MB%s" % (
+                name, result['time'],
+                '%.1f' % (result['peak_rss'] / 1024.0 / 1024.0) if result['peak_rss'] else '?',
+                '  (FAILED)' if result['failed'] else ''))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    compiled = [result for result in results if 'phases' in result]
+    if len(compiled) > 1:
+        phases = {}
+        for result in compiled:
+            for phase_name, t in result['phases'].items():
+                phases[phase_name] = phases.get(phase_name, 0) + t
+        print("%-50s %8.2f sec %10s MB" % (
+            'total (%d files)' % len(compiled), sum(result['time'] for result in compiled),
+            '%.1f' % (max(result['peak_rss'] or 0 for result in compiled) / 1024.0 / 1024.0)))
+        for phase_name, t in sorted(phases.items(), key=lambda item: -item[1])[:10]:
+            print("    %-46s %8.2f sec" % (phase_name, t))
+
+    if options.compare:
+        with open(options.compare) as f:
+            compare_results(json.load(f)['results'], results)
+
+    if options.json_file:
+        with open(options.json_file, 'w') as f:
+            json.dump({'revision': options.revision, 'python': sys.version, 'results': results},
+                      f, indent=2, sort_keys=True)
+    return results
+
+
+if __name__ == '__main__':
+    main()
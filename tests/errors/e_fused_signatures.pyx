@@ -0,0 +1,20 @@
+# mode: error
+# tag: fused
+
+cimport cython
+
+@cython.fused_signatures("double", "int")
+cdef cython.floating add(cython.floating a, cython.floating b):
+    return a + b
+
+@cython.fused_signatures("float")
+cdef cython.floating sub(cython.floating a, cython.floating b):
+    return a - b
+
+sub[double](1, 2)
+
+_ERRORS = u"""
+7:5: Unknown fused signature 'int' for function 'add'
+14:0: Invalid use of fused types, type cannot be specialized
+14:3: Specialization excluded by the fused_signatures directive
+"""
@@ -0,0 +1,124 @@
+# mode: run
+# tag: memoryview
+
+"""
+Temporary slices of local memoryviews that are only passed into C functions
+borrow the memoryview of their base slice instead of acquiring it.
+"""
+
+from cython.view cimport array
+from cython.parallel cimport prange
+
+cdef extern from *:
+    """
+    #define acquisition_count(slice)  __pyx_get_slice_count((slice).memview)
+    """
+    int acquisition_count(double[:] values) nogil
+
+
+cdef double[:] make_view(int n):
+    cdef double[:] view = array(shape=(n,), itemsize=sizeof(double), format='d')
+    cdef int i
+    for i in range(n):
+        view[i] = i
+    return view
+
+
+cdef int count(double[:] values) nogil:
+    return acquisition_count(values)
+
+
+cdef double first(double[:] values) nogil:
+    return values[0]
+
+
+cdef double[:] stored = None
+
+cdef double store(double[:] values):
+    global stored
+    stored = values
+    return values[0]
+
+
+cdef double rebind(double[:] values):
+    values = values[1:]
+    return values[0]
+
+
+cdef double fail(double[:] values) except -1:
+    raise ValueError(values[0])
+
+
+def acquisition_counts():
+    """
+    >>> acquisition_counts()
+    (1, 1, 1, 1, 2, 2)
+    """
+    cdef double[:] view = make_view(5)
+    result = (count(view), count(view[1:]), count(view[::2]), count(view[:]))
+    cdef double[:] tail = view[1:]
+    return result + (count(tail), count(tail[1:]))
+
+
+def borrowed_slices_in_calls():
+    """
+    >>> borrowed_slices_in_calls()
+    (1.0, 2.0, 3.0, 1)
+    """
+    cdef double[:] view = make_view(5)
+    result = (first(view[1:]), rebind(view[1:]), first(view[3:]), acquisition_count(view))
+    return result
+
+
+def stored_slice():
+    """
+    >>> stored_slice()
+    (2.0, 2, [2.0, 3.0, 4.0])
+    """
+    global stored
+    cdef double[:] view = make_view(5)
+    value = store(view[2:])
+    acquisitions = acquisition_count(view)
+    view = None
+    result = (value, acquisitions, [x for x in stored])
+    stored = None
+    return result
+
+
+def exception_in_callee():
+    """
+    >>> exception_in_callee()
+    (3.0, 1)
+    """
+    cdef double[:] view = make_view(5)
+    try:
+        fail(view[3:])
+    except ValueError as exc:
+        return exc.args[0], acquisition_count(view)
+
+
+def slicing_error():
+    """
+    >>> slicing_error()
+    ('IndexError', 1)
+    """
+    cdef double[:, :] view = array(shape=(2, 2), itemsize=sizeof(double), format='d')
+    view[:, :] = 1
+    cdef Py_ssize_t i = 5
+    try:
+        first(view[i])
+    except IndexError as exc:
+        return 'IndexError', count(view[0])
+
+
+def parallel_calls(int n):
+    """
+    >>> parallel_calls(100)
+    (4950.0, 1)
+    """
+    cdef double[:] view = make_view(n)
+    cdef double total = 0
+    cdef int i
+    for i in prange(n, nogil=True):
+        total += first(view[i:])
+    return total, acquisition_count(view)
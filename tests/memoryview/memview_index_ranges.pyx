@@ -0,0 +1,241 @@
+# mode: run
+# tag: memoryview
+
+"""
+Memoryview indices that are known to be within the shape of the memoryview,
+e.g. from the range() of a loop or from a comparison, are not bounds checked,
+and indices that are known to be non-negative are not wrapped around.
+These tests make sure that all other indices are still checked.
+"""
+
+from cython.view cimport array
+from cython.parallel cimport prange
+
+
+def make_view(int n):
+    cdef double[:] view = array(shape=(n,), itemsize=sizeof(double), format='d')
+    cdef int i
+    for i in range(n):
+        view[i] = i
+    return view
+
+
+def make_2d(int n, int m):
+    cdef double[:, :] view = array(shape=(n, m), itemsize=sizeof(double), format='d')
+    cdef int i, j
+    for i in range(n):
+        for j in range(m):
+            view[i, j] = i * m + j
+    return view
+
+
+def loop_over_shape(double[:] x):
+    """
+    >>> loop_over_shape(make_view(4))
+    6.0
+    >>> loop_over_shape(make_view(1)[1:])
+    0.0
+    """
+    cdef double total = 0
+    cdef Py_ssize_t i
+    for i in range(x.shape[0]):
+        total += x[i]
+    return total
+
+
+def loop_over_len(double[:] x):
+    """
+    >>> loop_over_len(make_view(4))
+    6.0
+    """
+    cdef double total = 0
+    cdef int i
+    for i in range(len(x)):
+        total += x[i]
+    return total
+
+
+def stencil(double[:] x):
+    """
+    >>> stencil(make_view(5))
+    [0.0, 2.0, 4.0, 6.0, 0.0]
+    """
+    cdef double[:] result = make_view(x.shape[0])
+    result[:] = 0
+    cdef Py_ssize_t i
+    for i in range(1, x.shape[0] - 1):
+        result[i] = x[i - 1] + x[i + 1]
+    return list(result)
+
+
+def stencil_out_of_bounds(double[:] x):
+    """
+    >>> stencil_out_of_bounds(make_view(5))
+    Traceback (most recent call last):
+    IndexError: Out of bounds on buffer access (axis 0)
+    """
+    cdef double total = 0
+    cdef Py_ssize_t i
+    for i in range(1, x.shape[0] - 1):
+        total += x[i + 2]
+    return total
+
+
+def negative_start(double[:] x):
+    """
+    >>> negative_start(make_view(5))
+    [3.0, 4.0, 0.0, 1.0]
+    """
+    result = []
+    cdef Py_ssize_t i
+    for i in range(-2, x.shape[0] - 3):
+        result.append(x[i])
+    return result
+
+
+def reversed_loop(double[:] x):
+    """
+    >>> reversed_loop(make_view(3))
+    [2.0, 1.0, 0.0]
+    """
+    result = []
+    cdef Py_ssize_t i
+    for i in range(x.shape[0] - 1, -1, -1):
+        result.append(x[i])
+    return result
+
+
+def reversed_loop_past_zero(double[:] x):
+    """
+    >>> reversed_loop_past_zero(make_view(3))
+    [2.0, 1.0, 0.0, 2.0]
+    """
+    result = []
+    cdef Py_ssize_t i
+    for i in range(x.shape[0] - 1, -2, -1):
+        result.append(x[i])
+    return result
+
+
+def other_view(double[:] x, double[:] y):
+    """
+    >>> other_view(make_view(3), make_view(3))
+    3.0
+    >>> other_view(make_view(3), make_view(2))
+    Traceback (most recent call last):
+    IndexError: Out of bounds on buffer access (axis 0)
+    """
+    cdef double total = 0
+    cdef Py_ssize_t i
+    for i in range(x.shape[0]):
+        total += y[i]
+    return total
+
+
+def other_dimension(double[:, :] x):
+    """
+    >>> other_dimension(make_2d(2, 2))
+    1.0
+    >>> other_dimension(make_2d(3, 2))
+    Traceback (most recent call last):
+    IndexError: Out of bounds on buffer access (axis 1)
+    """
+    cdef double total = 0
+    cdef Py_ssize_t i
+    for i in range(x.shape[0]):
+        total += x[0, i]
+    return total
+
+
+def reassigned_view(double[:] x):
+    """
+    >>> reassigned_view(make_view(3))
+    Traceback (most recent call last):
+    IndexError: Out of bounds on buffer access (axis 0)
+    """
+    cdef double total = 0
+    cdef Py_ssize_t i
+    for i in range(x.shape[0]):
+        total += x[i]
+        x = x[1:]
+    return total
+
+
+def reassigned_index(double[:] x):
+    """
+    >>> reassigned_index(make_view(3))
+    Traceback (most recent call last):
+    IndexError: Out of bounds on buffer access (axis 0)
+    """
+    cdef double total = 0
+    cdef Py_ssize_t i
+    for i in range(x.shape[0]):
+        i += 1
+        total += x[i]
+    return total
+
+
+def compared_index(double[:] x, Py_ssize_t i):
+    """
+    >>> compared_index(make_view(3), 2)
+    2.0
+    >>> compared_index(make_view(3), 3)
+    -1.0
+    >>> compared_index(make_view(3), -1)
+    -1.0
+    """
+    if 0 <= i < x.shape[0]:
+        return x[i]
+    return -1.0
+
+
+def compared_upper_bound_only(double[:] x, Py_ssize_t i):
+    """
+    >>> compared_upper_bound_only(make_view(3), 1)
+    1.0
+    >>> compared_upper_bound_only(make_view(3), -1)
+    2.0
+    >>> compared_upper_bound_only(make_view(3), -4)
+    Traceback (most recent call last):
+    IndexError: Out of bounds on buffer access (axis 0)
+    """
+    if i < x.shape[0]:
+        return x[i]
+    return -1.0
+
+
+def narrow_loop_variable(double[:] x):
+    """
+    >>> narrow_loop_variable(make_view(4))
+    6.0
+    """
+    cdef double total = 0
+    cdef int i
+    for i in range(x.shape[0]):
+        total += x[i]
+    return total
+
+
+def parallel_loop(double[:] x):
+    """
+    >>> parallel_loop(make_view(100))
+    4950.0
+    """
+    cdef double total = 0
+    cdef Py_ssize_t i
+    for i in prange(x.shape[0], nogil=True):
+        total += x[i]
+    return total
+
+
+def matrix_sum(double[:, :] m):
+    """
+    >>> matrix_sum(make_2d(3, 4))
+    66.0
+    """
+    cdef double total = 0
+    cdef Py_ssize_t i, j
+    for i in range(m.shape[0]):
+        for j in range(m.shape[1]):
+            total += m[i, j]
+    return total
@@ -0,0 +1,186 @@
+# mode: run
+# tag: memoryview
+
+"""
+With the 'noalias' directive, for-loops load the data pointers and strides
+of the memoryviews that they index into local variables before the loop,
+and the 'simd' directive adds vectorisation hints to innermost loops.
+These tests make sure that the loops still see all changes they must see.
+"""
+
+cimport cython
+from cython.view cimport array
+
+
+def make_view(int n, double start=0):
+    cdef double[:] view = array(shape=(n,), itemsize=sizeof(double), format='d')
+    cdef int i
+    for i in range(n):
+        view[i] = start + i
+    return view
+
+
+def make_2d(int n, int m, mode='c'):
+    cdef double[:, :] view = array(shape=(n, m), itemsize=sizeof(double), format='d', mode=mode)
+    cdef int i, j
+    for i in range(n):
+        for j in range(m):
+            view[i, j] = i * m + j
+    return view
+
+
+@cython.noalias(True)
+@cython.simd(True)
+def axpy(double a, double[:] x, double[:] y):
+    """
+    >>> x = make_view(5); y = make_view(5, 10)
+    >>> axpy(2, x, y)
+    >>> list(y)
+    [10.0, 13.0, 16.0, 19.0, 22.0]
+    >>> axpy(1, x[1::2], y[1::2])
+    >>> list(y)
+    [10.0, 14.0, 16.0, 22.0, 22.0]
+    """
+    cdef Py_ssize_t i
+    for i in range(x.shape[0]):
+        y[i] = a * x[i] + y[i]
+
+
+@cython.noalias(True)
+@cython.simd(True)
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def matrix_vector(double[:, :] m, double[::1] v):
+    """
+    >>> list(matrix_vector(make_2d(2, 3), make_view(3)))
+    [5.0, 14.0]
+    >>> list(matrix_vector(make_2d(2, 3, 'fortran'), make_view(3)))
+    [5.0, 14.0]
+    >>> list(matrix_vector(make_2d(3, 3)[::2, ::-1], make_view(3)))
+    [1.0, 19.0]
+    """
+    cdef double[::1] result = array(shape=(m.shape[0],), itemsize=sizeof(double), format='d')
+    cdef Py_ssize_t i, j
+    for i in range(m.shape[0]):
+        result[i] = 0
+        for j in range(m.shape[1]):
+            result[i] += m[i, j] * v[j]
+    return result
+
+
+@cython.noalias(True)
+def reassigned_in_loop(double[:] x):
+    """
+    >>> reassigned_in_loop(make_view(6))
+    [0.0, 1.0, 3.0]
+    """
+    result = []
+    cdef int i
+    for i in range(3):
+        result.append(x[i])
+        x = x[i:]
+    return result
+
+
+@cython.noalias(True)
+def rebound_in_inner_loop(double[:] x, double[:] y):
+    """
+    >>> rebound_in_inner_loop(make_view(3), make_view(3, 10))
+    [0.0, 10.0, 11.0, 1.0, 11.0, 12.0]
+    """
+    result = []
+    cdef double[:] current
+    cdef int i, j
+    for i in range(2):
+        current = x
+        for j in range(3):
+            result.append(current[i])
+            current = y[j:]
+    return result
+
+
+cdef double first(double[:] values) nogil:
+    return values[0]
+
+
+@cython.noalias(True)
+def passed_to_function(double[:] x):
+    """
+    >>> passed_to_function(make_view(3, 1))
+    (6.0, 3.0)
+    """
+    cdef double total = 0, firsts = 0
+    cdef int i
+    for i in range(x.shape[0]):
+        total += x[i]
+        firsts += first(x)
+    return total, firsts
+
+
+@cython.noalias(True)
+@cython.simd(True)
+def loop_control(double[:] x):
+    """
+    >>> loop_control(make_view(10))
+    (12.0, 'else')
+    >>> loop_control(make_view(3, -10))
+    (-10.0, 'break')
+    """
+    cdef double total = 0
+    cdef int i
+    for i in range(x.shape[0]):
+        if x[i] < 0:
+            total = x[i]
+            break
+        if i % 3:
+            continue
+        total += x[-i]
+    else:
+        return total, 'else'
+    return total, 'break'
+
+
+@cython.noalias(True)
+def index_error(double[:] x, int n):
+    """
+    >>> index_error(make_view(3), 3)
+    3.0
+    >>> index_error(make_view(3), 4)
+    Traceback (most recent call last):
+    IndexError: Out of bounds on buffer access (axis 0)
+    """
+    cdef double total = 0
+    cdef int i
+    for i in range(n):
+        total += x[i]
+    return total
+
+
+@cython.noalias(True)
+def generator(double[:] x):
+    """
+    >>> list(generator(make_view(3)))
+    [0.0, 1.0, 2.0]
+    """
+    cdef int i
+    for i in range(x.shape[0]):
+        yield x[i]
+
+
+@cython.noalias(True)
+@cython.simd(True)
+cdef double total(double[:] values) nogil:
+    cdef double result = 0
+    cdef Py_ssize_t i
+    for i in range(values.shape[0]):
+        result += values[i]
+    return result
+
+
+def cdef_function():
+    """
+    >>> cdef_function()
+    (10.0, 9.0)
+    """
+    cdef double[:] view = make_view(5)
+    return total(view), total(view[2:])
@@ -0,0 +1,238 @@
+# mode: run
+# tag: memoryview
+
+"""
+For-loops read the C attributes of 'self' and the data pointers and strides
+of the memoryviews that they index only once before the loop, if the loop
+body cannot change them.  These tests make sure that the loops still see
+all changes they must see.
+"""
+
+cimport cython
+from cython.view cimport array
+
+
+def make_view(int n, double start=0):
+    cdef double[:] view = array(shape=(n,), itemsize=sizeof(double), format='d')
+    cdef int i
+    for i in range(n):
+        view[i] = start + i
+    return view
+
+
+cdef class Scaler:
+    cdef double scale
+    cdef int count
+    cdef double[:] weights
+    cdef double *target
+
+    def __init__(self, double scale, weights=None):
+        self.scale = scale
+        if weights is not None:
+            self.weights = weights
+
+    @cython.test_assert_path_exists("//ForFromStatNode/StatListNode//ResultRefNode")
+    def scaled(self, double[:] values):
+        """
+        >>> list(Scaler(2).scaled(make_view(3)))
+        [0.0, 2.0, 4.0]
+        """
+        cdef double[:] result = make_view(values.shape[0])
+        cdef Py_ssize_t i
+        for i in range(values.shape[0]):
+            result[i] = self.scale * values[i]
+        return result
+
+    @cython.test_assert_path_exists("//ForFromStatNode/StatListNode//ResultRefNode")
+    def weighted_sum(self, double[:] values):
+        """
+        >>> Scaler(2, make_view(3, 1)).weighted_sum(make_view(3))
+        16.0
+        """
+        cdef double result = 0
+        cdef Py_ssize_t i
+        for i in range(values.shape[0]):
+            result += self.scale * self.weights[i] * values[i]
+        return result
+
+    @cython.test_fail_if_path_exists("//ForFromStatNode/StatListNode//ResultRefNode")
+    def assigned_in_loop(self, int n):
+        """
+        >>> Scaler(1).assigned_in_loop(4)
+        [1.0, 2.0, 4.0, 8.0]
+        """
+        result = []
+        cdef int i
+        for i in range(n):
+            result.append(self.scale)
+            self.scale *= 2
+        return result
+
+    @cython.test_fail_if_path_exists("//ForFromStatNode/StatListNode//ResultRefNode")
+    cdef double nogil_assigned_in_loop(self, int n) nogil:
+        cdef double result = 0
+        cdef int i
+        for i in range(n):
+            result += self.scale
+            self.scale += 1
+        return result
+
+    def call_nogil_assigned_in_loop(self, int n):
+        """
+        >>> Scaler(1).call_nogil_assigned_in_loop(3)
+        6.0
+        """
+        return self.nogil_assigned_in_loop(n)
+
+    cdef void double_scale(self) nogil:
+        self.scale *= 2
+
+    @cython.test_fail_if_path_exists("//ForFromStatNode/StatListNode//ResultRefNode")
+    def changed_by_call(self, int n):
+        """
+        >>> Scaler(1).changed_by_call(3)
+        7.0
+        """
+        cdef double result = 0
+        cdef int i
+        with nogil:
+            for i in range(n):
+                result += self.scale
+                self.double_scale()
+        return result
+
+    @cython.test_fail_if_path_exists("//ForFromStatNode/StatListNode//ResultRefNode")
+    def changed_through_other_reference(self, Scaler other, int n):
+        """
+        >>> scaler = Scaler(1)
+        >>> scaler.changed_through_other_reference(scaler, 3)
+        6.0
+        """
+        cdef double result = 0
+        cdef int i
+        for i in range(n):
+            result += self.scale
+            other.scale += 1
+        return result
+
+    @cython.test_assert_path_exists("//ForFromStatNode//AttributeNode[@attribute = 'scale']")
+    def changed_through_pointer(self, int n):
+        """
+        >>> Scaler(1).changed_through_pointer(3)
+        6.0
+        """
+        cdef double result = 0
+        cdef double *scale = &self.scale
+        cdef int i
+        for i in range(n):
+            result += self.scale
+            scale[0] += 1
+        return result
+
+    @cython.test_assert_path_exists("//ForFromStatNode/StatListNode//ResultRefNode")
+    def write_through_pointer_attribute(self, int n):
+        """
+        >>> Scaler(3).write_through_pointer_attribute(3)
+        [0.0, 3.0, 6.0]
+        """
+        cdef double[:] result = make_view(n)
+        self.target = &result[0]
+        cdef int i
+        for i in range(n):
+            self.target[i] = self.scale * i
+        return list(result)
+
+    @cython.test_fail_if_path_exists("//ForFromStatNode/StatListNode//ResultRefNode")
+    def changed_by_python_code(self, int n):
+        """
+        >>> Scaler(1).changed_by_python_code(3)
+        6.0
+        """
+        cdef double result = 0
+        cdef int i
+        for i in range(n):
+            result += self.scale
+            getattr(self, 'increment')()
+        return result
+
+    def increment(self):
+        self.scale += 1
+
+    def rebound_memview_attribute(self, int n):
+        """
+        >>> Scaler(1, make_view(6)).rebound_memview_attribute(3)
+        [0.0, 1.0, 3.0]
+        """
+        result = []
+        cdef int i
+        for i in range(n):
+            result.append(self.weights[i])
+            self.weights = self.weights[i:]
+        return result
+
+    def count_in_loop(self, int n):
+        """
+        >>> Scaler(1).count_in_loop(5)
+        (5, 20)
+        """
+        cdef int i, total = 0
+        self.count = 0
+        for i in range(n):
+            total += self.count + i
+            self.count += 1
+        return self.count, total
+
+    def nested_loops(self, double[:] values):
+        """
+        >>> Scaler(2, make_view(3, 1)).nested_loops(make_view(2))
+        12.0
+        """
+        cdef double result = 0
+        cdef Py_ssize_t i, j
+        for i in range(values.shape[0]):
+            for j in range(self.weights.shape[0]):
+                result += self.scale * self.weights[j] * values[i]
+        return result
+
+    def loop_bound_changes_scale(self, int n):
+        """
+        >>> Scaler(1).loop_bound_changes_scale(3)
+        6.0
+        """
+        cdef double result = 0
+        cdef int i
+        for i in range(self.set_scale_and_return(2, n)):
+            result += self.scale
+        return result
+
+    cdef int set_scale_and_return(self, double scale, int n):
+        self.scale = scale
+        return n
+
+
+def reassigned_view(double[:] x):
+    """
+    >>> reassigned_view(make_view(6))
+    [0.0, 1.0, 3.0]
+    """
+    result = []
+    cdef int i
+    for i in range(3):
+        result.append(x[i])
+        x = x[i:]
+    return result
+
+
+def other_view_uses(double[:] x):
+    """
+    >>> other_view_uses(make_view(4, 1))
+    (10.0, 4.0)
+    """
+    cdef double total = 0, last = 0
+    cdef double[:] copy
+    cdef int i
+    for i in range(x.shape[0]):
+        total += x[i]
+        copy = x
+        last = copy[i]
+    return total, last
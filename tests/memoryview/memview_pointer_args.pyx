@@ -0,0 +1,146 @@
+# mode: run
+# tag: memoryview
+
+"""
+Memoryview slice arguments of module internal cdef functions are passed
+by pointer when the function is only called directly and does not
+reassign the argument.  These tests make sure that all other cases keep
+passing the slice by value and that the semantics do not change.
+"""
+
+from cython.view cimport array
+from cython.parallel cimport prange
+
+
+cdef array make_array(int n):
+    cdef array arr = array(shape=(n,), itemsize=sizeof(double), format='d')
+    cdef double[:] view = arr
+    cdef int i
+    for i in range(n):
+        view[i] = i
+    return arr
+
+
+cdef double total(double[:] values) nogil:
+    cdef double result = 0
+    cdef Py_ssize_t i
+    for i in range(values.shape[0]):
+        result += values[i]
+    return result
+
+
+cdef double first(double[:] values) nogil:
+    return values[0] if values is not None else -1
+
+
+cdef double[:] tail(double[:] values):
+    return values[1:]
+
+
+cdef double[:] identity(double[:] values):
+    return values
+
+
+cdef double[:] reassigned(double[:] values):
+    values = values[1:]
+    return values
+
+
+cdef double total_2d(double[:, :] values, double[:] weights) nogil:
+    cdef double result = 0
+    cdef Py_ssize_t i, j
+    for i in range(values.shape[0]):
+        for j in range(values.shape[1]):
+            result += values[i, j] * weights[j]
+    return result
+
+
+cdef double[:] global_view = make_array(3)
+
+
+cdef class Holder:
+    cdef double[:] view
+
+
+def direct_calls():
+    """
+    >>> direct_calls()
+    (10.0, 0.0, -1.0, 10.0, 10.0, 3.0, 1.0, 1.0)
+    """
+    cdef double[:] view = make_array(5)
+    holder = Holder()
+    holder.view = view
+    return (total(view), first(view), first(None), total(holder.view), total(tail(view)),
+            total(global_view), first(view[1:]), first(reassigned(view)))
+
+
+def returned_views():
+    """
+    >>> returned_views()
+    (True, 10.0, 4)
+    """
+    arr = make_array(5)
+    cdef double[:] view = arr
+    cdef double[:] same = identity(view)
+    return same.base is arr, total(same), tail(view).shape[0]
+
+
+def nogil_loop(int n):
+    """
+    >>> nogil_loop(100)
+    495000.0
+    """
+    cdef double[:] view = make_array(n)
+    cdef double result = 0
+    cdef int i
+    for i in prange(n, nogil=True):
+        result += total(view)
+    return result
+
+
+def two_dimensional():
+    """
+    >>> two_dimensional()
+    5.0
+    """
+    cdef double[:, :] view = make_2d()
+    return total_2d(view[:, :2], make_array(2))
+
+
+cdef double[:, :] make_2d():
+    cdef array arr = array(shape=(2, 3), itemsize=sizeof(double), format='d')
+    cdef double[:, :] view = arr
+    cdef int i, j
+    for i in range(2):
+        for j in range(3):
+            view[i, j] = i * 3 + j
+    return view
+
+
+cdef double by_function_pointer(double[:] values):
+    return values[1]
+
+
+def function_pointer():
+    """
+    >>> function_pointer()
+    (1.0, 1.0)
+    """
+    cdef double (*func)(double[:])
+    func = by_function_pointer
+    cdef double[:] view = make_array(3)
+    return func(view), by_function_pointer(view)
+
+
+cdef double converted_to_python(double[:] values):
+    return values[2]
+
+
+def python_conversion():
+    """
+    >>> python_conversion()
+    2.0
+    """
+    func = converted_to_python
+    return func(make_array(3))
+
@@ -0,0 +1,130 @@
+# mode: run
+# tag: cdivision
+
+"""
+Integer divisions and modulo operations whose operands are known to be
+non-negative are compiled to plain C divisions, because C and Python
+agree on their results.  These tests make sure that all other operations
+keep the Python semantics.
+"""
+
+cimport cython
+from cython.view cimport array
+
+
+@cython.test_assert_path_exists(
+    "//DivNode[@cdivision = True]",
+    "//ModNode[@cdivision = True]")
+def loop_variable(int n, int k):
+    """
+    >>> loop_variable(7, 3)
+    [(0, 0), (0, 1), (0, 2), (1, 0), (1, 1), (1, 2), (2, 0)]
+    >>> loop_variable(2, 0)
+    Traceback (most recent call last):
+    ZeroDivisionError: integer division or modulo by zero
+    >>> loop_variable(3, -2)
+    [(0, 0), (-1, -1), (-1, 0)]
+    """
+    result = []
+    cdef int i
+    for i in range(n):
+        if k >= 0:
+            result.append((i // k, i % k))
+        else:
+            result.append((i // k, i % k))
+    return result
+
+
+@cython.test_assert_path_exists("//ModNode[@cdivision = False]")
+def negative_divisor(int n, int k):
+    """
+    >>> negative_divisor(3, -2)
+    [0, -1, 0]
+    """
+    result = []
+    cdef int i
+    for i in range(n):
+        result.append(i % k)
+    return result
+
+
+@cython.test_assert_path_exists("//ModNode[@cdivision = False]")
+def negative_dividend(int k):
+    """
+    >>> negative_dividend(3)
+    [1, 2, 0, 1, 2]
+    """
+    result = []
+    cdef int i
+    if k > 0:
+        for i in range(-5, 0):
+            result.append(i % k)
+    return result
+
+
+@cython.test_assert_path_exists("//ModNode[@cdivision = True]")
+def unsigned_dividend(unsigned int h, long k):
+    """
+    >>> unsigned_dividend(7, 3)
+    1
+    """
+    if k > 0:
+        return h % k
+    return -1
+
+
+@cython.test_assert_path_exists(
+    "//ModNode[@cdivision = True]",
+    "//DivNode[@cdivision = True]")
+def length(list items, Py_ssize_t k):
+    """
+    >>> length([1, 2, 3, 4, 5], 2)
+    (2, 1)
+    >>> length([1, 2, 3, 4, 5], 0)
+    Traceback (most recent call last):
+    ZeroDivisionError: integer division or modulo by zero
+    >>> length([1, 2, 3, 4, 5], -2)
+    (-3, -1)
+    """
+    if k >= 0:
+        return len(items) // k, len(items) % k
+    return len(items) // k, len(items) % k
+
+
+@cython.test_assert_path_exists(
+    "//ModNode[@cdivision = True]",
+    "//ModNode[@zerodivision_check = False]")
+def compared_operands(Py_ssize_t a, Py_ssize_t b):
+    """
+    >>> compared_operands(7, 3)
+    1
+    >>> compared_operands(-7, 3)
+    2
+    >>> compared_operands(7, -3)
+    -2
+    """
+    if a >= 0 and b > 0:
+        return a % b
+    return a % b
+
+
+def make_view(int n):
+    cdef double[:] view = array(shape=(n,), itemsize=sizeof(double), format='d')
+    cdef int i
+    for i in range(n):
+        view[i] = i
+    return view
+
+
+@cython.test_assert_path_exists("//ModNode[@cdivision = False]")
+def bucket(double[:] buckets, Py_ssize_t h):
+    """
+    >>> bucket(make_view(4), 6)
+    2.0
+    >>> bucket(make_view(4), -3)
+    1.0
+    >>> bucket(make_view(1)[1:], 1)
+    Traceback (most recent call last):
+    ZeroDivisionError: integer division or modulo by zero
+    """
+    return buckets[h % buckets.shape[0]]
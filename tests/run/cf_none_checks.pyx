@@ -0,0 +1,230 @@
+# mode: run
+# tag: nonecheck
+
+"""
+None checks and type tests that always follow an earlier check of the
+same variable are left out.  These tests make sure that all other checks
+are still there.
+"""
+
+cimport cython
+
+
+cdef class Node:
+    cdef public int value
+    cdef public Node next
+
+    def __init__(self, value, Node next=None):
+        self.value = value
+        self.next = next
+
+
+@cython.nonecheck(True)
+@cython.test_assert_path_exists("//AttributeNode[@attribute = 'value']/NoneCheckNode")
+@cython.test_fail_if_path_exists("//AttributeNode[@attribute = 'next']/NoneCheckNode")
+def dereference_twice(Node node):
+    """
+    >>> dereference_twice(Node(1))
+    (1, None)
+    >>> dereference_twice(None)
+    Traceback (most recent call last):
+    AttributeError: 'NoneType' object has no attribute 'value'
+    """
+    return node.value, node.next
+
+
+@cython.nonecheck(True)
+@cython.test_fail_if_path_exists("//NoneCheckNode")
+def after_is_not_none(Node node):
+    """
+    >>> after_is_not_none(Node(1))
+    (1, None)
+    >>> after_is_not_none(None)
+    """
+    if node is not None:
+        return node.value, node.next
+
+
+@cython.nonecheck(True)
+@cython.test_fail_if_path_exists("//NoneCheckNode")
+def after_is_none(Node node):
+    """
+    >>> after_is_none(Node(1))
+    1
+    >>> after_is_none(None)
+    -1
+    """
+    if node is None:
+        return -1
+    return node.value
+
+
+@cython.nonecheck(True)
+@cython.test_fail_if_path_exists("//NoneCheckNode")
+def in_else_clause(Node node):
+    """
+    >>> in_else_clause(Node(1))
+    1
+    >>> in_else_clause(None)
+    -1
+    """
+    if node is None:
+        value = -1
+    elif not isinstance(node, Node):
+        value = -2
+    else:
+        value = node.value
+    return value
+
+
+@cython.nonecheck(True)
+@cython.test_fail_if_path_exists("//NoneCheckNode")
+def linked_list_sum(Node node):
+    """
+    >>> linked_list_sum(Node(1, Node(2, Node(3))))
+    6
+    >>> linked_list_sum(None)
+    0
+    """
+    cdef int total = 0
+    while node is not None:
+        total += node.value
+        node = node.next
+    return total
+
+
+@cython.nonecheck(True)
+@cython.test_fail_if_path_exists("//NoneCheckNode")
+def in_expressions(Node node):
+    """
+    >>> in_expressions(Node(1))
+    (1, 1, 1)
+    >>> in_expressions(Node(0))
+    (0, 0, 1)
+    >>> in_expressions(None)
+    (False, -1, -1)
+    """
+    return (node is not None and node.value,
+            node.value if node is not None else -1,
+            -1 if node is None or node.value < 0 else 1)
+
+
+@cython.nonecheck(True)
+@cython.test_assert_path_exists("//AttributeNode[@attribute = 'next']/NoneCheckNode")
+def conditional_dereference(Node node, bint flag):
+    """
+    >>> conditional_dereference(Node(1), True)
+    (1, None)
+    >>> conditional_dereference(None, False)
+    Traceback (most recent call last):
+    AttributeError: 'NoneType' object has no attribute 'next'
+    """
+    value = node.value if flag else 0
+    return value, node.next
+
+
+@cython.nonecheck(True)
+@cython.test_assert_path_exists("//AttributeNode[@attribute = 'next']/NoneCheckNode")
+def dereference_in_cascade(Node node, int x):
+    """
+    >>> dereference_in_cascade(Node(1), 0)
+    True
+    >>> dereference_in_cascade(None, 0)
+    Traceback (most recent call last):
+    AttributeError: 'NoneType' object has no attribute 'next'
+    """
+    if 0 < x < node.value:
+        return False
+    return node.next is None
+
+
+@cython.nonecheck(True)
+@cython.test_assert_path_exists("//AttributeNode[@attribute = 'next']/NoneCheckNode")
+def reassigned(Node node, Node other):
+    """
+    >>> reassigned(Node(1), Node(2))
+    (1, None)
+    >>> reassigned(Node(1), None)
+    Traceback (most recent call last):
+    AttributeError: 'NoneType' object has no attribute 'next'
+    """
+    value = node.value
+    node = other
+    return value, node.next
+
+
+@cython.nonecheck(True)
+@cython.test_assert_path_exists("//AttributeNode[@attribute = 'next']/NoneCheckNode")
+def dereference_in_try(Node node):
+    """
+    >>> dereference_in_try(Node(1))
+    (1, None)
+    >>> dereference_in_try(None)
+    Traceback (most recent call last):
+    AttributeError: 'NoneType' object has no attribute 'next'
+    """
+    try:
+        value = node.value
+    except AttributeError:
+        value = -1
+    return value, node.next
+
+
+@cython.nonecheck(True)
+@cython.test_assert_path_exists("//AttributeNode[@attribute = 'next']/NoneCheckNode")
+def dereference_in_assert(Node node):
+    """
+    >>> dereference_in_assert(Node(1))
+    """
+    assert node.value
+    return node.next
+
+
+@cython.nonecheck(True)
+@cython.test_fail_if_path_exists("//NoneCheckNode")
+@cython.test_assert_path_exists("//PyTypeTestNode[@arg_passed_test = True]")
+def after_isinstance(obj):
+    """
+    >>> after_isinstance(Node(1))
+    1
+    >>> after_isinstance(1)
+    -1
+    >>> after_isinstance(None)
+    -1
+    """
+    cdef Node node
+    if isinstance(obj, Node):
+        node = obj
+        return node.value
+    return -1
+
+
+@cython.test_assert_path_exists(
+    "//PyTypeTestNode[@arg_passed_test = False]",
+    "//PyTypeTestNode[@arg_passed_test = True]")
+def assigned_twice(obj):
+    """
+    >>> assigned_twice(Node(1))
+    True
+    >>> assigned_twice(None)
+    True
+    >>> assigned_twice(1)
+    Traceback (most recent call last):
+    TypeError: Cannot convert int to cf_none_checks.Node
+    """
+    cdef Node first = obj
+    cdef Node second = obj
+    return first is second
+
+
+def list_methods(list l):
+    """
+    >>> list_methods([])
+    [1, 2]
+    >>> list_methods(None)
+    Traceback (most recent call last):
+    AttributeError: 'NoneType' object has no attribute 'append'
+    """
+    l.append(1)
+    l.append(2)
+    return l
@@ -0,0 +1,167 @@
+# mode: run
+# tag: exttype, vectorcall, METH_FASTCALL
+
+"""
+Extension types are instantiated through their tp_vectorcall function
+and their instances are called through vectorcall if possible.  These
+tests make sure that the semantics do not change.
+"""
+
+
+cdef class Point:
+    """
+    >>> p = Point(1, 2)
+    >>> p.x, p.y
+    (1.0, 2.0)
+    >>> p = Point(1, y=3)
+    >>> p.x, p.y
+    (1.0, 3.0)
+    >>> p = Point(*[4], **{'y': 5})
+    >>> p.x, p.y
+    (4.0, 5.0)
+    >>> Point()  # doctest: +ELLIPSIS
+    Traceback (most recent call last):
+    TypeError: __init__() takes at least 1 positional argument (0 given)
+    >>> Point(1, 2, 3)  # doctest: +ELLIPSIS
+    Traceback (most recent call last):
+    TypeError: __init__() takes at most 2 positional arguments (3 given)
+    >>> Point(1, z=3)  # doctest: +ELLIPSIS
+    Traceback (most recent call last):
+    TypeError: __init__() got an unexpected keyword argument 'z'
+    """
+    cdef public double x, y
+
+    def __init__(self, x, y=0.0):
+        self.x = x
+        self.y = y
+
+
+cdef class Point3(Point):
+    """
+    >>> p = Point3(1, z=5)
+    >>> p.x, p.y, p.z
+    (1.0, 0.0, 5.0)
+    """
+    cdef public double z
+
+    def __init__(self, x, y=0.0, *, z=0.0):
+        Point.__init__(self, x, y)
+        self.z = z
+
+
+cdef class InheritedInit(Point):
+    """
+    >>> p = InheritedInit(7)
+    >>> type(p) is InheritedInit, p.x
+    (True, 7.0)
+    """
+
+
+class PySubclass(Point):
+    """
+    >>> p = PySubclass(3)
+    >>> type(p) is PySubclass, p.x, p.y
+    (True, 3.0, 3.0)
+    """
+    def __init__(self, value):
+        Point.__init__(self, value, value)
+
+
+cdef class NoInit:
+    """
+    >>> type(NoInit()) is NoInit
+    True
+    """
+
+
+cdef class CinitArgs:
+    """
+    >>> CinitArgs(1, 2).args
+    (1, 2)
+    """
+    cdef public tuple args
+
+    def __cinit__(self, *args):
+        self.args = args
+
+    def __init__(self, *args):
+        pass
+
+
+cdef class Adder:
+    """
+    >>> add = Adder(10)
+    >>> add(1), add(1, 2), add(1, b=3), add(*[1, 2]), add(**{'a': 1, 'b': 5})
+    (11, 13, 14, 13, 16)
+    >>> add()  # doctest: +ELLIPSIS
+    Traceback (most recent call last):
+    TypeError: __call__() takes at least 1 positional argument (0 given)
+    """
+    cdef int base
+
+    def __cinit__(self):
+        self.base = 1
+
+    def __init__(self, base=1):
+        self.base = base
+
+    def __call__(self, a, b=0):
+        return self.base + a + b
+
+
+cdef class Multiplier(Adder):
+    """
+    >>> Multiplier(2)(3), Multiplier(2)(3, 4)
+    (6, 24)
+    """
+    def __call__(self, a, b=1):
+        return self.base * a * b
+
+
+cdef class InheritedCall(Adder):
+    """
+    >>> InheritedCall(5)(1)
+    6
+    """
+    cdef object extra
+
+
+cdef class ArgsTupleCall(Adder):
+    """
+    >>> ArgsTupleCall()(1, 2)
+    (1, 2)
+    """
+    def __call__(self, *args):
+        return args
+
+
+class PyOverride(Adder):
+    """
+    >>> PyOverride()(1)
+    'py'
+    """
+    def __call__(self, a):
+        return 'py'
+
+
+class PyInherit(Adder):
+    """
+    >>> PyInherit(2)(1)
+    3
+    """
+
+
+def has_vectorcall_flag(tp):
+    """
+    >>> has_vectorcall_flag(Point)
+    False
+    >>> import sys
+    >>> expected = sys.version_info >= (3, 9) and not hasattr(sys, 'pypy_version_info')
+    >>> has_vectorcall_flag(Adder) == expected
+    True
+    >>> has_vectorcall_flag(Multiplier) == expected
+    True
+    >>> has_vectorcall_flag(ArgsTupleCall)
+    False
+    """
+    return bool(tp.__flags__ & (1 << 11))  # Py_TPFLAGS_HAVE_VECTORCALL
@@ -0,0 +1,93 @@
+# mode: run
+# tag: fused
+
+"""
+The dispatcher of fused def functions caches the selected specialisation
+by argument type.  These tests make sure that the cache never returns
+a stale or wrong specialisation.
+"""
+
+cimport cython
+from cython cimport floating
+
+
+ctypedef fused number:
+    int
+    double
+    object
+
+
+cdef class Base:
+    pass
+
+cdef class Derived(Base):
+    pass
+
+ctypedef fused ext_or_number:
+    Base
+    double
+
+
+def typeof_args(number x, number y=2):
+    """
+    >>> typeof_args(1), typeof_args(1.0), typeof_args(1), typeof_args('x')
+    ('int', 'double', 'int', 'Python object')
+    >>> typeof_args(True), typeof_args(1.5, 2.5), typeof_args(y=3, x=2.0)
+    ('int', 'double', 'double')
+    >>> class MyFloat(float): pass
+    >>> typeof_args(MyFloat(1)), typeof_args(1)
+    ('double', 'int')
+    """
+    return cython.typeof(x)
+
+
+def many_types(number x):
+    """
+    More argument types than cache entries:
+
+    >>> values = [1, 1.0, 'x', [], (), None, 2, 2.0, b'', {}]
+    >>> for _ in range(3):
+    ...     print(' '.join([many_types(v).split()[-1] for v in values]))
+    int double object object object object int double object object
+    int double object object object object int double object object
+    int double object object object object int double object object
+    """
+    return cython.typeof(x)
+
+
+def ext_types(ext_or_number x):
+    """
+    >>> ext_types(Base()), ext_types(Derived()), ext_types(1.0), ext_types(Derived())
+    ('Base', 'Base', 'double', 'Base')
+    >>> ext_types('x')
+    Traceback (most recent call last):
+    TypeError: No matching signature found
+    >>> ext_types('x')
+    Traceback (most recent call last):
+    TypeError: No matching signature found
+    """
+    return cython.typeof(x)
+
+
+def buffers(floating[:] a, floating b):
+    """
+    Buffer arguments are matched by their format and stay uncached
+    unless they are NumPy arrays.
+
+    >>> from array import array
+    >>> buffers(array('d', [1.0]), 1.0), buffers(array('f', [1.0]), 1.0)
+    (('double[:]', 'double'), ('float[:]', 'float'))
+    >>> buffers(array('d', [1.0]), 1.0), buffers(array('f', [1.0]), 1.0)
+    (('double[:]', 'double'), ('float[:]', 'float'))
+    """
+    return cython.typeof(a), cython.typeof(b)
+
+
+cdef class Methods:
+    """
+    >>> m = Methods()
+    >>> m.meth(1), m.meth(1.0), Methods.meth(m, 1), m.meth(1)
+    ('int', 'double', 'int', 'int')
+    """
+    def meth(self, number x):
+        return cython.typeof(x)
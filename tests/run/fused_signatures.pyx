@@ -0,0 +1,67 @@
+# mode: run
+# tag: fused
+
+cimport cython
+
+
+@cython.fused_signatures("double|long", "float|int")
+def pair(cython.floating x, cython.integral y):
+    """
+    >>> sorted(pair.__signatures__)
+    ['double|long', 'float|int']
+    >>> pair(1.5, 2)
+    ('double', 'long')
+    >>> pair.__signatures__['float|int'](1.5, 2)
+    ('float', 'int')
+    """
+    return cython.typeof(x), cython.typeof(y)
+
+
+@cython.fused_signatures(" long ")
+cpdef cython.integral twice(cython.integral x):
+    """
+    >>> list(twice.__signatures__)
+    ['long']
+    >>> twice(21)
+    42
+    """
+    return x * 2
+
+
+@cython.fused_signatures("double")
+cdef cython.floating add(cython.floating a, cython.floating b):
+    return a + b
+
+
+def call_add(double x):
+    """
+    >>> call_add(1.5)
+    (3.0, 'double')
+    """
+    return add(x, x), cython.typeof(add(x, x))
+
+
+ctypedef char* cstring
+
+ctypedef fused number_or_string:
+    long
+    cstring
+
+
+# The char* specializations would not compile, but they are never used.
+@cython.fused_on_demand(True)
+cdef number_or_string double_it(number_or_string x):
+    return x * 2
+
+
+@cython.fused_on_demand(True)
+cdef number_or_string quadruple(number_or_string x):
+    return double_it(double_it(x))
+
+
+def call_quadruple(long x):
+    """
+    >>> call_quadruple(2)
+    8
+    """
+    return quadruple(x)
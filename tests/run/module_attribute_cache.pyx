@@ -0,0 +1,116 @@
+# mode: run
+# tag: dictversion
+
+"""
+Attribute lookups on module globals are cached by the version of the
+module dict.  These tests make sure that changes are still seen.
+"""
+
+import math
+import os.path
+from os import path as ospath
+import types
+import sys
+
+
+def sqrt(x):
+    """
+    >>> sqrt(4.0), sqrt(9.0)
+    (2.0, 3.0)
+    """
+    return math.sqrt(x)
+
+
+def get_module_value():
+    return mod.value
+
+
+mod = None
+
+
+def module_changes():
+    """
+    >>> module_changes()
+    [1, 1, 2, 3, 4]
+    """
+    global mod
+    mod = types.ModuleType("cached_mod")
+    mod.value = 1
+    results = [get_module_value(), get_module_value()]
+    mod.value = 2
+    results.append(get_module_value())
+    mod.__dict__['value'] = 3
+    results.append(get_module_value())
+    mod = types.ModuleType("other_mod")
+    mod.value = 4
+    results.append(get_module_value())
+    return results
+
+
+def missing_attribute():
+    """
+    >>> missing_attribute()
+    ['AttributeError', 5, 'AttributeError']
+    """
+    global mod
+    mod = types.ModuleType("attr_mod")
+    results = []
+    try:
+        get_module_value()
+    except AttributeError:
+        results.append('AttributeError')
+    mod.value = 5
+    results.append(get_module_value())
+    del mod.value
+    try:
+        get_module_value()
+    except AttributeError:
+        results.append('AttributeError')
+    return results
+
+
+def module_getattr():
+    """
+    >>> module_getattr() if sys.version_info >= (3, 7) else ['getattr', 6]  # PEP 562
+    ['getattr', 6]
+    """
+    global mod
+    mod = types.ModuleType("getattr_mod")
+    mod.__getattr__ = lambda name: 'getattr'
+    results = [get_module_value()]
+    mod.value = 6
+    results.append(get_module_value())
+    return results
+
+
+class NotAModule(object):
+    value = 7
+
+    def __getattr__(self, name):
+        return name
+
+
+def non_modules():
+    """
+    >>> non_modules()
+    [7, 7, 8, 'value']
+    """
+    global mod
+    mod = NotAModule
+    results = [get_module_value(), get_module_value()]
+    NotAModule.value = 8
+    results.append(get_module_value())
+    del NotAModule.value
+    mod = NotAModule()
+    results.append(get_module_value())
+    return results
+
+
+def nested_modules(a, b):
+    """
+    >>> nested_modules('a', 'b') == os.path.join('a', 'b')
+    True
+    >>> nested_modules('a', 'b') == ospath.join('a', 'b')
+    True
+    """
+    return os.path.join(a, b)
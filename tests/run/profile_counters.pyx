@@ -0,0 +1,88 @@
+# mode: run
+# tag: profile
+# cython: profile_counters=True
+
+cimport cython
+
+
+def stats(name):
+    # the function is added to the module dict at runtime
+    return globals()['__pyx_profile_stats__']()['profile_counters.' + name]
+
+
+cdef int fib(int n) nogil:
+    return n if n < 2 else fib(n - 1) + fib(n - 2)
+
+
+def call_fib(int n):
+    """
+    >>> _ = __pyx_profile_stats__(reset=True)
+    >>> call_fib(10)
+    55
+    >>> stats('fib')[0], stats('call_fib')[0]
+    (177, 1)
+    >>> stats('fib')[1] >= 0.0, stats('call_fib')[1] >= 0.0
+    (True, True)
+
+    >>> calls = __pyx_profile_stats__(reset=True)['profile_counters.fib'][0]
+    >>> calls >= 177
+    True
+    >>> stats('fib'), stats('call_fib')
+    ((0, 0.0), (0, 0.0))
+    """
+    with nogil:
+        n = fib(n)
+    return n
+
+
+cpdef int twice(int x):
+    """
+    >>> _ = __pyx_profile_stats__(reset=True)
+    >>> twice(2)
+    4
+    >>> stats('twice')[0]
+    1
+    """
+    return 2 * x
+
+
+def fail():
+    """
+    >>> _ = __pyx_profile_stats__(reset=True)
+    >>> fail()
+    Traceback (most recent call last):
+    ValueError
+    >>> stats('fail')[0]
+    1
+    """
+    raise ValueError
+
+
+cdef class C:
+    def method(self):
+        """
+        >>> _ = __pyx_profile_stats__(reset=True)
+        >>> C().method()
+        >>> C().method()
+        >>> stats('C.method')[0]
+        2
+        """
+
+
+@cython.profile_counters(False)
+def not_counted():
+    """
+    >>> not_counted()
+    >>> 'profile_counters.not_counted' in __pyx_profile_stats__()
+    False
+    """
+
+
+def generator():
+    """
+    >>> list(generator())
+    [1]
+    >>> 'profile_counters.generator' in __pyx_profile_stats__()
+    False
+    """
+    yield 1
@@ -0,0 +1,238 @@
+# mode: run
+# tag: getattr, method
+
+"""
+Attribute lookups and method calls on Python objects cache the type
+attribute per call site, keyed on the type version tag.  These tests
+make sure that the lookup semantics do not change.
+"""
+
+
+def get_attr(obj):
+    return obj.attr
+
+
+def call_meth(obj, *args):
+    return obj.meth(*args)
+
+
+def call_meth1(obj, arg):
+    return obj.meth(arg)
+
+
+class Plain(object):
+    attr = 'class'
+
+    def meth(self, arg=None):
+        return 'Plain.meth', arg
+
+
+class Slotted(object):
+    __slots__ = ('attr',)
+
+    def meth(self, arg=None):
+        return 'Slotted.meth', arg
+
+
+class WithProperty(Plain):
+    @property
+    def attr(self):
+        return 'property'
+
+
+class WithGetattr(Plain):
+    def __getattr__(self, name):
+        return 'getattr'
+
+
+class NonDataDescriptor(object):
+    def __get__(self, obj, type=None):
+        return 'descriptor'
+
+
+class WithMethods(object):
+    attr = NonDataDescriptor()
+
+    @classmethod
+    def meth(cls, arg=None):
+        return cls.__name__, arg
+
+    @staticmethod
+    def static(arg=None):
+        return 'static', arg
+
+
+cdef class ExtType:
+    cdef public object attr
+
+    def meth(self, arg=None):
+        return 'ExtType.meth', arg
+
+
+def instance_attributes():
+    """
+    >>> instance_attributes()
+    ['class', 'instance', 'class', ('Plain.meth', 1), 'shadowed', ('Plain.meth', 2)]
+    """
+    obj = Plain()
+    results = [get_attr(obj)]
+    obj.attr = 'instance'
+    results.append(get_attr(obj))
+    del obj.attr
+    results.append(get_attr(obj))
+    results.append(call_meth1(obj, 1))
+    obj.meth = lambda arg: 'shadowed'
+    results.append(call_meth1(obj, 1))
+    del obj.meth
+    results.append(call_meth1(obj, 2))
+    return results
+
+
+def type_changes():
+    """
+    >>> type_changes()
+    [('Plain.meth', 1), ('patched', 2), ('Plain.meth', 3), 'class', 'changed']
+    """
+    obj = Plain()
+    results = [call_meth1(obj, 1)]
+    original = Plain.meth
+    Plain.meth = lambda self, arg: ('patched', arg)
+    try:
+        results.append(call_meth1(obj, 2))
+    finally:
+        Plain.meth = original
+    results.append(call_meth1(obj, 3))
+    results.append(get_attr(obj))
+    Plain.attr = 'changed'
+    try:
+        results.append(get_attr(obj))
+    finally:
+        Plain.attr = 'class'
+    return results
+
+
+def subclass_changes():
+    """
+    >>> subclass_changes()
+    [('Plain.meth', 1), ('Sub.meth', 2), ('Sub.meth', 3)]
+    """
+    class Sub(Plain):
+        pass
+    obj = Sub()
+    results = [call_meth1(obj, 1)]
+    Sub.meth = lambda self, arg: ('Sub.meth', arg)
+    results.append(call_meth1(obj, 2))
+    obj.__class__ = Sub
+    results.append(call_meth1(obj, 3))
+    return results
+
+
+def class_assignment():
+    """
+    >>> class_assignment()
+    [('Plain.meth', 1), 'property', ('Plain.meth', 2), 'class']
+    """
+    obj = Plain()
+    results = [call_meth1(obj, 1)]
+    obj.__class__ = WithProperty
+    results.append(get_attr(obj))
+    results.append(call_meth1(obj, 2))
+    obj.__class__ = Plain
+    results.append(get_attr(obj))
+    return results
+
+
+def descriptors():
+    """
+    >>> descriptors()
+    ['property', 'property', 'descriptor', ('WithMethods', 1), ('static', 2)]
+    """
+    obj = WithProperty()
+    obj.__dict__['attr'] = 'instance'
+    results = [get_attr(obj), get_attr(obj)]
+    other = WithMethods()
+    results.append(get_attr(other))
+    results.append(call_meth1(other, 1))
+    results.append(other.static(2))
+    return results
+
+
+def getattr_hook():
+    """
+    >>> getattr_hook()
+    ['class', 'getattr', ('Plain.meth', None)]
+    """
+    obj = WithGetattr()
+    results = [get_attr(obj)]
+    Plain.attr = 'deleted'
+    del Plain.attr
+    try:
+        results.append(get_attr(obj))
+    finally:
+        Plain.attr = 'class'
+    results.append(call_meth(obj))
+    return results
+
+
+def slots_and_extension_types():
+    """
+    >>> slots_and_extension_types()
+    ['AttributeError', 'slot', ('Slotted.meth', 1), None, 'ext', ('ExtType.meth', 2)]
+    """
+    obj = Slotted()
+    results = []
+    try:
+        get_attr(obj)
+    except AttributeError:
+        results.append('AttributeError')
+    obj.attr = 'slot'
+    results.append(get_attr(obj))
+    results.append(call_meth1(obj, 1))
+    ext = ExtType()
+    results.append(get_attr(ext))
+    ext.attr = 'ext'
+    results.append(get_attr(ext))
+    results.append(call_meth1(ext, 2))
+    return results
+
+
+def builtin_types():
+    """
+    >>> builtin_types()
+    [['a', 'b'], 'A,B', 2.0, 1.0]
+    """
+    def split(obj, sep):
+        return obj.split(sep)
+    def upper(obj):
+        return obj.upper()
+    def imag(obj):
+        return obj.imag
+    return [split('a,b', ','), upper('a,b'), imag(1+2j), imag(1j+1)]
+
+
+def missing_attributes(obj):
+    """
+    >>> missing_attributes(Plain())
+    ["'Plain' object has no attribute 'missing'", "'Plain' object has no attribute 'missing_meth'"]
+    >>> missing_attributes(Plain())
+    ["'Plain' object has no attribute 'missing'", "'Plain' object has no attribute 'missing_meth'"]
+    """
+    results = []
+    try:
+        obj.missing
+    except AttributeError as exc:
+        results.append(str(exc))
+    try:
+        obj.missing_meth()
+    except AttributeError as exc:
+        results.append(str(exc))
+    return results
+
+
+def alternating_types():
+    """
+    >>> alternating_types()
+    [('Plain.meth', 0), ('Slotted.meth', 1), ('WithMethods', 2), ('Plain.meth', 3), ('Slotted.meth', 4), ('WithMethods', 5)]
+    """
+    objects = [Plain(), Slotted(), WithMethods()]
+    return [call_meth1(objects[i % 3], i) for i in range(6)]